@@ -6,6 +6,9 @@
 - Запись текста в файл
 - Закрытие файла
 - Что происходит с режимом "w" (перезапись)
+
+Для лога, в который игра пишет всё время, см. GameLog в game_log.py:
+он копит записи и пишет их пачками, а большой файл делит на части.
 """
 
 print("Создание файла лога игры...")
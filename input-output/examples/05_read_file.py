@@ -6,8 +6,29 @@
 - Чтение всего содержимого файла
 - Обработка случая когда файл не существует
 - Построчное чтение
+
+Большой лог не нужно читать целиком ради последних записей:
+    python 05_read_file.py --tail 10       # последние 10 строк (чтение с конца)
+    python 05_read_file.py --follow        # и ждать новых строк из 06_append_file.py
+    python 05_read_file.py --line 5000000  # строка по номеру через индекс строк
+    python 05_read_file.py --line 100 120  # строки со 100 по 120
+См. log_tail.py и line_index.py.
 """
 
+import sys
+
+if "--tail" in sys.argv or "--follow" in sys.argv:
+    from log_tail import main as tail_main
+
+    tail_main(sys.argv[1:])
+    sys.exit()
+
+if "--line" in sys.argv:
+    from line_index import main as line_main
+
+    numbers = sys.argv[sys.argv.index("--line") + 1:]
+    sys.exit(line_main(["game_log.txt"] + numbers, command="python 05_read_file.py --line"))
+
 print("Попытка прочитать game_log.txt...")
 print()
 
@@ -5,8 +5,28 @@
 - Открытие файла в режиме добавления
 - Добавление нового содержимого без стирания старого
 - Разница между режимами "w" и "a"
+
+Если записи идут постоянно, открывать файл ради каждой дорого:
+    python 06_append_file.py --game-log
+дописывает те же записи через GameLog (game_log.py) - с буфером,
+ротацией по размеру и сжатием старых частей.
 """
 
+import sys
+
+if "--game-log" in sys.argv:
+    from game_log import GameLog
+
+    with GameLog("game_log.txt") as log:
+        log.write("")
+        log.write("--- Новая сессия ---")
+        log.write("Игрок вернулся в игру")
+        log.write("Игрок вошёл в подземелье")
+        log.write("Игрок победил дракона")
+        log.write("Игрок достиг 5 уровня")
+    print("Новые записи добавлены в game_log.txt через GameLog")
+    sys.exit()
+
 print("Добавление новых записей в лог игры...")
 
 # Режим "a" открывает для добавления
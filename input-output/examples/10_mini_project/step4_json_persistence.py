@@ -10,21 +10,38 @@
 """
 
 import json
+import os
+import sys
 
 TASKS_FILE = "tasks.json"
 
+# Кэш разбора (tests/task_parse_cache.py): если tasks.json не менялся
+# с прошлого запуска, готовый список берётся из ~/.cache/task_manager
+# без разбора JSON. Без папки tests файл просто разбирается каждый раз.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tests"))
+try:
+    from task_parse_cache import load_json_cached
+except ImportError:
+    load_json_cached = None
+
 # Глобальный список для хранения задач
 # Теперь каждая задача - словарь с несколькими полями
 tasks = []
 
 
+def read_tasks_file():
+    """Прочитать и разобрать tasks.json (через кэш разбора, если он есть)."""
+    if load_json_cached is not None:
+        return load_json_cached(TASKS_FILE)
+    with open(TASKS_FILE, "r") as file:
+        return json.load(file)
+
+
 def load_tasks():
     """Загрузить задачи из JSON файла если он существует."""
     global tasks
     try:
-        file = open(TASKS_FILE, "r")
-        tasks = json.load(file)
-        file.close()
+        tasks = read_tasks_file()
         print(f"Загружено {len(tasks)} задач(и) из файла.")
     except FileNotFoundError:
         print("Сохранённых задач не найдено. Начинаем с чистого листа.")
@@ -8,15 +8,58 @@
 - Создание надёжной программы
 
 Это финальная, готовая к продакшену версия.
+
+Отложенная запись (для медленных дисков, например сетевых):
+    python step5_error_handling.py --write-behind
+Изменения помечают список как "грязный", а фоновый поток сохраняет
+его один раз после короткой паузы, объединяя серию изменений.
+Если фоновое сохранение не удалось, оно повторяется через
+RETRY_DELAY_SECONDS, а главный цикл сообщает об ошибке перед меню.
 """
 
+import atexit
 import json
+import os
+import sys
+import threading
 
 TASKS_FILE = "tasks.json"
 
+# Кэш разбора (tests/task_parse_cache.py): если tasks.json не менялся
+# с прошлого запуска, готовый список берётся из ~/.cache/task_manager
+# без разбора JSON. Без папки tests файл просто разбирается каждый раз.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tests"))
+try:
+    from task_parse_cache import load_json_cached
+except ImportError:
+    load_json_cached = None
+
+# Отложенная запись включается флагом --write-behind
+WRITE_BEHIND = "--write-behind" in sys.argv
+SAVE_DELAY_SECONDS = 0.5
+RETRY_DELAY_SECONDS = 5.0
+
 # Глобальный список для хранения задач
 tasks = []
 
+# Состояние отложенной записи. tasks_lock защищает список задач,
+# потому что фоновый поток читает его во время сохранения.
+tasks_lock = threading.Lock()
+save_lock = threading.Lock()
+save_timer = None
+dirty = False
+last_save_ok = True
+# Ошибка фонового сохранения, о которой главный цикл ещё не сообщил
+save_error = None
+
+
+def read_tasks_file():
+    """Прочитать и разобрать tasks.json (через кэш разбора, если он есть)."""
+    if load_json_cached is not None:
+        return load_json_cached(TASKS_FILE)
+    with open(TASKS_FILE, "r") as file:
+        return json.load(file)
+
 
 def load_tasks():
     """
@@ -25,8 +68,7 @@ def load_tasks():
     """
     global tasks
     try:
-        with open(TASKS_FILE, "r") as file:
-            tasks = json.load(file)
+        tasks = read_tasks_file()
         
         # Проверить что tasks это список
         if not isinstance(tasks, list):
@@ -59,17 +101,127 @@ def load_tasks():
         return False
 
 
-def save_tasks():
-    """Сохранить все задачи в JSON файл с обработкой ошибок."""
+def save_tasks(report=True):
+    """
+    Сохранить все задачи в JSON файл с обработкой ошибок.
+    Возвращает True если успешно, False иначе.
+    
+    report=False нужен фоновому потоку: ошибка не печатается посреди
+    чужого ввода, а запоминается в save_error для главного цикла.
+    """
+    global save_error
     try:
+        # Снимок берётся под замком, а медленная запись на диск - уже без него.
+        # json.dumps тоже внутри try: задача, которую нельзя записать в JSON,
+        # не должна молча убить фоновый поток сохранения
+        with tasks_lock:
+            content = json.dumps(tasks, indent=2, ensure_ascii=False)
         with open(TASKS_FILE, "w") as file:
-            json.dump(tasks, file, indent=2, ensure_ascii=False)
+            file.write(content)
+        save_error = None
         return True
     except Exception as e:
-        print(f"Ошибка сохранения задач: {e}")
+        if report:
+            print(f"Ошибка сохранения задач: {e}")
+        else:
+            save_error = e
         return False
 
 
+def schedule_save(delay):
+    """(Пере)запустить таймер фонового сохранения (вызывать под tasks_lock)."""
+    global save_timer
+    if save_timer is not None:
+        save_timer.cancel()
+    save_timer = threading.Timer(delay, flush_tasks, kwargs={"background": True})
+    save_timer.daemon = True
+    save_timer.start()
+
+
+def cancel_save():
+    """Остановить таймер фонового сохранения, если он запущен."""
+    global save_timer
+    with tasks_lock:
+        if save_timer is not None:
+            save_timer.cancel()
+            save_timer = None
+
+
+def flush_tasks(background=False):
+    """
+    Записать отложенные изменения, если они есть.
+    Возвращает True если всё сохранено, False иначе.
+    
+    background=True - вызов из таймера: при неудаче таймер запускается
+    снова, а об ошибке сообщает главный цикл (report_save_error).
+    """
+    global dirty, last_save_ok
+    with save_lock:
+        with tasks_lock:
+            if not dirty:
+                return last_save_ok
+            dirty = False
+        
+        last_save_ok = save_tasks(report=not background)
+        if not last_save_ok:
+            # Изменения не записаны - попробуем снова при следующем сохранении
+            with tasks_lock:
+                dirty = True
+                if background:
+                    schedule_save(RETRY_DELAY_SECONDS)
+        return last_save_ok
+
+
+def report_save_error():
+    """Сообщить о неудачном фоновом сохранении (из главного потока)."""
+    global save_error
+    with tasks_lock:
+        error, save_error = save_error, None
+    if error is not None:
+        print(f"\nФоновое сохранение не удалось: {error}")
+        print(f"Изменения не потеряны - попробуем снова через {RETRY_DELAY_SECONDS:g} с.")
+
+
+def request_save(wait=False):
+    """
+    Сохранить задачи после изменения.
+    
+    Обычно сохраняет сразу и возвращает результат сохранения.
+    В режиме --write-behind только помечает список как изменённый и
+    (пере)запускает таймер: серия изменений подряд превращается в одно
+    сохранение через SAVE_DELAY_SECONDS. Результата тогда ещё нет,
+    поэтому возвращается None, а о неудаче потом сообщит главный цикл.
+    
+    wait=True нужен изменениям, которые откатываются при неудаче:
+    тогда отложенные изменения записываются сразу вместе с этим, и
+    возвращается результат именно того сохранения, в которое оно попало.
+    """
+    global dirty
+    if not WRITE_BEHIND:
+        return save_tasks()
+    
+    if wait:
+        cancel_save()
+        with tasks_lock:
+            dirty = True
+        return flush_tasks()
+    
+    with tasks_lock:
+        dirty = True
+        schedule_save(SAVE_DELAY_SECONDS)
+    return None
+
+
+def flush_on_exit():
+    """Синхронно дописать отложенные изменения перед выходом."""
+    cancel_save()
+    saved = flush_tasks()
+    # Неудачное фоновое сохранение могло успеть снова запустить таймер
+    cancel_save()
+    if not saved:
+        print("Последние изменения: сохранение не удалось.")
+
+
 def display_menu():
     """Показать опции меню."""
     print()
@@ -115,9 +267,13 @@ def add_task():
         "completed": False
     }
     
-    tasks.append(task)
+    with tasks_lock:
+        tasks.append(task)
     
-    if save_tasks():
+    saved = request_save()
+    if saved is None:
+        print("✓ Задача добавлена (сохранится в фоне)")
+    elif saved:
         print(f"✓ Задача добавлена и сохранена!")
     else:
         print("✓ Задача добавлена (но сохранение не удалось - попробуем снова позже)")
@@ -133,8 +289,12 @@ def complete_task():
         choice = int(input("\nВведите номер задачи для отметки: "))
         
         if 1 <= choice <= len(tasks):
-            tasks[choice - 1]["completed"] = True
-            if save_tasks():
+            with tasks_lock:
+                tasks[choice - 1]["completed"] = True
+            saved = request_save()
+            if saved is None:
+                print("✓ Задача отмечена как выполненная (сохранится в фоне)")
+            elif saved:
                 print("✓ Задача отмечена как выполненная!")
             else:
                 print("Задача обновлена но сохранение не удалось.")
@@ -155,12 +315,16 @@ def delete_task():
         choice = int(input("\nВведите номер задачи для удаления: "))
         
         if 1 <= choice <= len(tasks):
-            deleted = tasks.pop(choice - 1)
-            if save_tasks():
+            with tasks_lock:
+                deleted = tasks.pop(choice - 1)
+            # Удалённую задачу больше нигде не найти, поэтому ждём
+            # сохранения, в которое попало удаление, прежде чем сообщить
+            if request_save(wait=True):
                 print(f"✓ Удалено: {deleted['description']}")
             else:
                 # Восстановить задачу если сохранение не удалось
-                tasks.insert(choice - 1, deleted)
+                with tasks_lock:
+                    tasks.insert(choice - 1, deleted)
                 print("Удаление не удалось - не удалось сохранить изменения.")
         else:
             print(f"Пожалуйста, введите число от 1 до {len(tasks)}.")
@@ -169,36 +333,53 @@ def delete_task():
         print("Пожалуйста, введите валидное число.")
 
 
-# Инициализация программы
-print("=" * 40)
-print("МЕНЕДЖЕР СПИСКА ЗАДАЧ")
-print("=" * 40)
-print()
-
-if not load_tasks():
-    print("Начинаем с пустого списка задач.")
-
-# Главный цикл программы
-running = True
-while running:
-    display_menu()
-    choice = input("\nВыберите опцию (1-5): ").strip()
-    
-    if choice == "1":
-        view_tasks()
-    elif choice == "2":
-        add_task()
-    elif choice == "3":
-        complete_task()
-    elif choice == "4":
-        delete_task()
-    elif choice == "5":
-        print("\nДо свидания!")
-        running = False
-    else:
-        print("\nНеверный выбор. Пожалуйста, выберите 1-5.")
+def main():
+    """Инициализация и главный цикл программы."""
+    print("=" * 40)
+    print("МЕНЕДЖЕР СПИСКА ЗАДАЧ")
+    print("=" * 40)
+    print()
+    
+    if not load_tasks():
+        print("Начинаем с пустого списка задач.")
+    
+    if WRITE_BEHIND:
+        # Страховка на случай Ctrl+C: отложенные изменения не потеряются
+        atexit.register(flush_on_exit)
+    
+    # Главный цикл программы
+    running = True
+    while running:
+        if WRITE_BEHIND:
+            report_save_error()
+        display_menu()
+        choice = input("\nВыберите опцию (1-5): ").strip()
+        
+        if choice == "1":
+            view_tasks()
+        elif choice == "2":
+            add_task()
+        elif choice == "3":
+            complete_task()
+        elif choice == "4":
+            delete_task()
+        elif choice == "5":
+            print("\nДо свидания!")
+            running = False
+        else:
+            print("\nНеверный выбор. Пожалуйста, выберите 1-5.")
+    
+    if WRITE_BEHIND:
+        flush_on_exit()
+        atexit.unregister(flush_on_exit)
+    
+    print("Спасибо за использование Менеджера списка задач!")
+
 
-print("Спасибо за использование Менеджера списка задач!")
+# Главный цикл запускается только при запуске файла как программы,
+# поэтому функции выше можно импортировать в тестах
+if __name__ == "__main__":
+    main()
 
 """
 ПОЧЕМУ ЭТО ВАЖНО:
@@ -0,0 +1,223 @@
+"""
+Сводка по многим журналам приключений
+
+Журналы в формате упражнения 4 (adventure_log.txt) собираются по
+одному на игровую сессию, и их набираются тысячи. Этот инструмент
+считает по всем сразу, например:
+    сколько раз игроки кого-то победили и скольких врагов одолели
+    сколько золота получено
+    сколько найдено сундуков
+
+Каждый файл читается кусками (память не зависит от размера файла),
+а регулярные выражения компилируются один раз при импорте модуля.
+Файлы делятся между процессами ProcessPoolExecutor; каждый процесс
+возвращает свой Counter, и в конце они складываются.
+
+Запуск:
+    python aggregate_logs.py logs/                  # все adventure_log*.txt в папке
+    python aggregate_logs.py a.txt b.txt --workers 4
+    python aggregate_logs.py bench 2000 [процессов] # сравнить 1 процесс и все ядра
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_PATTERN = "adventure_log*.txt"
+CHUNK_SIZE = 1024 * 1024
+
+# "Победил 3 гоблинов" - победа над 3 врагами, "Победил дракона" - над одним
+VICTORY = re.compile(r"^Победил(?: (\d+))?", re.MULTILINE)
+CHEST = re.compile(r"^Нашёл сундук", re.MULTILINE)
+# Только событие "Получил 100 золота", а не любое "N золота" в строке.
+# Шаблон проверяется лишь с начала строк, и буквальное "Получил" сразу
+# отбрасывает чужие строки; без буквального начала (r"(\d+) золот")
+# шаблон примеряется к каждому символу текста (в 3 раза медленнее)
+GOLD = re.compile(r"^Получил (\d+) золот", re.MULTILINE)
+
+
+def aggregate_text(text):
+    """
+    Считает события в куске журнала из целых строк.
+
+    Аргументы:
+        text: Текст (одна или много строк)
+
+    Возвращает:
+        Counter: Счётчики событий
+    """
+    victories = VICTORY.findall(text)
+    return Counter({
+        "строки": text.count("\n"),
+        "победы": len(victories),
+        "врагов побеждено": sum(int(number) if number else 1 for number in victories),
+        "сундуки": len(CHEST.findall(text)),
+        "золото": sum(map(int, GOLD.findall(text))),
+    })
+
+
+def aggregate_file(filename):
+    """
+    Считает события в одном журнале, читая его кусками.
+
+    Аргументы:
+        filename: Путь к журналу
+
+    Возвращает:
+        Counter: Счётчики событий и "файлы" (или "не прочитано", если
+        файл не открылся)
+    """
+    counts = Counter()
+    try:
+        with open(filename, "r", encoding="utf-8", errors="replace") as file:
+            while True:
+                # Кусок дополняется до конца строки, чтобы не разрезать событие
+                chunk = file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunk += file.readline()
+                if not chunk.endswith("\n"):
+                    chunk += "\n"
+                counts.update(aggregate_text(chunk))
+    except OSError:
+        return Counter({"не прочитано": 1})
+    counts["файлы"] = 1
+    return counts
+
+
+def aggregate_files(filenames, workers=None):
+    """
+    Считает события во всех журналах параллельно.
+
+    Аргументы:
+        filenames: Пути к журналам
+        workers: Сколько процессов использовать (None - по числу ядер,
+            1 - без пула)
+
+    Возвращает:
+        Counter: Сумма счётчиков всех файлов
+    """
+    filenames = list(filenames)
+    total = Counter()
+    if workers == 1 or len(filenames) < 2:
+        for filename in filenames:
+            total.update(aggregate_file(filename))
+        return total
+
+    workers = workers or os.cpu_count() or 1
+    # Файлы отдаются пачками: на тысячах маленьких файлов пересылка
+    # по одному стоила бы дороже самого подсчёта
+    chunksize = max(1, len(filenames) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(aggregate_file, filenames, chunksize=chunksize):
+            total.update(counts)
+    return total
+
+
+def find_logs(paths, pattern=DEFAULT_PATTERN):
+    """
+    Находит журналы: файлы берутся как есть, папки обходятся рекурсивно.
+
+    Аргументы:
+        paths: Пути к файлам и папкам
+        pattern: Шаблон имени журнала в папках
+
+    Возвращает:
+        list: Пути к журналам по алфавиту
+    """
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for directory, _, names in os.walk(path):
+            found.extend(os.path.join(directory, name)
+                         for name in fnmatch.filter(names, pattern))
+    return sorted(found)
+
+
+# ============================================================
+# МАСШТАБИРОВАНИЕ
+# ============================================================
+
+def write_sample_logs(directory, count, lines=2000):
+    """Создаёт count журналов по lines строк в формате упражнения 4."""
+    events = [
+        "Путешествие началось",
+        "Вошёл в тёмный лес",
+        "Победил 3 гоблинов",
+        "Нашёл сундук с сокровищами",
+        "Получил 100 золота",
+        "Победил дракона",
+    ]
+    body = "".join(events[i % len(events)] + "\n" for i in range(lines))
+    for number in range(count):
+        session = os.path.join(directory, f"session_{number:05d}")
+        os.makedirs(session)
+        with open(os.path.join(session, "adventure_log.txt"), "w", encoding="utf-8") as file:
+            file.write(body)
+
+
+def benchmark(count, workers=None):
+    """
+    Сравнивает подсчёт в одном процессе и в пуле.
+
+    Аргументы:
+        count: Сколько журналов создать (по 2000 строк)
+        workers: Размер пула (None - по числу ядер)
+
+    Возвращает:
+        dict: Число процессов -> секунды
+    """
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        write_sample_logs(directory, count)
+        filenames = find_logs([directory])
+        results = {}
+        for processes in sorted({1, workers}):
+            start = time.perf_counter()
+            aggregate_files(filenames, processes)
+            results[processes] = time.perf_counter() - start
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["bench"]:
+        count = int(argv[1]) if len(argv) > 1 else 2000
+        results = benchmark(count, int(argv[2]) if len(argv) > 2 else None)
+        for processes, seconds in results.items():
+            speedup = results[1] / seconds
+            print(f"{processes:>3} процесс(ов): {seconds:.2f} с (ускорение {speedup:.1f}x)")
+        return 0
+
+    parser = argparse.ArgumentParser(description="Сводка по журналам приключений")
+    parser.add_argument("paths", nargs="+", help="журналы или папки с ними")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="имя журнала в папках")
+    parser.add_argument("--workers", type=int, help="сколько процессов использовать")
+    args = parser.parse_args(argv)
+
+    filenames = find_logs(args.paths, args.pattern)
+    if not filenames:
+        print("Журналы не найдены.")
+        return 1
+    start = time.perf_counter()
+    total = aggregate_files(filenames, args.workers)
+    seconds = time.perf_counter() - start
+
+    print("=== Сводка по журналам ===")
+    for name in ("файлы", "строки", "победы", "врагов побеждено", "сундуки", "золото", "не прочитано"):
+        if total[name]:
+            print(f"{name}: {total[name]}")
+    print(f"({seconds:.2f} с)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
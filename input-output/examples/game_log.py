@@ -0,0 +1,291 @@
+"""
+GameLog - буферизованный лог игры с ротацией
+
+04_write_file.py и 06_append_file.py пишут каждую запись отдельным
+file.write, а если открывать файл на каждую запись, то большая часть
+времени уходит на open/close. GameLog:
+- копит записи в памяти и сбрасывает их на диск одним write, когда
+  набралось buffer_size байт, прошло flush_interval секунд или
+  программа завершается
+- когда game_log.txt дорастает до max_bytes, переименовывает его в
+  game_log.txt.1, game_log.txt.2, ... и начинает новый файл
+- сжимает старые части в .gz в фоновом потоке, не задерживая игру,
+  и хранит только последние backup_count частей
+- если запись не удалась (например, диск заполнен), записи остаются
+  в буфере и уходят со следующим сбросом; ошибку фонового сброса
+  видно в stderr и в log.flush_error
+- если переименовать файл при ротации не удалось, записи дописываются
+  в тот же файл, а ротация повторяется при следующем сбросе; ошибку
+  видно в log.rotate_error
+
+Пример:
+    with GameLog("game_log.txt", max_bytes=1024 * 1024) as log:
+        log.write("Игрок вошёл в мир")
+        log.write("Игрок победил гоблина")
+
+Сравнение с open-write-close на каждую запись:
+    python game_log.py bench 100000
+"""
+
+import atexit
+import gzip
+import os
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+BUFFER_SIZE = 64 * 1024
+FLUSH_INTERVAL = 1.0
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+
+class GameLog:
+    """
+    Лог, в который можно писать часто: записи копятся в буфере.
+
+    Пишут в него из одного или нескольких потоков; фоновые потоки
+    сбрасывают буфер по времени и сжимают старые части лога.
+    """
+
+    def __init__(self, filename="game_log.txt", buffer_size=BUFFER_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES,
+                 backup_count=BACKUP_COUNT):
+        """
+        Аргументы:
+            filename: Путь к файлу лога
+            buffer_size: Сбрасывать буфер, когда в нём столько байт
+            flush_interval: Сбрасывать буфер не реже, чем раз в столько
+                секунд (None - только по размеру и при закрытии)
+            max_bytes: Размер файла, после которого начинается новый
+                (None - без ротации)
+            backup_count: Сколько старых сжатых частей хранить
+        """
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered = 0
+        self._file = open(filename, "ab")
+        self._size = self._file.tell()
+        self._closed = threading.Event()
+        # Последняя ошибка фонового сброса (None - сброс удаётся)
+        self.flush_error = None
+        # Последняя ошибка ротации (None - ротация удаётся)
+        self.rotate_error = None
+
+        # Сжатие в отдельном потоке: ротация только переименовывает файл
+        self._to_compress = queue.Queue()
+        self._compressor = threading.Thread(target=self._compress_loop, daemon=True)
+        self._compressor.start()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    def write(self, entry):
+        """
+        Добавляет запись в лог (перевод строки добавляется сам).
+
+        Аргументы:
+            entry: Текст записи
+        """
+        data = (entry + "\n").encode("utf-8")
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("Лог уже закрыт")
+            self._buffer.append(data)
+            self._buffered += len(data)
+            if self._buffered >= self.buffer_size:
+                self._flush_locked()
+
+    def flush(self):
+        """
+        Сбрасывает буфер в файл.
+
+        Исключения:
+            OSError: Если запись не удалась (записи остаются в буфере)
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """
+        Сбрасывает буфер, закрывает файл и ждёт окончания сжатия.
+
+        Исключения:
+            OSError: Если последний сброс не удался (файл всё равно
+                закрывается, а фоновые потоки завершаются)
+        """
+        error = None
+        with self._lock:
+            if self._closed.is_set():
+                return
+            try:
+                self._flush_locked()
+            except OSError as exc:
+                error = exc
+            self._closed.set()
+            self._file.close()
+        self._to_compress.put(None)
+        self._compressor.join()
+        if self._flusher is not None:
+            self._flusher.join()
+        atexit.unregister(self.close)
+        if error is not None:
+            raise error
+
+    # ----- Внутренняя работа (вызывается под self._lock) -----
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        if self.max_bytes is not None and self._size > 0 and self._size + len(data) > self.max_bytes:
+            self._rotate_locked()
+        self._file.write(data)
+        self._file.flush()
+        # Буфер очищается только после записи: при ошибке записи остаются
+        # в нём и уходят со следующим сбросом
+        self._buffer = []
+        self._buffered = 0
+        self._size += len(data)
+
+    def _rotate_locked(self):
+        rotated = f"{self.filename}.{self._next_segment()}"
+        self._file.close()
+        try:
+            os.replace(self.filename, rotated)
+        except OSError as error:
+            # Переименовать не удалось (например, файл открыт в другой
+            # программе): дальше пишем в тот же файл, а ротацию
+            # попробуем снова при следующем сбросе
+            self._file = open(self.filename, "ab")
+            self.rotate_error = error
+            return
+        self._file = open(self.filename, "ab")
+        self._size = 0
+        self.rotate_error = None
+        self._to_compress.put(rotated)
+
+    def _segments(self):
+        """Номера уже существующих частей лога (сжатых и ещё нет)."""
+        directory = os.path.dirname(self.filename) or "."
+        pattern = re.compile(re.escape(os.path.basename(self.filename)) + r"\.(\d+)(\.gz)?$")
+        numbers = []
+        for name in os.listdir(directory):
+            match = pattern.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return numbers
+
+    def _next_segment(self):
+        return max(self._segments(), default=0) + 1
+
+    # ----- Фоновые потоки -----
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as error:
+                # Поток не должен умирать молча: сообщаем об ошибке один раз
+                # и пробуем снова через flush_interval
+                if repr(error) != repr(self.flush_error):
+                    print(f"GameLog: не удалось записать {self.filename}: {error}", file=sys.stderr)
+                self.flush_error = error
+            else:
+                self.flush_error = None
+
+    def _compress_loop(self):
+        while True:
+            rotated = self._to_compress.get()
+            if rotated is None:
+                return
+            try:
+                with open(rotated, "rb") as source, gzip.open(rotated + ".gz.tmp", "wb") as target:
+                    shutil.copyfileobj(source, target)
+                os.replace(rotated + ".gz.tmp", rotated + ".gz")
+                os.remove(rotated)
+                self._remove_old_segments()
+            except OSError:
+                # Несжатая часть остаётся на диске, лог продолжает работать
+                pass
+
+    def _remove_old_segments(self):
+        numbers = sorted(self._segments())
+        for number in numbers[:max(0, len(numbers) - self.backup_count)]:
+            for suffix in (".gz", ""):
+                path = f"{self.filename}.{number}{suffix}"
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# ============================================================
+# СРАВНЕНИЕ С OPEN-WRITE-CLOSE
+# ============================================================
+
+def write_naive(filename, entries):
+    """Открывает, дописывает и закрывает файл на каждую запись."""
+    for entry in entries:
+        with open(filename, "a", encoding="utf-8") as file:
+            file.write(entry + "\n")
+
+
+def write_buffered(filename, entries):
+    """Пишет те же записи через GameLog (с ротацией по 10 МБ)."""
+    with GameLog(filename) as log:
+        for entry in entries:
+            log.write(entry)
+
+
+def benchmark(count, directory):
+    """
+    Меряет скорость записи в записях в секунду.
+
+    Аргументы:
+        count: Количество записей
+        directory: Папка для временных файлов
+
+    Возвращает:
+        dict: Записей в секунду для "open-write-close" и "GameLog"
+    """
+    entries = [f"Игрок {i % 7} победил гоблина номер {i} и получил {i % 50} золота"
+               for i in range(count)]
+    results = {}
+    for name, write in (("open-write-close", write_naive), ("GameLog", write_buffered)):
+        filename = os.path.join(directory, f"{name}.txt")
+        start = time.perf_counter()
+        write(filename, entries)
+        results[name] = count / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+        with tempfile.TemporaryDirectory() as workdir:
+            results = benchmark(count, workdir)
+        for name, per_second in results.items():
+            print(f"{name:<18}{per_second:>12,.0f} записей/с")
+        print(f"GameLog быстрее в {results['GameLog'] / results['open-write-close']:.0f} раз")
+    else:
+        print("Использование:")
+        print("  python game_log.py bench [количество записей]")
+        sys.exit(2)
@@ -0,0 +1,131 @@
+"""
+Счётчик строк для больших файлов
+
+Решение упражнения 6 через file.readlines() читает весь файл в память
+и создаёт по строке на каждую строку файла. Для логов в несколько
+гигабайт так нельзя. Этот инструмент:
+- отображает файл в память (mmap) и считает байты b"\\n" блоками,
+  не создавая строк
+- делит файл на куски и считает их параллельно в пуле процессов
+- учитывает последнюю строку без "\\n" в конце (как readlines())
+- для больших файлов показывает скорость в МБ/с
+
+Запуск:
+    python line_counter.py                      # спросит имя файла
+    python line_counter.py game_log.txt
+    python line_counter.py big.log --workers 4
+"""
+
+import argparse
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Кусок файла для одного задания пула
+CHUNK_SIZE = 64 * 1024 * 1024
+# Внутри куска считаем блоками, чтобы не копировать в память весь кусок
+BLOCK_SIZE = 1024 * 1024
+# Файлы меньше этого размера быстрее посчитать в одном процессе
+PARALLEL_THRESHOLD = 2 * CHUNK_SIZE
+# Скорость показываем начиная с этого размера
+REPORT_THRESHOLD = 100 * 1024 * 1024
+
+
+def count_newlines(filename, start, end):
+    """
+    Считает символы новой строки в байтах [start, end) файла.
+
+    Аргументы:
+        filename: Путь к файлу
+        start: Начало куска в байтах
+        end: Конец куска в байтах
+
+    Возвращает:
+        int: Количество b"\\n" в куске
+    """
+    with open(filename, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            count = 0
+            for position in range(start, end, BLOCK_SIZE):
+                count += data[position:min(position + BLOCK_SIZE, end)].count(b"\n")
+            return count
+
+
+def count_newlines_in_chunk(chunk):
+    """Обёртка для пула процессов: chunk = (имя файла, начало, конец)."""
+    return count_newlines(*chunk)
+
+
+def ends_with_newline(filename, size):
+    """Проверяет, заканчивается ли непустой файл символом новой строки."""
+    with open(filename, "rb") as file:
+        file.seek(size - 1)
+        return file.read(1) == b"\n"
+
+
+def count_lines(filename, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Считает строки в файле так же, как len(file.readlines()).
+
+    Аргументы:
+        filename: Путь к файлу
+        workers: Сколько процессов использовать (None - по числу ядер,
+            если файл не меньше PARALLEL_THRESHOLD; 1 - без пула;
+            явное число больше 1 - пул для файла любого размера)
+        chunk_size: Размер куска для одного задания
+
+    Возвращает:
+        int: Количество строк
+
+    Исключения:
+        FileNotFoundError: Если файла нет
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        # Пустой файл нельзя отобразить в память
+        return 0
+
+    chunks = [
+        (filename, start, min(start + chunk_size, size))
+        for start in range(0, size, chunk_size)
+    ]
+    if workers == 1 or (workers is None and size < PARALLEL_THRESHOLD):
+        count = sum(count_newlines_in_chunk(chunk) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            count = sum(pool.map(count_newlines_in_chunk, chunks))
+
+    # Последняя строка без "\n" - тоже строка
+    if not ends_with_newline(filename, size):
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Счётчик строк для больших файлов")
+    parser.add_argument("filename", nargs="?", help="файл (если не указан, будет спрошен)")
+    parser.add_argument("--workers", type=int, help="сколько процессов использовать")
+    args = parser.parse_args()
+
+    filename = args.filename or input("Введите имя файла: ").strip()
+
+    try:
+        start = time.perf_counter()
+        count = count_lines(filename, args.workers)
+        seconds = time.perf_counter() - start
+    except FileNotFoundError:
+        print(f"Ошибка: Файл '{filename}' не найден.")
+        return
+
+    print(f"В файле {count} строк.")
+
+    size = os.path.getsize(filename)
+    if size >= REPORT_THRESHOLD and seconds > 0:
+        megabytes = size / (1024 * 1024)
+        print(f"Прочитано {megabytes:.0f} МБ за {seconds:.2f} с "
+              f"({megabytes / seconds:.0f} МБ/с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Индекс строк для быстрого доступа к строке по номеру
+
+05_read_file.py нумерует строки через enumerate(readlines()), поэтому
+чтобы добраться до строки 5 000 000, нужно прочитать все строки до неё.
+Индекс запоминает, с какого байта начинается каждая EVERY-я строка
+(1-я, 1001-я, 2001-я, ...). Чтобы прочитать строку n, достаточно
+перейти (seek) к ближайшей отмеченной строке перед ней и пропустить
+не больше EVERY - 1 строк - сколько бы строк ни было в файле.
+
+Индекс лежит рядом с логом (game_log.txt.lidx) и строится за один
+проход по файлу. Если в лог дописали строки, индекс дочитывает только
+новый хвост; если файл перезаписали - строится заново.
+
+Запуск:
+    python line_index.py game_log.txt 5000000        # одна строка
+    python line_index.py game_log.txt 100 120        # строки со 100 по 120
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from itertools import accumulate
+
+INDEX_SUFFIX = ".lidx"
+MAGIC = b"LIDX"
+VERSION = 1
+# magic, версия, шаг индекса, сколько байт проиндексировано, сколько в них "\n",
+# CRC32 последних TAIL_BYTES проиндексированных байт
+HEADER = struct.Struct("<4sHxxIQQI4x")
+DEFAULT_EVERY = 1000
+BLOCK_SIZE = 1024 * 1024
+TAIL_BYTES = 64
+
+
+def decode_line(line):
+    """Превращает байты строки в текст без перевода строки."""
+    return line.rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+
+def tail_crc(file, size):
+    """CRC32 последних TAIL_BYTES байт из первых size байт файла."""
+    file.seek(max(0, size - TAIL_BYTES))
+    return zlib.crc32(file.read(min(size, TAIL_BYTES)))
+
+
+class LineIndex:
+    """
+    Разреженный индекс строк одного файла.
+
+    offsets[m] - байт, с которого начинается строка номер m * every + 1
+    (строки нумеруются с 1, как в 05_read_file.py).
+    """
+
+    def __init__(self, filename, every=DEFAULT_EVERY):
+        """
+        Аргументы:
+            filename: Путь к файлу лога
+            every: Шаг индекса в строках
+        """
+        self.filename = filename
+        self.every = every
+        self.size = 0
+        self.newlines = 0
+        self.tail_crc = 0
+        self.offsets = array("Q", [0])
+
+    # ----- Построение и обновление -----
+
+    def _scan(self, file, end):
+        """Дочитывает байты [self.size, end) и отмечает каждую every-ю строку."""
+        position = self.size
+        file.seek(position)
+        while position < end:
+            block = file.read(min(BLOCK_SIZE, end - position))
+            if not block:
+                break
+            count = block.count(b"\n")
+            # Номер "\n" (с 1), после которого начинается следующая отмечаемая строка
+            target = len(self.offsets) * self.every
+            if self.newlines + count >= target:
+                # Длины строк блока складываются в C, без цикла Python по строкам
+                ends = list(accumulate(map(len, block.split(b"\n")[:-1])))
+                index = target - self.newlines - 1
+                while index < count:
+                    # До index-го "\n" блока - ещё index других "\n"
+                    self.offsets.append(position + ends[index] + index + 1)
+                    index += self.every
+            self.newlines += count
+            position += len(block)
+        self.size = position
+
+    def refresh(self):
+        """
+        Приводит индекс в соответствие с файлом.
+
+        Если файл только вырос и уже проиндексированная часть не
+        изменилась, дочитывается только новый хвост.
+
+        Возвращает:
+            bool: True если индекс изменился
+
+        Исключения:
+            FileNotFoundError: Если файла нет
+        """
+        with open(self.filename, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            unchanged = size >= self.size and tail_crc(file, self.size) == self.tail_crc
+            if unchanged and size == self.size:
+                return False
+            if not unchanged:
+                # Файл перезаписан: строим индекс заново
+                self.size = 0
+                self.newlines = 0
+                self.offsets = array("Q", [0])
+            self._scan(file, size)
+            self.tail_crc = tail_crc(file, self.size)
+        return True
+
+    # ----- Файл индекса -----
+
+    def save(self):
+        """
+        Сохраняет индекс рядом с логом.
+
+        Возвращает:
+            bool: True если успешно, False в противном случае
+        """
+        index_filename = self.filename + INDEX_SUFFIX
+        offsets = array("Q", self.offsets)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        try:
+            with open(index_filename + ".tmp", "wb") as file:
+                file.write(HEADER.pack(MAGIC, VERSION, self.every, self.size,
+                                       self.newlines, self.tail_crc))
+                file.write(offsets.tobytes())
+            os.replace(index_filename + ".tmp", index_filename)
+            return True
+        except OSError:
+            return False
+
+    @classmethod
+    def load(cls, filename, every=DEFAULT_EVERY):
+        """
+        Читает сохранённый индекс (актуальность проверяет refresh()).
+
+        Аргументы:
+            filename: Путь к файлу лога
+            every: Шаг индекса в строках
+
+        Возвращает:
+            LineIndex or None: Индекс, или None если его нет, он
+            повреждён или построен с другим шагом
+        """
+        try:
+            with open(filename + INDEX_SUFFIX, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size or (len(data) - HEADER.size) % 8:
+            return None
+        magic, version, saved_every, size, newlines, saved_crc = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or saved_every != every:
+            return None
+        offsets = array("Q")
+        offsets.frombytes(data[HEADER.size:])
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        if not offsets or offsets[0] != 0:
+            return None
+
+        index = cls(filename, every)
+        index.size = size
+        index.newlines = newlines
+        index.tail_crc = saved_crc
+        index.offsets = offsets
+        return index
+
+    # ----- Чтение строк -----
+
+    def line_count(self, file):
+        """Количество строк, как len(readlines()) по проиндексированной части."""
+        if self.size == 0:
+            return 0
+        file.seek(self.size - 1)
+        # Последняя строка без "\n" в конце - тоже строка
+        return self.newlines + (file.read(1) != b"\n")
+
+    def read_range(self, first, last):
+        """
+        Читает строки с first по last включительно.
+
+        Аргументы:
+            first: Номер первой строки (с 1)
+            last: Номер последней строки (больше числа строк - до конца)
+
+        Возвращает:
+            list: Строки без перевода строки (пустой, если first за концом)
+        """
+        first = max(first, 1)
+        lines = []
+        with open(self.filename, "rb") as file:
+            last = min(last, self.line_count(file))
+            if first > last:
+                return lines
+            mark = (first - 1) // self.every
+            file.seek(self.offsets[mark])
+            for _ in range(first - 1 - mark * self.every):
+                file.readline()
+            for _ in range(last - first + 1):
+                lines.append(decode_line(file.readline()))
+        return lines
+
+    def read_line(self, number):
+        """
+        Читает одну строку.
+
+        Аргументы:
+            number: Номер строки (с 1)
+
+        Возвращает:
+            str or None: Строка без перевода строки, или None если
+            такой строки нет
+        """
+        lines = self.read_range(number, number)
+        return lines[0] if lines else None
+
+
+def open_index(filename, every=DEFAULT_EVERY):
+    """
+    Открывает индекс файла: читает сохранённый, дочитывает дописанное
+    и сохраняет, если что-то изменилось.
+
+    Аргументы:
+        filename: Путь к файлу лога
+        every: Шаг индекса в строках
+
+    Возвращает:
+        LineIndex: Актуальный индекс
+
+    Исключения:
+        FileNotFoundError: Если файла нет
+    """
+    index = LineIndex.load(filename, every) or LineIndex(filename, every)
+    if index.refresh():
+        index.save()
+    return index
+
+
+def read_line(filename, number):
+    """Читает строку number (с 1) файла через индекс."""
+    return open_index(filename).read_line(number)
+
+
+def read_range(filename, first, last):
+    """Читает строки с first по last включительно через индекс."""
+    return open_index(filename).read_range(first, last)
+
+
+def print_usage(command):
+    """Печатает, как вызывать команду (command - начало командной строки)."""
+    print("Использование:")
+    print(f"  {command} НОМЕР")
+    print(f"  {command} ПЕРВАЯ ПОСЛЕДНЯЯ")
+
+
+def main(argv=None, command="python line_index.py game_log.txt"):
+    """
+    Печатает строки файла по номерам.
+
+    Аргументы:
+        argv: [файл, первая строка, последняя строка (необязательно)]
+        command: Начало командной строки для подсказки об использовании
+
+    Возвращает:
+        int: Код выхода (0 - успешно, 1 - файла нет, 2 - неверные аргументы)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (2, 3):
+        print_usage(command)
+        return 2
+    filename = argv[0]
+    try:
+        first = int(argv[1])
+        last = int(argv[2]) if len(argv) == 3 else first
+    except ValueError:
+        print_usage(command)
+        return 2
+    if first < 1:
+        print("Ошибка: строки нумеруются с 1.")
+        return 2
+
+    try:
+        start = time.perf_counter()
+        index = open_index(filename)
+        lines = index.read_range(first, last)
+        seconds = time.perf_counter() - start
+    except FileNotFoundError:
+        print(f"Ошибка: {filename} не найден!")
+        return 1
+
+    for number, line in enumerate(lines, first):
+        print(f"Строка {number}: {line}")
+    if not lines:
+        print("Таких строк в файле нет.")
+    print(f"({seconds * 1000:.1f} мс)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Последние строки лога и слежение за ним (как tail и tail -f)
+
+05_read_file.py читает game_log.txt целиком, хотя часто нужны только
+последние записи. Здесь файл читается с конца блоками по BLOCK_SIZE
+байт, пока не наберётся нужное число строк, а в режиме слежения
+печатаются только новые строки, которые дописывает, например,
+06_append_file.py. Память не зависит от размера лога.
+
+Запуск:
+    python log_tail.py                  # последние 10 строк game_log.txt
+    python log_tail.py -n 3 game_log.txt
+    python log_tail.py --follow         # ждать новых строк (Ctrl+C - выход)
+"""
+
+import argparse
+import os
+import time
+
+BLOCK_SIZE = 8192
+POLL_INTERVAL = 0.5
+
+
+def decode_line(line):
+    """Превращает байты строки в текст (битые символы заменяются на �)."""
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def tail_lines(filename, count=10, block_size=BLOCK_SIZE):
+    """
+    Возвращает последние count строк файла, читая его с конца.
+
+    Аргументы:
+        filename: Путь к файлу
+        count: Сколько строк вернуть
+        block_size: Сколько байт читать за раз
+
+    Возвращает:
+        list: Строки без символа новой строки, от старых к новым
+
+    Исключения:
+        FileNotFoundError: Если файла нет
+    """
+    with open(filename, "rb") as file:
+        position = file.seek(0, os.SEEK_END)
+        if count <= 0:
+            return []
+        blocks = []
+        newlines = 0
+        # Начало нужной строки видно только по "\n" перед ней,
+        # а последний "\n" может просто завершать файл: ждём count + 1
+        while position > 0 and newlines <= count:
+            size = min(block_size, position)
+            position -= size
+            file.seek(position)
+            block = file.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+
+    if not blocks:
+        return []
+    data = b"".join(reversed(blocks))
+    if data.endswith(b"\n"):
+        data = data[:-1]
+    return [decode_line(line) for line in data.split(b"\n")[-count:]]
+
+
+def follow(filename, poll_interval=POLL_INTERVAL):
+    """
+    Выдаёт строки, которые дописываются в конец файла.
+
+    Если файл обрезали (перезапись в режиме "w") или заменили новым
+    (ротация лога), чтение начинается с начала нового файла.
+
+    Аргументы:
+        filename: Путь к файлу
+        poll_interval: Пауза между проверками в секундах
+
+    Возвращает:
+        iterator: Новые строки без символа новой строки (бесконечно)
+
+    Исключения:
+        FileNotFoundError: Если файла нет при запуске
+    """
+    file = open(filename, "rb")
+    file.seek(0, os.SEEK_END)
+    partial = b""
+    try:
+        while True:
+            chunk = file.read(BLOCK_SIZE)
+            if chunk:
+                # Последний кусок без "\n" - строка, которую ещё дописывают
+                *lines, partial = (partial + chunk).split(b"\n")
+                for line in lines:
+                    yield decode_line(line)
+                continue
+
+            try:
+                current = os.stat(filename)
+            except FileNotFoundError:
+                current = None
+            if current is not None and (
+                current.st_ino != os.fstat(file.fileno()).st_ino
+                or current.st_size < file.tell()
+            ):
+                file.close()
+                file = open(filename, "rb")
+                partial = b""
+                continue
+            time.sleep(poll_interval)
+    finally:
+        file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Последние строки лога")
+    parser.add_argument("filename", nargs="?", default="game_log.txt")
+    parser.add_argument("-n", "--tail", type=int, default=10, metavar="N",
+                        help="сколько последних строк показать")
+    parser.add_argument("-f", "--follow", action="store_true",
+                        help="ждать новых строк")
+    args = parser.parse_args(argv)
+
+    try:
+        for line in tail_lines(args.filename, args.tail):
+            print(line)
+        if args.follow:
+            print(f"--- Ждём новых строк в {args.filename} (Ctrl+C - выход) ---")
+            for line in follow(args.filename):
+                print(line, flush=True)
+    except FileNotFoundError:
+        print(f"Ошибка: {args.filename} не найден!")
+    except KeyboardInterrupt:
+        print()
+
+
+if __name__ == "__main__":
+    main()
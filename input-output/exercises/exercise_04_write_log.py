@@ -24,6 +24,12 @@
 
 ТЕСТИРОВАНИЕ:
 После запуска проверьте, что adventure_log.txt существует и содержит ваши записи.
+
+БОНУС:
+- Если записей тысячи в секунду, открывать файл на каждую запись медленно
+- Посмотрите класс GameLog в ../examples/game_log.py: он копит записи
+  в буфере, сбрасывает их пачкой и сжимает старые части лога
+- Сравните скорость: python ../examples/game_log.py bench
 """
 
 # Ваш код здесь
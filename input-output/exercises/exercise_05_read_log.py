@@ -26,6 +26,9 @@
 БОНУС:
 - Пронумеруйте каждую строку при выводе
 - Обработайте случай, когда файл не существует
+- Посчитайте, сколько раз в логе встречается "Победил" и сколько
+  золота получено; как это сделать для тысяч логов сразу, см.
+  ../examples/aggregate_logs.py
 """
 
 # Ваш код здесь
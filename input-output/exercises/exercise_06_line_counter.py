@@ -25,6 +25,12 @@
 ТЕСТИРОВАНИЕ:
 - Протестируйте с adventure_log.txt (должно быть 5 строк)
 - Протестируйте с несуществующим файлом
+
+БОНУС:
+- Что будет с readlines() на логе в несколько гигабайт?
+- Посмотрите ../examples/line_counter.py: он считает байты b"\n" через
+  mmap в пуле процессов и не создаёт строк, а последнюю строку без
+  "\n" в конце учитывает так же, как readlines()
 """
 
 # Ваш код здесь
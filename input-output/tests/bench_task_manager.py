@@ -0,0 +1,241 @@
+"""
+Бенчмарк масштабирования менеджера задач
+
+Тесты в test_task_manager.py проверяют правильность на списках из
+пары задач. Этот скрипт показывает, как растут время и память
+операций с ростом списка от 100 до 1 000 000 задач.
+
+Только стандартная библиотека: time.perf_counter и tracemalloc.
+
+Запуск:
+    python bench_task_manager.py                        # 1e2 ... 1e6
+    python bench_task_manager.py --sizes 100 10000      # свои размеры
+    python bench_task_manager.py --output results.json  # сохранить JSON
+    python bench_task_manager.py --save-baseline baseline.json
+    python bench_task_manager.py --baseline baseline.json  # код 1 при регрессии
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from task_list import TaskList
+from task_manager_testable import (
+    add_task,
+    delete_task,
+    format_task_list,
+    load_tasks_from_file,
+    save_tasks_to_file,
+)
+
+
+DEFAULT_SIZES = [10 ** power for power in range(2, 7)]
+
+# Сколько раз повторять одиночные операции (add/delete), чтобы
+# время одной операции было измеримым
+OPERATIONS_PER_RUN = 1000
+
+CONTAINERS = {"list": list, "tasklist": TaskList}
+
+
+def make_tasks(size, container):
+    """
+    Строит список задач заданного размера.
+
+    Аргументы:
+        size: Количество задач
+        container: list или TaskList
+
+    Возвращает:
+        list or TaskList: Задачи
+    """
+    return container(
+        {"description": f"Задача номер {i}", "completed": i % 3 == 0}
+        for i in range(size)
+    )
+
+
+def measure(setup, run, repeat):
+    """
+    Измеряет время и пиковую память одной операции.
+
+    Время - лучшее из repeat запусков (меньше всего шума),
+    память - пик tracemalloc в отдельном запуске, потому что
+    tracemalloc сам замедляет код.
+
+    Аргументы:
+        setup: Функция без аргументов, готовит данные (не измеряется)
+        run: Функция от результата setup, выполняет операцию
+            и возвращает количество выполненных операций (0 на пустом
+            списке считается как одна операция, чтобы не делить на ноль)
+        repeat: Сколько раз замерить время
+
+    Возвращает:
+        dict: seconds (на одну операцию) и peak_bytes
+    """
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        count = run(state)
+        elapsed = (time.perf_counter() - start) / max(count, 1)
+        best = elapsed if best is None else min(best, elapsed)
+        del state
+
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def add_many(tasks):
+    for i in range(OPERATIONS_PER_RUN):
+        add_task(tasks, f"Новая задача {i}")
+    return OPERATIONS_PER_RUN
+
+
+def delete_first_many(tasks):
+    count = min(OPERATIONS_PER_RUN, len(tasks))
+    for _ in range(count):
+        delete_task(tasks, 1)
+    return count
+
+
+def run_benchmarks(sizes, container_name="list", repeat=3, directory=None):
+    """
+    Прогоняет все операции на всех размерах.
+
+    Аргументы:
+        sizes: Список размеров списка задач
+        container_name: "list" или "tasklist"
+        repeat: Сколько раз замерять время каждой операции
+        directory: Папка для временных файлов (None - создать свою)
+
+    Возвращает:
+        list: Словари {operation, size, seconds, peak_bytes}
+    """
+    container = CONTAINERS[container_name]
+    with tempfile.TemporaryDirectory(dir=directory) as workdir:
+        results = []
+        for size in sizes:
+            filename = os.path.join(workdir, f"tasks_{size}.json")
+            save_tasks_to_file(filename, make_tasks(size, list))
+
+            operations = {
+                "add_task": (lambda: make_tasks(size, container), add_many),
+                "delete_task": (lambda: make_tasks(size, container), delete_first_many),
+                "format_task_list": (
+                    lambda: make_tasks(size, container),
+                    lambda tasks: format_task_list(tasks) and 1,
+                ),
+                # Пустой список из файла - тоже одна загрузка, а не ноль
+                "load_tasks_from_file": (
+                    lambda: filename,
+                    lambda name: (load_tasks_from_file(name), 1)[1],
+                ),
+                "save_tasks_to_file": (
+                    lambda: make_tasks(size, container),
+                    lambda tasks: (save_tasks_to_file(filename, tasks), 1)[1],
+                ),
+            }
+            for operation, (setup, run) in operations.items():
+                result = measure(setup, run, repeat)
+                result.update(operation=operation, size=size)
+                results.append(result)
+                print(
+                    f"  {operation:<22}{size:>9}"
+                    f"{result['seconds'] * 1000:>12.4f} мс"
+                    f"{result['peak_bytes'] / 1024:>12.0f} КБ"
+                )
+        return results
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Сравнивает результаты с сохранённым эталоном.
+
+    Аргументы:
+        results: Список результатов run_benchmarks
+        baseline: Список результатов из эталонного файла
+        tolerance: Допустимое ухудшение (0.5 = на 50% хуже)
+
+    Возвращает:
+        list: Строки с описанием регрессий (пустой список - всё в порядке)
+    """
+    expected = {(item["operation"], item["size"]): item for item in baseline}
+    regressions = []
+    for item in results:
+        reference = expected.get((item["operation"], item["size"]))
+        if reference is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            limit = reference[metric] * (1 + tolerance)
+            if item[metric] > limit:
+                regressions.append(
+                    f"{item['operation']} на {item['size']} задач: "
+                    f"{metric} {item[metric]:.6g} > {limit:.6g}"
+                )
+    return regressions
+
+
+def write_results(filename, results, container_name):
+    """Сохраняет результаты в JSON вместе с описанием окружения."""
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "container": container_name,
+        "results": results,
+    }
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+def positive_int(text):
+    """Тип аргумента argparse: целое число больше нуля."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"нужно число больше нуля, а не {value}")
+    return value
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Бенчмарк масштабирования менеджера задач")
+    parser.add_argument("--sizes", type=positive_int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--container", choices=sorted(CONTAINERS), default="list")
+    parser.add_argument("--repeat", type=positive_int, default=3)
+    parser.add_argument("--output", help="куда записать результаты в JSON")
+    parser.add_argument("--baseline", help="эталон для сравнения")
+    parser.add_argument("--save-baseline", help="записать результаты как эталон")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="допустимое ухудшение относительно эталона (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    print(f"{'операция':<24}{'задач':>9}{'время/оп':>15}{'пик памяти':>15}")
+    results = run_benchmarks(args.sizes, args.container, args.repeat)
+
+    for filename in (args.output, args.save_baseline):
+        if filename:
+            write_results(filename, results, args.container)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("\nРегрессии относительно эталона:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nРегрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
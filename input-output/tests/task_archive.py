@@ -0,0 +1,488 @@
+"""
+Архив выполненных задач
+
+Выполненные задачи остаются в tasks.json навсегда и переписываются
+при каждом сохранении, хотя их уже никто не меняет. Архив переносит
+их в отдельный сжатый файл, и tasks.json остаётся маленьким: сохранение
+и вывод списка трогают только текущие дела.
+
+Файлы рядом с tasks.json:
+    tasks.json.archive.gz   архив: gzip, строка JSON на задачу. Файл
+                            только дописывается: каждый перенос - новый
+                            gzip-блок в конце, а gzip читает их подряд.
+    tasks.json.done         когда задача была замечена выполненной
+                            (ID -> время Unix); обновляется save_session
+    tasks.json.next_id      ID, с которого выдаются ID новым задачам:
+                            больше любого ID в архиве, чтобы новая
+                            задача не заняла ID перенесённой (иначе её
+                            не восстановить). Если файла нет, число
+                            считается по архиву.
+
+В архив попадают выполненные задачи старше max_age секунд, а если
+выполненных больше keep - ещё и самые старые из лишних.
+Восстановленная задача возвращается в tasks.json со своим ID,
+а в архив дописывается отметка {"id": ..., "restored": true}.
+
+Команды:
+    python task_archive.py archive --days 30 --keep 100
+    python task_archive.py search мол*
+    python task_archive.py restore 42 [--reopen]
+    python task_archive.py list
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import zlib
+
+from task_search import TaskSearchIndex
+
+
+ARCHIVE_SUFFIX = ".archive.gz"
+DONE_TIMES_SUFFIX = ".done"
+NEXT_ID_SUFFIX = ".next_id"
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def get_archive_filename(filename):
+    """
+    Возвращает путь к архиву для файла задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        str: Путь к архиву (например, "tasks.json.archive.gz")
+    """
+    return filename + ARCHIVE_SUFFIX
+
+
+def get_done_times_filename(filename):
+    """
+    Возвращает путь к файлу со временем выполнения задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        str: Путь (например, "tasks.json.done")
+    """
+    return filename + DONE_TIMES_SUFFIX
+
+
+def get_next_id_filename(filename):
+    """
+    Возвращает путь к файлу со следующим свободным ID.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        str: Путь (например, "tasks.json.next_id")
+    """
+    return filename + NEXT_ID_SUFFIX
+
+
+def completed_task_ids(tasks):
+    """
+    Возвращает ID выполненных задач.
+
+    Аргументы:
+        tasks: TaskList или список словарей задач
+
+    Возвращает:
+        list: ID по порядку задач
+    """
+    if hasattr(tasks, "completed_ids"):
+        return tasks.completed_ids()
+    return [task["id"] for task in tasks if task.get("completed") and "id" in task]
+
+
+# ============================================================
+# ВРЕМЯ ВЫПОЛНЕНИЯ
+# ============================================================
+
+def read_done_times(filename):
+    """
+    Читает время выполнения задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        dict: ID -> время Unix (пустой, если файла нет или он повреждён)
+    """
+    try:
+        with open(get_done_times_filename(filename), "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return {int(task_id): float(moment) for task_id, moment in data.items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+def update_done_times(filename, tasks, now=None):
+    """
+    Отмечает время для задач, выполненных с прошлого раза.
+
+    Задача получает время, когда её впервые застали выполненной
+    (обычно это конец сеанса, в котором её выполнили). Записи о
+    задачах, которые больше не выполнены или удалены, выбрасываются.
+    Файл переписывается, только если что-то изменилось.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Текущий список задач
+        now: Текущее время Unix (по умолчанию time.time())
+
+    Возвращает:
+        dict: ID выполненной задачи -> время выполнения
+    """
+    now = time.time() if now is None else now
+    known = read_done_times(filename)
+    times = {task_id: known.get(task_id, now) for task_id in completed_task_ids(tasks)}
+    if times != known:
+        temp_filename = get_done_times_filename(filename) + ".tmp"
+        try:
+            with open(temp_filename, "w", encoding="utf-8") as file:
+                json.dump(times, file)
+            os.replace(temp_filename, get_done_times_filename(filename))
+        except OSError:
+            pass
+    return times
+
+
+def select_for_archive(done_times, now, max_age=None, keep=None):
+    """
+    Выбирает выполненные задачи для переноса в архив.
+
+    Аргументы:
+        done_times: ID выполненной задачи -> время выполнения
+        now: Текущее время Unix
+        max_age: Переносить задачи, выполненные больше max_age секунд
+            назад (None - не смотреть на возраст)
+        keep: Сколько выполненных задач оставить в файле (None - сколько угодно)
+
+    Возвращает:
+        list: ID задач, от самых давно выполненных к недавним
+    """
+    oldest_first = sorted(done_times, key=lambda task_id: (done_times[task_id], task_id))
+    selected = 0
+    if max_age is not None:
+        while selected < len(oldest_first) and now - done_times[oldest_first[selected]] >= max_age:
+            selected += 1
+    if keep is not None:
+        selected = max(selected, len(oldest_first) - keep)
+    return oldest_first[:selected]
+
+
+# ============================================================
+# ФАЙЛ АРХИВА
+# ============================================================
+
+def append_archive(filename, records):
+    """
+    Дописывает записи в архив новым gzip-блоком.
+
+    Аргументы:
+        filename: Путь к архиву
+        records: Словари для записи (строка JSON на словарь)
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    try:
+        with open(filename, "ab") as file:
+            file.write(gzip.compress(lines.encode("utf-8"), compresslevel=6))
+            file.flush()
+            os.fsync(file.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def iter_archive(filename):
+    """
+    Перебирает записи архива по порядку.
+
+    Оборванный при сбое последний блок пропускается.
+
+    Аргументы:
+        filename: Путь к архиву
+
+    Возвращает:
+        iterator: Словари записей (пусто, если архива нет)
+    """
+    try:
+        with gzip.open(filename, "rb") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+    except (OSError, EOFError, zlib.error):
+        return
+
+
+def load_archive(filename):
+    """
+    Собирает задачи, которые сейчас лежат в архиве.
+
+    Аргументы:
+        filename: Путь к архиву
+
+    Возвращает:
+        dict: ID -> словарь задачи (с "completed_at" и "archived_at"),
+        в порядке переноса в архив
+    """
+    archived = {}
+    for record in iter_archive(filename):
+        if not isinstance(record, dict) or not isinstance(record.get("id"), int):
+            continue
+        # Повторный перенос ставит задачу в конец, отметка restored убирает её
+        archived.pop(record["id"], None)
+        if not record.get("restored"):
+            archived[record["id"]] = record
+    return archived
+
+
+# ============================================================
+# СЛЕДУЮЩИЙ СВОБОДНЫЙ ID
+# ============================================================
+
+def write_next_id(filename, next_id):
+    """
+    Записывает следующий свободный ID.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        next_id: ID, больше любого ID в архиве
+
+    Исключения:
+        OSError: Если файл не записался
+    """
+    temp_filename = get_next_id_filename(filename) + ".tmp"
+    with open(temp_filename, "w", encoding="utf-8") as file:
+        file.write(str(next_id))
+    os.replace(temp_filename, get_next_id_filename(filename))
+
+
+def read_next_id(filename):
+    """
+    Читает ID, меньше которого новым задачам ID не выдаются.
+
+    Если файла нет или он повреждён, число считается по архиву
+    (и по возможности записывается, чтобы не читать архив снова).
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        int: Следующий свободный ID (1, если архива нет)
+    """
+    try:
+        with open(get_next_id_filename(filename), "r", encoding="utf-8") as file:
+            return int(file.read())
+    except (OSError, ValueError):
+        pass
+    next_id = 1 + max((record["id"] for record in iter_archive(get_archive_filename(filename))
+                       if isinstance(record, dict) and isinstance(record.get("id"), int)),
+                      default=0)
+    if next_id > 1:
+        try:
+            write_next_id(filename, next_id)
+        except OSError:
+            pass
+    return next_id
+
+
+# ============================================================
+# КОМАНДЫ
+# ============================================================
+
+def archive_tasks(filename, max_age=None, keep=None, now=None):
+    """
+    Переносит старые выполненные задачи из файла задач в архив.
+
+    Сначала задачи дописываются в архив и запоминается следующий
+    свободный ID, потом задачи убираются из файла: при сбое между
+    шагами задача окажется в обоих местах, но не потеряется.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        max_age: Возраст выполненной задачи в секундах для переноса
+        keep: Сколько выполненных задач оставить в файле
+        now: Текущее время Unix (по умолчанию time.time())
+
+    Возвращает:
+        int: Сколько задач перенесено (-1 при ошибке записи)
+    """
+    from task_manager_testable import delete_task_by_id, get_task_by_id, load_tasks_fast, save_session
+    from task_sync import bump_version, task_file_lock
+
+    now = time.time() if now is None else now
+    with task_file_lock(filename):
+        tasks = load_tasks_fast(filename)
+        done_times = update_done_times(filename, tasks, now)
+        task_ids = select_for_archive(done_times, now, max_age, keep)
+        if not task_ids:
+            return 0
+
+        records = []
+        for task_id in task_ids:
+            task = get_task_by_id(tasks, task_id)
+            record = task.to_dict() if hasattr(task, "to_dict") else dict(task)
+            record["completed_at"] = done_times[task_id]
+            record["archived_at"] = now
+            records.append(record)
+        if not append_archive(get_archive_filename(filename), records):
+            return -1
+        # ID перенесённых задач не достанутся новым, даже если среди них был наибольший
+        try:
+            write_next_id(filename, max(read_next_id(filename), max(task_ids) + 1))
+        except OSError:
+            return -1
+
+        for task_id in task_ids:
+            delete_task_by_id(tasks, task_id)
+        if not save_session(filename, tasks):
+            return -1
+        bump_version(filename)
+    return len(task_ids)
+
+
+def search_archive(filename, query):
+    """
+    Ищет задачи в архиве (запросы как в поиске по задачам: мол*, И).
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        query: Строка запроса
+
+    Возвращает:
+        list: Подходящие задачи архива по возрастанию ID
+    """
+    archived = load_archive(get_archive_filename(filename))
+    index = TaskSearchIndex.build(archived.values())
+    return [archived[task_id] for task_id in sorted(index.search(query))]
+
+
+def restore_task(filename, task_id, reopen=False):
+    """
+    Возвращает задачу из архива в файл задач с тем же ID.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        task_id: ID задачи в архиве
+        reopen: Вернуть задачу невыполненной
+
+    Задача сначала сохраняется в файл задач, потом в архив
+    дописывается отметка о восстановлении. Если какой-то шаг не
+    удался, задача снова убирается из файла и остаётся в архиве.
+
+    Возвращает:
+        bool: True если восстановлена, False если её нет в архиве,
+        задача с таким ID уже есть в файле или запись не удалась
+    """
+    from task_manager_testable import (
+        delete_task_by_id,
+        get_task_by_id,
+        load_tasks_fast,
+        save_session,
+    )
+    from task_sync import bump_version, task_file_lock
+
+    archive_filename = get_archive_filename(filename)
+    with task_file_lock(filename):
+        record = load_archive(archive_filename).get(task_id)
+        if record is None:
+            return False
+        tasks = load_tasks_fast(filename)
+        if get_task_by_id(tasks, task_id) is not None:
+            return False
+        tasks.append({
+            "id": task_id,
+            "description": record["description"],
+            "completed": bool(record.get("completed")) and not reopen,
+        })
+        try:
+            # Версия - до отметки: после отметки откат потерял бы задачу
+            if save_session(filename, tasks):
+                bump_version(filename)
+                if append_archive(archive_filename, [{"id": task_id, "restored": True}]):
+                    return True
+        except OSError:
+            pass
+
+        # Откат: задача остаётся только в архиве
+        delete_task_by_id(tasks, task_id)
+        try:
+            save_session(filename, tasks)
+            bump_version(filename)
+        except OSError:
+            pass
+        return False
+
+
+def format_archived_task(task):
+    """
+    Форматирует задачу архива для вывода.
+
+    Аргументы:
+        task: Словарь задачи из архива
+
+    Возвращает:
+        str: Строка вида "#42 [✓] Купить молоко (в архиве с 2024-05-01)"
+    """
+    status = "✓" if task.get("completed") else " "
+    archived_at = time.strftime("%Y-%m-%d", time.localtime(task.get("archived_at", 0)))
+    return f"#{task['id']} [{status}] {task['description']} (в архиве с {archived_at})"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Архив выполненных задач")
+    parser.add_argument("--tasks", default="tasks.json", help="файл задач")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="перенести выполненные задачи в архив")
+    archive.add_argument("--days", type=float, help="старше скольких дней")
+    archive.add_argument("--keep", type=int, help="сколько выполненных задач оставить")
+    commands.add_parser("search", help="найти задачи в архиве").add_argument("query")
+    restore = commands.add_parser("restore", help="вернуть задачу из архива")
+    restore.add_argument("id", type=int)
+    restore.add_argument("--reopen", action="store_true", help="вернуть невыполненной")
+    commands.add_parser("list", help="показать архив")
+    args = parser.parse_args(argv)
+
+    if args.command == "archive":
+        if args.days is None and args.keep is None:
+            parser.error("укажите --days и/или --keep")
+        max_age = None if args.days is None else args.days * SECONDS_PER_DAY
+        moved = archive_tasks(args.tasks, max_age, args.keep)
+        if moved < 0:
+            print("✗ Не удалось записать архив.")
+            return 1
+        print(f"✓ Перенесено в архив: {moved}")
+        return 0
+
+    if args.command == "restore":
+        if restore_task(args.tasks, args.id, args.reopen):
+            print("✓ Задача восстановлена!")
+            return 0
+        print("✗ Задачи с таким ID нет в архиве.")
+        return 1
+
+    if args.command == "search":
+        found = search_archive(args.tasks, args.query)
+    else:
+        found = list(load_archive(get_archive_filename(args.tasks)).values())
+    for task in found:
+        print(format_archived_task(task))
+    print(f"Найдено в архиве: {len(found)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,220 @@
+"""
+Клиент сервера задач и генератор нагрузки
+
+Тонкий клиент: не читает tasks.json, а отправляет запросы серверу
+(task_server.py) через Unix сокет.
+
+Примеры:
+    python task_client.py add "Купить молоко"
+    python task_client.py list
+    python task_client.py done 3
+    python task_client.py rm 3
+    python task_client.py search мол*
+
+Генератор нагрузки - сотни одновременных соединений:
+    python task_client.py bench --connections 300 --requests 100
+Задачи, которые добавил генератор, после замера удаляются.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+
+from task_manager_testable import format_task_line
+from task_server import DEFAULT_SOCKET
+
+
+class TaskClient:
+    """
+    Синхронный клиент: один запрос - одна строка JSON туда и обратно.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        """
+        Аргументы:
+            socket_path: Путь к сокету сервера
+        """
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(socket_path)
+        self.reader = self.connection.makefile("rb")
+
+    def close(self):
+        """Закрывает соединение."""
+        self.reader.close()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    def request(self, **fields):
+        """
+        Отправляет запрос и ждёт ответа.
+
+        Пример:
+            client.request(op="add", description="Купить молоко")
+
+        Возвращает:
+            dict: Ответ сервера
+        """
+        line = json.dumps(fields, ensure_ascii=False).encode("utf-8") + b"\n"
+        self.connection.sendall(line)
+        answer = self.reader.readline()
+        if not answer:
+            raise ConnectionError("Сервер закрыл соединение")
+        return json.loads(answer)
+
+
+# ============================================================
+# ГЕНЕРАТОР НАГРУЗКИ
+# ============================================================
+
+def load_request(number):
+    """
+    Запрос номер number в смеси нагрузки: 1 изменение на 10 чтений.
+
+    Аргументы:
+        number: Порядковый номер запроса в соединении
+
+    Возвращает:
+        dict: Запрос
+    """
+    if number % 11 == 0:
+        return {"op": "add", "description": f"Нагрузочная задача {number}"}
+    if number % 2 == 0:
+        return {"op": "list", "offset": 0, "limit": 20}
+    return {"op": "count"}
+
+
+async def send_requests(socket_path, requests):
+    """
+    Отправляет запросы по одному соединению друг за другом.
+
+    Аргументы:
+        socket_path: Путь к сокету сервера
+        requests: Словари запросов
+
+    Возвращает:
+        list: Ответы сервера в том же порядке
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    responses = []
+    try:
+        for request in requests:
+            writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return responses
+
+
+async def run_connection(socket_path, requests):
+    """
+    Одно соединение генератора: запросы идут друг за другом.
+
+    Возвращает:
+        tuple: (количество ответов с ошибкой, ID добавленных задач)
+    """
+    responses = await send_requests(socket_path, map(load_request, range(requests)))
+    failed = sum(1 for response in responses if not response["ok"])
+    created = [response["id"] for response in responses if "id" in response]
+    return failed, created
+
+
+async def run_load(socket_path, connections, requests):
+    """
+    Открывает много соединений сразу и меряет пропускную способность.
+
+    Добавленные задачи после замера удаляются, чтобы нагрузка не
+    оставляла их в настоящем списке.
+
+    Аргументы:
+        socket_path: Путь к сокету сервера
+        connections: Количество одновременных соединений
+        requests: Запросов на соединение
+
+    Возвращает:
+        dict: requests, failed, seconds, requests_per_second
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_connection(socket_path, requests) for _ in range(connections))
+    )
+    seconds = time.perf_counter() - start
+    # Удаления тоже идут по всем соединениям сразу, чтобы попадать в общие пачки
+    await asyncio.gather(*(
+        send_requests(socket_path, [{"op": "delete", "id": task_id} for task_id in created])
+        for _, created in results if created
+    ))
+    total = connections * requests
+    return {
+        "requests": total,
+        "failed": sum(failed for failed, _ in results),
+        "seconds": seconds,
+        "requests_per_second": total / seconds if seconds else 0.0,
+    }
+
+
+# ============================================================
+# КОМАНДНАЯ СТРОКА
+# ============================================================
+
+def print_response(command, response):
+    """Печатает ответ сервера в виде, привычном по менеджеру задач."""
+    if not response["ok"]:
+        print(f"✗ {response['error']}")
+    elif command == "list":
+        for number, task in enumerate(response["tasks"], 1):
+            print(format_task_line(number, task))
+        print(f"Всего задач: {response['total']}")
+    elif command == "search":
+        for result in response["results"]:
+            print(format_task_line(result["number"], result["task"]))
+    else:
+        print("✓ Готово")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Клиент сервера задач")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="путь к сокету")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("add").add_argument("description")
+    commands.add_parser("list").add_argument("--limit", type=int, default=20)
+    commands.add_parser("done").add_argument("index", type=int)
+    commands.add_parser("rm").add_argument("index", type=int)
+    commands.add_parser("search").add_argument("query")
+    bench = commands.add_parser("bench")
+    bench.add_argument("--connections", type=int, default=200)
+    bench.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        result = asyncio.run(run_load(args.socket, args.connections, args.requests))
+        print(f"{result['requests']} запросов через {args.connections} соединений "
+              f"за {result['seconds']:.2f} с: {result['requests_per_second']:.0f} в секунду "
+              f"(ошибок: {result['failed']})")
+        return 0
+
+    requests = {
+        "add": lambda: {"op": "add", "description": args.description},
+        "list": lambda: {"op": "list", "limit": args.limit},
+        "done": lambda: {"op": "complete", "index": args.index},
+        "rm": lambda: {"op": "delete", "index": args.index},
+        "search": lambda: {"op": "search", "query": args.query},
+    }
+    with TaskClient(args.socket) as client:
+        response = client.request(**requests[args.command]())
+    print_response(args.command, response)
+    return 0 if response["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
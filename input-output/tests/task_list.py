@@ -0,0 +1,512 @@
+"""
+Компактный список задач
+
+Обычный список словарей {"description": ..., "completed": ...} тратит
+на каждую задачу отдельный словарь (~200 байт сверху описания).
+TaskList хранит те же данные колонками:
+- описания - в одном списке строк
+- флаги выполнения - в bytearray (1 байт на задачу)
+- стабильные ID - в array, плюс словарь ID -> ячейка для поиска за O(1)
+  (словарь строится при первом обращении по ID)
+
+Удаление не сдвигает остальные задачи: ячейка помечается как
+удалённая ("надгробие"), а сжатие выполняется лениво, когда
+надгробий становится больше, чем живых задач. Нумерация 1, 2, 3...
+из format_task_list - это лишь наложение поверх живых ячеек:
+номер переводится в ячейку через дерево Фенвика за O(log n).
+
+Снаружи TaskList ведёт себя как список словарей: его принимают
+add_task, complete_task, delete_task, get_task_by_index и
+format_task_list без изменения их сигнатур.
+
+Запустить сравнение памяти:
+    python task_list.py 1000000
+"""
+
+import sys
+import tracemalloc
+from array import array
+
+
+# Состояния ячейки в TaskList._states
+OPEN = 0
+DONE = 1
+DELETED = 2
+
+# Сжатие не запускается, пока надгробий меньше этого числа
+COMPACT_MIN_TOMBSTONES = 1024
+
+
+class TaskView:
+    """
+    Представление одной задачи внутри TaskList.
+
+    Ведёт себя как словарь задачи: task["description"],
+    task["completed"] = True и т.д. Своих данных не хранит.
+    Помнит ячейку задачи, а после сжатия списка находит её заново
+    по стабильному ID, поэтому остаётся верным после удалений.
+    """
+
+    __slots__ = ("_tasks", "_id", "_slot", "_generation")
+
+    KEYS = ("id", "description", "completed")
+
+    def __init__(self, tasks, task_id, slot):
+        self._tasks = tasks
+        self._id = task_id
+        self._slot = slot
+        self._generation = tasks._generation
+
+    @property
+    def id(self):
+        return self._id
+
+    def _locate(self):
+        """Возвращает текущую ячейку задачи (KeyError если задача удалена)."""
+        tasks = self._tasks
+        if self._generation != tasks._generation:
+            self._slot = tasks._id_index()[self._id]
+            self._generation = tasks._generation
+        elif tasks._states[self._slot] == DELETED:
+            raise KeyError(self._id)
+        return self._slot
+
+    def __getitem__(self, key):
+        if key == "id":
+            return self._id
+        slot = self._locate()
+        if key == "description":
+            return self._tasks._descriptions[slot]
+        if key == "completed":
+            return self._tasks._states[slot] == DONE
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        slot = self._locate()
+        if key == "description":
+            self._tasks._descriptions[slot] = value
+        elif key == "completed":
+            self._tasks._states[slot] = DONE if value else OPEN
+        else:
+            raise KeyError(key)
+        self._tasks._note_change(self._id)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        """Возвращает обычный словарь задачи."""
+        return {key: self[key] for key in self.KEYS}
+
+    def __eq__(self, other):
+        if isinstance(other, TaskView):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TaskView({self.to_dict()!r})"
+
+
+class TaskList:
+    """
+    Список задач с колоночным хранением и стабильными ID.
+
+    Поддерживает операции списка, которые используют чистые функции
+    менеджера задач: len(), индексацию, итерацию, append() и pop().
+    Индекс здесь - позиция среди живых задач (как в обычном списке),
+    а ID - постоянный номер задачи, который не меняется при удалениях.
+    """
+
+    __slots__ = (
+        "_ids", "_descriptions", "_states", "_slot_by_id",
+        "_next_id", "_tombstones", "_tree", "_generation", "_changed",
+    )
+
+    def __init__(self, tasks=()):
+        """
+        Аргументы:
+            tasks: Итерируемый набор словарей задач (например, из JSON).
+                Ключ "id" необязателен: задачам без него выдаются новые ID.
+        """
+        self._ids = array("q")
+        self._descriptions = []
+        self._states = bytearray()
+        # Словарь ID -> ячейка строится при первом обращении по ID
+        self._slot_by_id = None
+        self._next_id = 1
+        self._tombstones = 0
+        # Дерево Фенвика над живыми ячейками; строится только при надгробиях
+        self._tree = None
+        # Меняется при сжатии, когда ячейки задач переезжают
+        self._generation = 0
+        # ID изменённых задач (None - изменения не отслеживаются)
+        self._changed = None
+        for task in tasks:
+            self.append(task)
+
+    @classmethod
+    def from_columns(cls, ids, descriptions, states, next_id):
+        """
+        Собирает TaskList из готовых колонок без поштучного добавления.
+
+        Так загрузчики (например, бинарный снимок) могут подставить
+        свои колонки: descriptions может быть любым объектом с
+        индексацией, append() и len(), в том числе ленивым.
+
+        Аргументы:
+            ids: array("q") с ID задач
+            descriptions: Описания задач по ячейкам
+            states: bytearray с состояниями OPEN/DONE
+            next_id: ID для следующей новой задачи
+
+        Возвращает:
+            TaskList: Новый список задач
+        """
+        tasks = cls()
+        tasks._ids = ids
+        tasks._descriptions = descriptions
+        tasks._states = states
+        tasks._next_id = next_id
+        return tasks
+
+    def __len__(self):
+        return len(self._ids) - self._tombstones
+
+    def _id_index(self):
+        """Возвращает словарь ID -> ячейка, строя его при первом вызове."""
+        if self._slot_by_id is None:
+            states = self._states
+            self._slot_by_id = {
+                task_id: slot for slot, task_id in enumerate(self._ids)
+                if states[slot] != DELETED
+            }
+        return self._slot_by_id
+
+    # ----- Перевод позиции в ячейку (наложение нумерации) -----
+
+    def _build_tree(self):
+        """Строит дерево Фенвика: для всех живых ячеек оно равно i & -i."""
+        size = len(self._states)
+        tree = array("q", (i & -i for i in range(size + 1)))
+        self._tree = tree
+        slot = self._states.find(DELETED)
+        while slot != -1:
+            self._tree_add(slot, -1)
+            slot = self._states.find(DELETED, slot + 1)
+
+    def _tree_add(self, slot, delta):
+        tree = self._tree
+        i = slot + 1
+        size = len(tree)
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    def _tree_prefix(self, count):
+        """Количество живых ячеек среди первых count ячеек."""
+        tree = self._tree
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def _slot_at(self, index):
+        """Переводит позицию (в том числе отрицательную) в номер ячейки."""
+        if not isinstance(index, int):
+            raise TypeError("индекс задачи должен быть int")
+        size = len(self)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("индекс задачи вне диапазона")
+        if self._tombstones == 0:
+            return index
+
+        if self._tree is None:
+            self._build_tree()
+        tree = self._tree
+        # Спуск по дереву: ищем ячейку с (index + 1)-й живой задачей
+        remaining = index + 1
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            candidate = position + step
+            if candidate < len(tree) and tree[candidate] < remaining:
+                position = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return position
+
+    # ----- Операции списка -----
+
+    def __getitem__(self, index):
+        slot = self._slot_at(index)
+        return TaskView(self, self._ids[slot], slot)
+
+    def __iter__(self):
+        ids = self._ids
+        states = self._states
+        for slot in range(len(states)):
+            if states[slot] != DELETED:
+                yield TaskView(self, ids[slot], slot)
+
+    def append(self, task):
+        """
+        Добавляет задачу в конец списка.
+
+        Аргументы:
+            task: Словарь задачи (или TaskView)
+        """
+        task_id = task.get("id")
+        # ID не меньше _next_id заведомо свободен, остальные проверяем по словарю
+        if not isinstance(task_id, int) or (task_id < self._next_id and task_id in self._id_index()):
+            task_id = self._next_id
+        self._next_id = max(self._next_id, task_id + 1)
+
+        slot = len(self._states)
+        self._ids.append(task_id)
+        self._descriptions.append(task["description"])
+        self._states.append(DONE if task.get("completed") else OPEN)
+        if self._slot_by_id is not None:
+            self._slot_by_id[task_id] = slot
+        if self._changed is not None:
+            self._changed.add(task_id)
+
+        if self._tree is not None:
+            # Новый узел дерева покрывает ячейки (slot + 1 - lowbit, slot + 1]
+            i = slot + 1
+            covered = self._tree_prefix(i - 1) - self._tree_prefix(i - (i & -i))
+            self._tree.append(covered + 1)
+
+    def pop(self, index=-1):
+        """
+        Удаляет задачу и возвращает её как обычный словарь.
+
+        Остальные задачи не сдвигаются: ячейка становится надгробием.
+
+        Аргументы:
+            index: Позиция начиная с 0 (по умолчанию последняя задача)
+
+        Возвращает:
+            dict: Удалённая задача
+        """
+        return self._remove_slot(self._slot_at(index))
+
+    def _remove_slot(self, slot):
+        task_id = self._ids[slot]
+        task = TaskView(self, task_id, slot).to_dict()
+
+        if self._slot_by_id is not None:
+            del self._slot_by_id[task_id]
+        self._states[slot] = DELETED
+        self._descriptions[slot] = None
+        self._tombstones += 1
+        self._note_change(task_id)
+        if self._tree is not None:
+            self._tree_add(slot, -1)
+
+        if self._tombstones >= COMPACT_MIN_TOMBSTONES and self._tombstones > len(self):
+            self.compact()
+        return task
+
+    def compact(self):
+        """
+        Убирает надгробия и переупаковывает ячейки.
+
+        ID задач при этом не меняются. Вызывается автоматически,
+        когда надгробий становится больше, чем живых задач.
+        """
+        if self._tombstones == 0:
+            return
+        states = self._states
+        live = [slot for slot in range(len(states)) if states[slot] != DELETED]
+        self._ids = array("q", (self._ids[slot] for slot in live))
+        if hasattr(self._descriptions, "select"):
+            # Ленивые описания переупаковываются без чтения строк
+            self._descriptions = self._descriptions.select(live)
+        else:
+            self._descriptions = [self._descriptions[slot] for slot in live]
+        self._states = bytearray(states[slot] for slot in live)
+        self._slot_by_id = None
+        self._tombstones = 0
+        self._tree = None
+        self._generation += 1
+
+    def reserve_ids(self, next_id):
+        """
+        Не выдаёт новым задачам ID меньше next_id.
+
+        Аргументы:
+            next_id: Наименьший ID для следующей новой задачи
+                (например, после ID задач из архива)
+        """
+        self._next_id = max(self._next_id, next_id)
+
+    # ----- Отслеживание изменений -----
+
+    def track_changes(self):
+        """
+        Начинает запоминать ID добавленных, изменённых и удалённых задач.
+
+        Так сохранение в шарды (task_shards.py) узнаёт, какие шарды
+        переписать, не сериализуя весь список.
+        """
+        self._changed = set()
+
+    def changed_ids(self):
+        """Возвращает множество ID изменённых задач, или None если изменения не отслеживаются."""
+        return self._changed
+
+    def clear_changes(self):
+        """Забывает изменения после сохранения (отслеживание продолжается)."""
+        if self._changed is not None:
+            self._changed = set()
+
+    def _note_change(self, task_id):
+        if self._changed is not None:
+            self._changed.add(task_id)
+
+    # ----- Доступ по стабильному ID -----
+
+    def get_by_id(self, task_id):
+        """
+        Возвращает задачу по ID за O(1).
+
+        Аргументы:
+            task_id: Стабильный ID задачи
+
+        Возвращает:
+            TaskView or None: Задача или None если такого ID нет
+        """
+        slot = self._id_index().get(task_id)
+        if slot is None:
+            return None
+        return TaskView(self, task_id, slot)
+
+    def pop_by_id(self, task_id):
+        """
+        Удаляет задачу по ID за O(1) (без учёта редкого сжатия).
+
+        Аргументы:
+            task_id: Стабильный ID задачи
+
+        Возвращает:
+            dict or None: Удалённая задача или None если такого ID нет
+        """
+        slot = self._id_index().get(task_id)
+        if slot is None:
+            return None
+        return self._remove_slot(slot)
+
+    def position_of(self, task_id):
+        """
+        Возвращает отображаемый номер задачи (начиная с 1).
+
+        Аргументы:
+            task_id: Стабильный ID задачи
+
+        Возвращает:
+            int or None: Номер как в format_task_list, или None
+        """
+        slot = self._id_index().get(task_id)
+        if slot is None:
+            return None
+        if self._tombstones == 0:
+            return slot + 1
+        if self._tree is None:
+            self._build_tree()
+        return self._tree_prefix(slot + 1)
+
+    def completed_ids(self):
+        """Возвращает ID выполненных задач по порядку, не трогая описания."""
+        return [task_id for task_id, state in zip(self._ids, self._states) if state == DONE]
+
+    def iter_dicts(self):
+        """Выдаёт задачи по одной как обычные словари, не собирая список."""
+        for task_id, description, state in zip(self._ids, self._descriptions, self._states):
+            if state != DELETED:
+                yield {"id": task_id, "description": description, "completed": state == DONE}
+
+    def to_dicts(self):
+        """Возвращает задачи как обычный список словарей (например, для JSON)."""
+        return list(self.iter_dicts())
+
+    def __eq__(self, other):
+        if isinstance(other, TaskList):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TaskList({self.to_dicts()!r})"
+
+
+# ============================================================
+# СРАВНЕНИЕ ПАМЯТИ
+# ============================================================
+
+def measure_retained_memory(build, count):
+    """
+    Измеряет, сколько памяти занимает построенный список задач.
+
+    Считается память, которая остаётся занятой после построения
+    (текущий размер tracemalloc), а не пик во время построения.
+
+    Аргументы:
+        build: Функция без аргументов, которая строит и возвращает задачи
+        count: Количество задач (для пересчёта на одну задачу)
+
+    Возвращает:
+        tuple: (байт всего, байт на задачу)
+    """
+    tracemalloc.start()
+    tasks = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return current, current / count
+
+
+def benchmark_memory(count):
+    """
+    Сравнивает список словарей и TaskList на одинаковых данных.
+
+    Обе структуры наполняются через add_task, то есть так же,
+    как их наполняет менеджер задач.
+
+    Аргументы:
+        count: Количество задач
+
+    Возвращает:
+        dict: Байт всего и байт на задачу для каждой формы
+    """
+    from task_manager_testable import add_task
+
+    def build(tasks):
+        for i in range(count):
+            add_task(tasks, f"Задача номер {i}")
+        return tasks
+
+    results = {}
+    for name, factory in (("list[dict]", list), ("TaskList", TaskList)):
+        total, per_task = measure_retained_memory(lambda: build(factory()), count)
+        results[name] = {"bytes": total, "bytes_per_task": per_task}
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Память на {count} задач:")
+    for name, result in benchmark_memory(count).items():
+        megabytes = result["bytes"] / 1024 / 1024
+        print(f"  {name:<12} {megabytes:8.1f} МБ  ({result['bytes_per_task']:.0f} байт/задачу)")
@@ -9,7 +9,37 @@
 - Чистые функции легко тестировать
 """
 
+import argparse
 import json
+import os
+import re
+import sys
+from contextlib import contextmanager
+
+from task_list import TaskList
+from task_parse_cache import get_cache_dir, load_json_cached
+from task_shards import get_manifest_filename, is_shard_directory, load_shards, save_shards
+from task_search import search_tasks
+from task_snapshot import get_snapshot_filename, load_snapshot, write_snapshot
+
+
+# Журнал операций: маленькие записи дописываются в tasks.json.log,
+# а полный снимок переписывается только при компактификации - когда
+# журнал перерастает и JOURNAL_COMPACT_BYTES, и сам снимок. Так на каждый
+# записанный в журнал байт приходится не больше байта перезаписи снимка.
+JOURNAL_SUFFIX = ".log"
+JOURNAL_COMPACT_BYTES = 256 * 1024
+# Журнал, уже учтённый в новом снимке, который ещё не подменил старый
+# (метка незаконченного сохранения, см. finish_compaction)
+COMPACTING_SUFFIX = ".compacting"
+
+# Потоковая загрузка: размер порции чтения и размер первой страницы
+STREAM_CHUNK_SIZE = 64 * 1024
+FIRST_PAGE_SIZE = 20
+WHITESPACE = re.compile(r"\s*")
+
+# Постраничный вывод: сколько задач показывать на одной странице
+PAGE_SIZE = 20
 
 
 # ============================================================
@@ -31,6 +61,23 @@ def validate_task_description(description):
     return len(description.strip()) > 0
 
 
+def validate_task_dict(task):
+    """
+    Проверяет, похож ли загруженный объект на словарь задачи.
+    
+    Аргументы:
+        task: Объект, прочитанный из JSON
+        
+    Возвращает:
+        bool: True если это валидная задача, False в противном случае
+    """
+    if not isinstance(task, dict):
+        return False
+    if not validate_task_description(task.get("description")):
+        return False
+    return isinstance(task.get("completed", False), bool)
+
+
 def create_task_dict(description):
     """
     Создаёт словарь задачи из описания.
@@ -47,13 +94,47 @@ def create_task_dict(description):
     }
 
 
-def add_task(tasks, description):
+def assign_task_id(tasks, task):
+    """
+    Выдаёт новой задаче обычного списка ID, следующий за наибольшим.
+    
+    TaskList выдаёт ID сам при append(), поэтому для него задача
+    не меняется. Для списка словарей это перебор, так что ID
+    выдаётся только когда он нужен (например, поисковому индексу).
+    
+    Аргументы:
+        tasks: TaskList или список словарей задач (ещё без task)
+        task: Словарь новой задачи
+        
+    Возвращает:
+        dict: Та же задача
+    """
+    if not hasattr(tasks, "get_by_id"):
+        task["id"] = max((other.get("id", 0) for other in tasks), default=0) + 1
+    return task
+
+
+def index_added_task(search_index, task):
+    """Добавляет задачу в поисковый индекс, если он есть."""
+    if search_index is not None and task.get("id") is not None:
+        search_index.add(task["id"], task["description"])
+
+
+def index_removed_task(search_index, task):
+    """Убирает задачу из поискового индекса, если он есть."""
+    if search_index is not None and task.get("id") is not None:
+        search_index.remove(task["id"], task["description"])
+
+
+def add_task(tasks, description, search_index=None):
     """
     Добавляет задачу в список, если она валидна.
     
     Аргументы:
         tasks: Список словарей задач
         description: Строка с описанием задачи
+        search_index: Поисковый индекс, который нужно обновить
+            (необязательно; задачам обычного списка тогда выдаётся ID)
         
     Возвращает:
         bool: True если добавлена, False если невалидна
@@ -62,10 +143,27 @@ def add_task(tasks, description):
         return False
     
     task = create_task_dict(description)
+    if search_index is not None:
+        assign_task_id(tasks, task)
     tasks.append(task)
+    index_added_task(search_index, tasks[-1])
     return True
 
 
+def is_valid_task_index(tasks, index):
+    """
+    Проверяет, указывает ли индекс (начиная с 1) на задачу из списка.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        index: Индекс начиная с 1
+        
+    Возвращает:
+        bool: True если индекс валиден, False в противном случае
+    """
+    return isinstance(index, int) and 1 <= index <= len(tasks)
+
+
 def get_task_by_index(tasks, index):
     """
     Получает задачу по её индексу (начиная с 1).
@@ -77,7 +175,7 @@ def get_task_by_index(tasks, index):
     Возвращает:
         dict or None: Словарь задачи или None если индекс невалиден
     """
-    if not isinstance(index, int) or index < 1 or index > len(tasks):
+    if not is_valid_task_index(tasks, index):
         return None
     return tasks[index - 1]
 
@@ -101,24 +199,214 @@ def complete_task(tasks, index):
     return True
 
 
-def delete_task(tasks, index):
+def delete_task(tasks, index, search_index=None):
     """
     Удаляет задачу из списка.
     
     Аргументы:
         tasks: Список словарей задач
         index: Индекс начиная с 1
+        search_index: Поисковый индекс, который нужно обновить
+            (необязательно; требует TaskList со стабильными ID)
         
     Возвращает:
         bool: True если удалена, False если индекс невалиден
     """
-    if not isinstance(index, int) or index < 1 or index > len(tasks):
+    if not is_valid_task_index(tasks, index):
+        return False
+    
+    index_removed_task(search_index, tasks.pop(index - 1))
+    return True
+
+
+def add_tasks(tasks, descriptions, search_index=None):
+    """
+    Добавляет пачку задач: либо все, либо ни одной.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        descriptions: Итерируемый набор описаний
+        search_index: Поисковый индекс, который нужно обновить (необязательно)
+        
+    Возвращает:
+        bool: True если добавлены все, False если хоть одно описание невалидно
+    """
+    descriptions = list(descriptions)
+    if not all(validate_task_description(description) for description in descriptions):
         return False
     
-    tasks.pop(index - 1)
+    next_id = None
+    if search_index is not None and not hasattr(tasks, "get_by_id"):
+        # Один перебор на всю пачку, а не на каждую задачу
+        next_id = assign_task_id(tasks, {})["id"]
+    for description in descriptions:
+        task = create_task_dict(description)
+        if next_id is not None:
+            task["id"] = next_id
+            next_id += 1
+        tasks.append(task)
+        index_added_task(search_index, tasks[-1])
     return True
 
 
+def complete_tasks(tasks, indices):
+    """
+    Отмечает пачку задач выполненными: либо все, либо ни одной.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        indices: Итерируемый набор индексов начиная с 1
+        
+    Возвращает:
+        bool: True если успешно, False если хоть один индекс невалиден
+    """
+    indices = list(indices)
+    if not all(is_valid_task_index(tasks, index) for index in indices):
+        return False
+    
+    for index in indices:
+        tasks[index - 1]["completed"] = True
+    return True
+
+
+def delete_tasks(tasks, indices, search_index=None):
+    """
+    Удаляет пачку задач: либо все, либо ни одной.
+    
+    Индексы относятся к списку до удаления. Задачи удаляются
+    с конца (по убыванию индекса), чтобы удаление одной задачи
+    не сдвигало номера ещё не удалённых. Повторы игнорируются.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        indices: Итерируемый набор индексов начиная с 1
+        search_index: Поисковый индекс, который нужно обновить (необязательно)
+        
+    Возвращает:
+        bool: True если успешно, False если хоть один индекс невалиден
+    """
+    indices = set(indices)
+    if not all(is_valid_task_index(tasks, index) for index in indices):
+        return False
+    
+    for index in sorted(indices, reverse=True):
+        index_removed_task(search_index, tasks.pop(index - 1))
+    return True
+
+
+def get_task_by_id(tasks, task_id):
+    """
+    Получает задачу по её стабильному ID.
+    
+    Для TaskList поиск идёт через словарь ID за O(1),
+    для обычного списка - перебором по ключу "id".
+    
+    Аргументы:
+        tasks: TaskList или список словарей задач
+        task_id: Стабильный ID задачи
+        
+    Возвращает:
+        dict or None: Задача или None если такого ID нет
+    """
+    if hasattr(tasks, "get_by_id"):
+        return tasks.get_by_id(task_id)
+    for task in tasks:
+        if task.get("id") == task_id:
+            return task
+    return None
+
+
+def complete_task_by_id(tasks, task_id):
+    """
+    Отмечает задачу с данным ID как выполненную.
+    
+    Аргументы:
+        tasks: TaskList или список словарей задач
+        task_id: Стабильный ID задачи
+        
+    Возвращает:
+        bool: True если успешно, False если такого ID нет
+    """
+    task = get_task_by_id(tasks, task_id)
+    if task is None:
+        return False
+    
+    task["completed"] = True
+    return True
+
+
+def delete_task_by_id(tasks, task_id, search_index=None):
+    """
+    Удаляет задачу с данным ID.
+    
+    TaskList оставляет на месте задачи надгробие, поэтому
+    остальные задачи не сдвигаются.
+    
+    Аргументы:
+        tasks: TaskList или список словарей задач
+        task_id: Стабильный ID задачи
+        search_index: Поисковый индекс, который нужно обновить (необязательно)
+        
+    Возвращает:
+        bool: True если удалена, False если такого ID нет
+    """
+    if hasattr(tasks, "pop_by_id"):
+        task = tasks.pop_by_id(task_id)
+        if task is None:
+            return False
+        index_removed_task(search_index, task)
+        return True
+    for i, task in enumerate(tasks):
+        if task.get("id") == task_id:
+            index_removed_task(search_index, tasks.pop(i))
+            return True
+    return False
+
+
+def format_task_line(number, task):
+    """
+    Форматирует одну задачу для отображения.
+    
+    Аргументы:
+        number: Отображаемый номер задачи (начиная с 1)
+        task: Словарь задачи
+        
+    Возвращает:
+        str: Строка вида "1. [✓] Купить молоко"
+    """
+    status = "✓" if task["completed"] else " "
+    return f"{number}. [{status}] {task['description']}"
+
+
+def iter_task_lines(tasks, offset=0, limit=None):
+    """
+    Лениво форматирует окно задач для отображения.
+    
+    Форматируются только задачи из окна [offset, offset + limit),
+    поэтому стоимость не зависит от длины всего списка.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        offset: Сколько задач пропустить с начала
+        limit: Сколько задач показать (None - до конца)
+        
+    Возвращает:
+        generator: Отформатированные строки для задач окна
+    """
+    if len(tasks) == 0:
+        yield "Задач пока нет."
+        return
+    
+    if offset == 0 and limit is None:
+        for i, task in enumerate(tasks, 1):
+            yield format_task_line(i, task)
+        return
+    
+    stop = len(tasks) if limit is None else min(len(tasks), offset + limit)
+    for i in range(max(offset, 0), stop):
+        yield format_task_line(i + 1, tasks[i])
+
+
 def format_task_list(tasks):
     """
     Форматирует задачи как список строк для отображения.
@@ -129,74 +417,906 @@ def format_task_list(tasks):
     Возвращает:
         list: Отформатированные строки для каждой задачи
     """
-    if len(tasks) == 0:
-        return ["Задач пока нет."]
+    return list(iter_task_lines(tasks))
+
+
+def count_pages(tasks, page_size):
+    """
+    Считает количество страниц для постраничного вывода.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        page_size: Задач на странице
+        
+    Возвращает:
+        int: Количество страниц (минимум 1)
+    """
+    return max(1, (len(tasks) + page_size - 1) // page_size)
+
+
+def format_task_page(tasks, page, page_size):
+    """
+    Форматирует одну страницу задач как готовый к выводу текст.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        page: Номер страницы начиная с 1
+        page_size: Задач на странице
+        
+    Возвращает:
+        str: Текст страницы с заголовком
+    """
+    page_count = count_pages(tasks, page_size)
+    lines = [f"\nВаши задачи (страница {page} из {page_count}):"]
+    for line in iter_task_lines(tasks, offset=(page - 1) * page_size, limit=page_size):
+        lines.append(f"  {line}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_page_command(command, page, page_count):
+    """
+    Определяет, какую страницу показать после команды пользователя.
+    
+    Команды:
+        n - следующая страница
+        p - предыдущая страница
+        число - перейти на страницу с этим номером
+        пустая строка или q - закончить просмотр
+    
+    Аргументы:
+        command: Введённая команда
+        page: Текущая страница
+        page_count: Всего страниц
+        
+    Возвращает:
+        int or None: Новая страница, или None если просмотр закончен
+    """
+    command = command.strip().lower()
+    if command in ("", "q"):
+        return None
+    if command == "n":
+        return min(page + 1, page_count)
+    if command == "p":
+        return max(page - 1, 1)
+    try:
+        return min(max(int(command), 1), page_count)
+    except ValueError:
+        return page
+
+
+def parse_command(line):
+    """
+    Разбирает строку команды пакетного режима.
+    
+    Аргументы:
+        line: Строка вида "add купить молоко", "done 3", "rm 1" или "list"
+        
+    Возвращает:
+        tuple: (команда, аргумент) - аргумент это строка, число или None;
+        (None, None) для пустой строки или комментария (#)
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None, None
+    
+    name, _, argument = line.partition(" ")
+    name = name.lower()
+    argument = argument.strip()
+    if name in ("done", "rm"):
+        try:
+            return name, int(argument)
+        except ValueError:
+            return name, None
+    return name, argument or None
+
+
+def execute_command(tasks, line):
+    """
+    Выполняет одну команду пакетного режима над списком задач.
+    
+    Команды:
+        add <текст> - добавить задачу
+        done <n>    - выполнить задачу номер n
+        rm <n>      - удалить задачу номер n
+        list        - показать все задачи
+    
+    Аргументы:
+        tasks: Список словарей задач
+        line: Строка команды
+        
+    Возвращает:
+        tuple: (запись журнала или None если список не изменился,
+                строки вывода, сообщение об ошибке или None)
+    """
+    name, argument = parse_command(line)
+    if name is None:
+        return None, [], None
     
-    lines = []
-    for i, task in enumerate(tasks, 1):
-        status = "✓" if task["completed"] else " "
-        lines.append(f"{i}. [{status}] {task['description']}")
-    return lines
+    if name == "add":
+        if add_task(tasks, argument):
+            return {"op": "add", "description": argument}, [], None
+        return None, [], "задача не может быть пустой"
+    if name == "done":
+        if complete_task(tasks, argument):
+            return {"op": "complete", "index": argument}, [], None
+        return None, [], "неверный номер задачи"
+    if name == "rm":
+        if delete_task(tasks, argument):
+            return {"op": "delete", "index": argument}, [], None
+        return None, [], "неверный номер задачи"
+    if name == "list":
+        return None, list(iter_task_lines(tasks)), None
+    return None, [], f"неизвестная команда: {name}"
 
 
 # ============================================================
 # ФУНКЦИИ ФАЙЛОВОГО I/O (Используют чистые функции выше)
 # ============================================================
 
-def load_tasks_from_file(filename):
+def reserve_archived_ids(filename, tasks):
     """
-    Загружает задачи из JSON файла.
+    Не даёт новым задачам TaskList занять ID задач из архива.
+    
+    Вызывается после загрузки и до журнала: добавления из журнала
+    без ID тоже получают ID после архивных.
     
     Аргументы:
-        filename: Путь к JSON файлу
+        filename: Путь к JSON файлу задач
+        tasks: Загруженный TaskList
+    """
+    # task_archive сам импортирует этот модуль, поэтому импорт здесь
+    from task_archive import read_next_id
+    
+    tasks.reserve_ids(read_next_id(filename))
+
+
+def load_tasks_from_file(filename, cache_dir=None):
+    """
+    Загружает задачи из JSON файла и применяет журнал операций.
+    
+    Сначала читается снимок (filename), затем поверх него
+    проигрываются записи из журнала (filename + ".log"), если он есть.
+    
+    Аргументы:
+        filename: Путь к JSON файлу или к папке с шардами (task_shards.py)
+        cache_dir: Папка кэша разбора (см. task_parse_cache.py);
+            None - разбирать файл без кэша
         
     Возвращает:
         list: Список словарей задач, или пустой список при ошибке
+        
+    Исключения:
+        OSError, json.JSONDecodeError: Если шард из манифеста папки
+            пропал или повреждён
     """
+    finish_compaction(filename)
+    if is_shard_directory(filename):
+        # Пропавший или повреждённый шард - ошибка, а не пустой список:
+        # иначе следующее сохранение удалило бы все шарды
+        tasks = load_shards(filename)
+        replay_journal(filename, tasks)
+        return tasks
+    
     try:
-        file = open(filename, "r", encoding="utf-8")
-        tasks = json.load(file)
-        file.close()
+        if cache_dir is not None:
+            tasks = load_json_cached(filename, cache_dir)
+        else:
+            file = open(filename, "r", encoding="utf-8")
+            tasks = json.load(file)
+            file.close()
         
         # Проверяем, что это список
         if not isinstance(tasks, list):
             return []
         
+    except FileNotFoundError:
+        tasks = []
+    except json.JSONDecodeError:
+        return []
+    
+    replay_journal(filename, tasks)
+    return tasks
+
+
+def iter_tasks_from_file(filename, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Потоково читает задачи из JSON файла, по одной.
+    
+    Файл читается порциями по chunk_size символов, а каждый элемент
+    массива разбирается json.JSONDecoder.raw_decode, как только он
+    целиком попал в буфер. В памяти одновременно находится только
+    порция текста и текущая задача, а не весь файл.
+    
+    Невалидные элементы массива пропускаются.
+    
+    Аргументы:
+        filename: Путь к JSON файлу
+        chunk_size: Сколько символов читать за раз
+        
+    Возвращает:
+        generator: Словари задач по мере разбора файла
+        
+    Исключения:
+        FileNotFoundError: Файла нет
+        json.JSONDecodeError: Файл повреждён или это не массив
+    """
+    decoder = json.JSONDecoder()
+    
+    with open(filename, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        at_end = False
+        
+        def read_more():
+            """Дочитывает порцию, отбрасывая уже разобранный текст."""
+            nonlocal buffer, position, at_end
+            chunk = file.read(chunk_size)
+            if not chunk:
+                at_end = True
+            buffer = buffer[position:] + chunk
+            position = 0
+        
+        def next_char():
+            """Пропускает пробелы и возвращает следующий символ ('' в конце)."""
+            nonlocal position
+            while True:
+                position = WHITESPACE.match(buffer, position).end()
+                if position < len(buffer) or at_end:
+                    return buffer[position] if position < len(buffer) else ""
+                read_more()
+        
+        if next_char() != "[":
+            raise json.JSONDecodeError("Ожидался массив задач", buffer, position)
+        position += 1
+        
+        expect_item = True
+        while True:
+            char = next_char()
+            if char == "]":
+                return
+            if char == "":
+                raise json.JSONDecodeError("Файл задач оборвался", buffer, position)
+            if not expect_item:
+                if char != ",":
+                    raise json.JSONDecodeError("Ожидалась запятая", buffer, position)
+                position += 1
+                expect_item = True
+                continue
+            
+            try:
+                task, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if at_end:
+                    raise
+                read_more()
+                continue
+            
+            # Значение у самого края буфера могло оборваться (например, число)
+            if end == len(buffer) and not at_end:
+                read_more()
+                continue
+            
+            position = end
+            expect_item = False
+            if validate_task_dict(task):
+                yield task
+
+
+def load_tasks_streaming(filename, on_first_page=None, page_size=FIRST_PAGE_SIZE):
+    """
+    Загружает задачи потоково в TaskList и применяет журнал.
+    
+    Как только загружена первая страница, вызывается on_first_page,
+    так что пользователь видит начало списка, пока грузится остальное.
+    
+    Аргументы:
+        filename: Путь к JSON файлу
+        on_first_page: Функция, которой передаётся TaskList с первой страницей
+        page_size: Размер первой страницы
+        
+    Возвращает:
+        TaskList: Загруженные задачи, или пустой TaskList при ошибке
+    """
+    finish_compaction(filename)
+    tasks = TaskList()
+    try:
+        for task in iter_tasks_from_file(filename):
+            tasks.append(task)
+            if on_first_page is not None and len(tasks) == page_size:
+                on_first_page(tasks)
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        return TaskList()
+    
+    reserve_archived_ids(filename, tasks)
+    replay_journal(filename, tasks)
+    return tasks
+
+
+def load_tasks_cached(filename, cache_dir):
+    """
+    Загружает задачи в TaskList через кэш разбора и применяет журнал.
+    
+    Пока файл не менялся, разобранный список берётся из кэша
+    (task_parse_cache.py) без разбора JSON. Невалидные задачи
+    пропускаются, как в load_tasks_streaming.
+    
+    Аргументы:
+        filename: Путь к JSON файлу
+        cache_dir: Папка кэша разбора
+        
+    Возвращает:
+        TaskList: Загруженные задачи, или пустой TaskList при ошибке
+    """
+    try:
+        data = load_json_cached(filename, cache_dir)
+    except FileNotFoundError:
+        data = []
+    except json.JSONDecodeError:
+        return TaskList()
+    if not isinstance(data, list):
+        return TaskList()
+    
+    tasks = TaskList()
+    for task in data:
+        if validate_task_dict(task):
+            tasks.append(task)
+    reserve_archived_ids(filename, tasks)
+    replay_journal(filename, tasks)
+    return tasks
+
+
+def load_tasks_fast(filename, on_first_page=None, lazy=False, cache_dir=None):
+    """
+    Загружает задачи из бинарного снимка, если он актуален, иначе из JSON.
+    
+    Снимок (filename + ".bin") отображается в память, и описания
+    декодируются только при обращении, так что запуск не зависит
+    от размера списка. Устаревший или повреждённый снимок молча
+    пропускается, и задачи читаются из JSON как обычно.
+    
+    Аргументы:
+        filename: Путь к JSON файлу
+        on_first_page: Передаётся в load_tasks_streaming при загрузке из JSON
+        lazy: Читать из JSON только ID и флаги, а описания - по
+            требованию (см. task_offsets.py)
+        cache_dir: Папка кэша разбора для загрузки из JSON (None - без
+            кэша, файл читается потоково)
+        
+    Возвращает:
+        TaskList: Загруженные задачи (с применённым журналом)
+        
+    Исключения:
+        OSError, json.JSONDecodeError: Если шард из манифеста папки
+            пропал или повреждён
+    """
+    finish_compaction(filename)
+    try:
+        source_stat = os.stat(filename)
+    except OSError:
+        source_stat = None
+    
+    if is_shard_directory(filename):
+        # Изменения отслеживаются с момента чтения шардов, включая
+        # доигранный журнал: сохранение перепишет только их шарды
+        tasks = TaskList(load_shards(filename))
+        tasks.track_changes()
+        reserve_archived_ids(filename, tasks)
+        replay_journal(filename, tasks)
         return tasks
+    
+    if source_stat is not None:
+        tasks = load_snapshot(get_snapshot_filename(filename), source_stat)
+        if tasks is not None:
+            reserve_archived_ids(filename, tasks)
+            replay_journal(filename, tasks)
+            return tasks
+    
+    if lazy and hasattr(os, "pread"):
+        # task_offsets сам импортирует этот модуль, поэтому импорт здесь;
+        # функция берётся из модуля при вызове, чтобы её видели замеры
+        import task_offsets
         
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        return task_offsets.load_tasks_lazy(filename)
+    if cache_dir is not None:
+        return load_tasks_cached(filename, cache_dir)
+    return load_tasks_streaming(filename, on_first_page)
 
 
 def save_tasks_to_file(filename, tasks):
     """
     Сохраняет задачи в JSON файл.
     
+    Снимок сначала пишется во временный файл и затем атомарно
+    подменяет старый. После этого журнал больше не нужен и удаляется:
+    полное сохранение - это и есть компактификация.
+    
+    Когда новый снимок записан целиком, журнал переименовывается в
+    tasks.json.log.compacting, и только потом снимок подменяется.
+    Сбой между подменой и удалением журнала не приводит к повторному
+    проигрыванию уже учтённых записей: загрузка увидит метку и
+    доведёт сохранение до конца (finish_compaction).
+    
+    Если filename - папка с шардами, переписываются только шарды,
+    в которых что-то изменилось.
+    
+    Для TaskList рядом пишется и индекс смещений (tasks.json.idx):
+    ленивой загрузке (--lazy) не придётся заново разбирать файл.
+    
+    Аргументы:
+        filename: Путь к JSON файлу или к папке с шардами
+        tasks: Список словарей задач
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    # task_offsets сам импортирует этот модуль, поэтому импорт здесь
+    from task_offsets import OffsetIndexBuilder
+    
+    journal_filename = get_journal_filename(filename)
+    compacting_filename = journal_filename + COMPACTING_SUFFIX
+    
+    def mark_compacting():
+        # Новый снимок уже записан и содержит все записи журнала
+        if os.path.exists(journal_filename):
+            os.replace(journal_filename, compacting_filename)
+    
+    try:
+        if is_shard_directory(filename):
+            if save_shards(filename, tasks, before_commit=mark_compacting) < 0:
+                return False
+        else:
+            temp_filename = filename + ".tmp"
+            # У задач TaskList всегда есть ID, без которых индекс не построить
+            index = OffsetIndexBuilder() if isinstance(tasks, TaskList) else None
+            file = open(temp_filename, "w", encoding="utf-8")
+            write_tasks_json(file, tasks, index)
+            file.close()
+            source_stat = os.stat(temp_filename)
+            mark_compacting()
+            os.replace(temp_filename, filename)
+            if index is not None:
+                # Не записался - ленивая загрузка построит его сама
+                index.write(filename, source_stat)
+        
+        if os.path.exists(compacting_filename):
+            os.remove(compacting_filename)
+        return True
+    except Exception:
+        return False
+
+
+def get_pending_snapshot(filename):
+    """
+    Возвращает (временный файл, куда его подменить) для нового снимка.
+    
+    Аргументы:
+        filename: Путь к JSON файлу или к папке с шардами
+        
+    Возвращает:
+        tuple: (путь к временному файлу, путь к снимку или манифесту)
+    """
+    if os.path.isdir(filename):
+        manifest_filename = get_manifest_filename(filename)
+        return manifest_filename + ".tmp", manifest_filename
+    return filename + ".tmp", filename
+
+
+def finish_compaction(filename):
+    """
+    Доводит до конца сохранение, прерванное сбоем.
+    
+    Метка tasks.json.log.compacting появляется только после того, как
+    новый снимок целиком записан во временный файл. Если она есть,
+    временный снимок (если его ещё не подменили) подменяет старый, а
+    учтённый в нём журнал удаляется. Без метки ничего не делается:
+    недописанный временный файл просто перезапишется при следующем
+    сохранении.
+    
+    Аргументы:
+        filename: Путь к JSON файлу или к папке с шардами
+    """
+    compacting_filename = get_journal_filename(filename) + COMPACTING_SUFFIX
+    if not os.path.exists(compacting_filename):
+        return
+    temp_filename, target = get_pending_snapshot(filename)
+    try:
+        if os.path.exists(temp_filename):
+            os.replace(temp_filename, target)
+        os.remove(compacting_filename)
+    except OSError:
+        pass
+
+
+def write_tasks_json(file, tasks, index=None):
+    """
+    Пишет задачи в файл тем же JSON, что и json.dump(tasks, indent=2).
+    
+    Задачи сериализуются по одной, поэтому TaskList не превращается
+    целиком в список словарей: в памяти одновременно только одна задача.
+    
+    Аргументы:
+        file: Открытый текстовый файл
+        tasks: TaskList или список словарей задач
+        index: task_offsets.OffsetIndexBuilder, который отмечает, где
+            в файле описание каждой задачи (None - не отмечать)
+    """
+    rows = tasks.iter_dicts() if hasattr(tasks, "iter_dicts") else iter(tasks)
+    separator = "[\n  "
+    for row in rows:
+        file.write(separator)
+        text = json.dumps(row, indent=2, ensure_ascii=False, default=to_json_compatible)
+        # Переводы строк внутри строк JSON экранированы, так что "\n" здесь - только отступы
+        text = text.replace("\n", "\n  ")
+        file.write(text)
+        if index is not None:
+            index.skip(separator)
+            index.add(row, text)
+        separator = ",\n  "
+    file.write("[]" if separator == "[\n  " else "\n]")
+
+
+def to_json_compatible(value):
+    """
+    Помогает json.dump сохранить TaskList и его задачи.
+    
+    Передаётся в json.dump как default= и вызывается только для
+    объектов, которые json не умеет сериализовать сам.
+    
+    Аргументы:
+        value: Объект, который json не смог сериализовать
+        
+    Возвращает:
+        list or dict: Обычный список или словарь задачи
+    """
+    if hasattr(value, "to_dicts"):
+        return value.to_dicts()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Объект типа {type(value).__name__} не сериализуется в JSON")
+
+
+def save_session(filename, tasks):
+    """
+    Сохраняет задачи в конце сеанса работы.
+    
+    Журнал сворачивается в снимок, а рядом кладётся бинарный снимок
+    для быстрого следующего запуска. Заодно отмечается время для
+    задач, выполненных за сеанс (по нему работает архив).
+    
+    Для папки с шардами бинарный снимок не пишется: load_tasks_fast
+    читает шарды, а полный снимок переписывал бы все задачи при
+    каждом выходе.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Текущий список задач
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    # task_archive сам импортирует этот модуль, поэтому импорт здесь
+    from task_archive import update_done_times
+    
+    if not compact_journal(filename, tasks):
+        return False
+    update_done_times(filename, tasks)
+    if is_shard_directory(filename):
+        return True
+    return write_snapshot(get_snapshot_filename(filename), tasks, os.stat(filename))
+
+
+# ============================================================
+# ЖУРНАЛ ОПЕРАЦИЙ (Сохранение за O(1) на изменение)
+# ============================================================
+
+def get_journal_filename(filename):
+    """
+    Возвращает путь к журналу операций для файла задач.
+    
     Аргументы:
         filename: Путь к JSON файлу
+        
+    Возвращает:
+        str: Путь к журналу (например, "tasks.json.log")
+    """
+    return filename + JOURNAL_SUFFIX
+
+
+def apply_journal_record(tasks, record, search_index=None):
+    """
+    Применяет одну запись журнала к списку задач.
+    
+    Поддерживаемые записи:
+        {"op": "add", "description": "..."}
+        {"op": "add", "description": "...", "id": 7}
+        {"op": "complete", "index": 1}
+        {"op": "complete", "id": 7}
+        {"op": "delete", "index": 1}
+        {"op": "delete", "id": 7}
+    
+    Записи с "id" указывают на задачу по стабильному ID, а не по
+    номеру, поэтому их можно применить и к списку, который успел
+    измениться (например, другим процессом).
+    
+    Аргументы:
         tasks: Список словарей задач
+        record: Словарь записи журнала
+        search_index: Поисковый индекс, который нужно обновить (необязательно)
+        
+    Возвращает:
+        bool: True если запись применена, False если она невалидна
+    """
+    if not isinstance(record, dict):
+        return False
+    
+    op = record.get("op")
+    task_id = record.get("id")
+    if op == "add":
+        if task_id is None:
+            return add_task(tasks, record.get("description"), search_index)
+        if not isinstance(task_id, int) or not validate_task_description(record.get("description")):
+            return False
+        task = create_task_dict(record["description"])
+        task["id"] = task_id
+        tasks.append(task)
+        index_added_task(search_index, tasks[-1])
+        return True
+    if op == "complete":
+        if task_id is not None:
+            return complete_task_by_id(tasks, task_id)
+        return complete_task(tasks, record.get("index"))
+    if op == "delete":
+        if task_id is not None:
+            return delete_task_by_id(tasks, task_id, search_index)
+        return delete_task(tasks, record.get("index"), search_index)
+    return False
+
+
+def append_journal_record(filename, record):
+    """
+    Дописывает запись в конец журнала одной JSON строкой.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач (не к журналу)
+        record: Словарь записи журнала
         
     Возвращает:
         bool: True если успешно, False в противном случае
     """
+    return append_journal_records(filename, [record])
+
+
+def append_journal_records(filename, records):
+    """
+    Дописывает пачку записей в конец журнала одной операцией записи.
+    
+    Недописанная последняя строка (сбой во время прошлой записи)
+    сначала отрезается: иначе новая запись приклеилась бы к ней, и
+    проигрывание остановилось бы на этой строке, потеряв все новые.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач (не к журналу)
+        records: Список словарей записей журнала
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
     try:
-        file = open(filename, "w", encoding="utf-8")
-        json.dump(tasks, file, indent=2, ensure_ascii=False)
-        file.close()
+        with open(get_journal_filename(filename), "a+b") as file:
+            drop_torn_tail(file)
+            file.write(lines.encode("utf-8"))
         return True
     except Exception:
         return False
 
 
+def drop_torn_tail(file):
+    """
+    Отрезает от журнала последнюю строку без перевода строки.
+    
+    Аргументы:
+        file: Журнал, открытый в режиме "a+b"
+    """
+    end = file.seek(0, os.SEEK_END)
+    if end == 0:
+        return
+    file.seek(end - 1)
+    if file.read(1) == b"\n":
+        return
+    # Конец последней целой строки ищется блоками с конца файла
+    position = end
+    while position > 0:
+        start = max(0, position - STREAM_CHUNK_SIZE)
+        file.seek(start)
+        newline = file.read(position - start).rfind(b"\n")
+        if newline != -1:
+            file.truncate(start + newline + 1)
+            return
+        position = start
+    file.truncate(0)
+
+
+def replay_journal(filename, tasks, offset=0, search_index=None):
+    """
+    Проигрывает журнал операций поверх загруженного снимка.
+    
+    Недописанная последняя строка (сбой во время записи) не ломает
+    загрузку: проигрывание просто останавливается на ней, а следующая
+    запись в журнал её отрежет (append_journal_records).
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач (не к журналу)
+        tasks: Список словарей задач, изменяется на месте
+        offset: С какого байта журнала начать (начало строки); позволяет
+            доиграть только записи, дописанные после прошлого чтения
+        search_index: Поисковый индекс, который нужно обновить (необязательно)
+        
+    Возвращает:
+        int: Количество применённых записей
+    """
+    applied = 0
+    try:
+        with open(get_journal_filename(filename), "rb") as file:
+            file.seek(offset)
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if apply_journal_record(tasks, record, search_index):
+                    applied += 1
+    except FileNotFoundError:
+        pass
+    return applied
+
+
+def compact_journal(filename, tasks):
+    """
+    Сворачивает журнал обратно в снимок.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Текущий список словарей задач
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    return save_tasks_to_file(filename, tasks)
+
+
+@contextmanager
+def deferred_save(filename, tasks):
+    """
+    Откладывает сохранение до конца пакета изменений.
+    
+    Внутри блока with задачи меняются только в памяти, а при обычном
+    выходе из блока список сохраняется один раз. Если блок прервался
+    исключением, ничего не сохраняется: файл остаётся прежним, а не
+    получает пакет, применённый наполовину.
+    
+    Пример:
+        with deferred_save("tasks.json", tasks):
+            add_tasks(tasks, descriptions)
+            delete_tasks(tasks, [1, 5, 7])
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Список словарей задач
+        
+    Исключения:
+        OSError: Если сохранить список не удалось (изменения остаются
+            только в памяти)
+    """
+    yield tasks
+    if not save_tasks_to_file(filename, tasks):
+        raise OSError(f"Не удалось сохранить задачи в {filename}")
+
+
+def record_task_change(filename, tasks, record):
+    """
+    Сохраняет одно изменение: дописывает запись в журнал и, когда
+    журнал перерастает JOURNAL_COMPACT_BYTES и размер снимка,
+    компактифицирует его.
+    
+    Стоимость обычного сохранения - O(1), а не O(n) как у полной
+    перезаписи файла. Если журнал недоступен, делается полное сохранение.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Текущий список словарей задач (запись уже применена)
+        record: Словарь записи журнала
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    return record_task_changes(filename, tasks, [record])
+
+
+def record_task_changes(filename, tasks, records):
+    """
+    Сохраняет пачку изменений одной записью в журнал.
+    
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        tasks: Текущий список словарей задач (записи уже применены)
+        records: Список словарей записей журнала
+        
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    if not append_journal_records(filename, records):
+        return save_tasks_to_file(filename, tasks)
+    
+    try:
+        journal_size = os.path.getsize(get_journal_filename(filename))
+        snapshot_size = os.path.getsize(filename) if os.path.exists(filename) else 0
+    except OSError:
+        return True
+    
+    if journal_size > max(JOURNAL_COMPACT_BYTES, snapshot_size):
+        # Изменения уже в журнале: неудачное сворачивание их не теряет,
+        # журнал просто свернётся в следующий раз
+        compact_journal(filename, tasks)
+    return True
+
+
 # ============================================================
 # ФУНКЦИИ КОНСОЛЬНОГО I/O (Тонкие обёртки)
 # ============================================================
 
-def display_tasks(tasks):
-    """Отображает все задачи в консоли."""
-    print("\nВаши задачи:")
-    for line in format_task_list(tasks):
-        print(f"  {line}")
+def display_tasks(tasks, page_size=None):
+    """
+    Отображает задачи в консоли.
+    
+    Если список не помещается на одну страницу размера page_size,
+    включается постраничный просмотр: выводятся только видимые строки,
+    и каждая страница пишется одним вызовом sys.stdout.write.
+    
+    Аргументы:
+        tasks: Список словарей задач
+        page_size: Задач на странице (None - показать все сразу)
+    """
+    if page_size is None or len(tasks) <= page_size:
+        lines = ["\nВаши задачи:"]
+        for line in format_task_list(tasks):
+            lines.append(f"  {line}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        return
+    
+    page_count = count_pages(tasks, page_size)
+    page = 1
+    while page is not None:
+        sys.stdout.write(format_task_page(tasks, page, page_size))
+        command = input("[n] след., [p] пред., номер страницы, Enter - готово: ")
+        page = parse_page_command(command, page, page_count)
+
+
+def display_first_page(tasks):
+    """Показывает первую страницу задач, пока загружается остальное."""
+    display_tasks(tasks)
+    print("  ...загружаем остальные задачи")
+
+
+def display_search_results(found):
+    """
+    Отображает найденные задачи с их номерами в общем списке.
+    
+    Аргументы:
+        found: Пары (номер, задача) из search_tasks
+    """
+    if not found:
+        print("\nНичего не найдено.")
+        return
+    
+    lines = [f"\nНайдено задач: {len(found)}"]
+    for number, task in found[:PAGE_SIZE]:
+        lines.append(f"  {format_task_line(number, task)}")
+    if len(found) > PAGE_SIZE:
+        lines.append(f"  ...и ещё {len(found) - PAGE_SIZE}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def get_task_input():
@@ -224,16 +1344,61 @@ def get_task_number(prompt):
 # ОСНОВНАЯ ПРОГРАММА (Слой I/O)
 # ============================================================
 
-def main():
-    """Основная программа - оркестрация I/O."""
-    TASKS_FILE = "tasks.json"
+def main(tasks_file="tasks.json", sqlite_file=None, cache_dir=None, lazy=False,
+         records_file=None):
+    """
+    Основная программа - оркестрация I/O.
+    
+    Аргументы:
+        tasks_file: Путь к JSON файлу задач
+        sqlite_file: Путь к базе SQLite; если указан, задачи хранятся
+            в ней (task_store_sqlite.py), а tasks_file только
+            переносится в базу при первом запуске
+        cache_dir: Папка кэша разбора (по умолчанию get_cache_dir())
+        lazy: Читать описания из tasks.json по требованию (task_offsets.py)
+        records_file: Путь к файлу записей (task_records.py); если указан,
+            задачи хранятся в нём, а tasks_file только переносится в него
+            при первом запуске
+    """
+    # task_sync, task_store_sqlite и task_records сами импортируют этот модуль,
+    # поэтому импорт здесь
+    from task_records import RecordTaskStore, migrate_json_to_records
+    from task_store_sqlite import SqliteTaskStore, migrate_json_to_sqlite
+    from task_sync import SharedTaskFile
     
     print("=" * 40)
     print("МЕНЕДЖЕР ЗАДАЧ")
     print("=" * 40)
     
-    tasks = load_tasks_from_file(TASKS_FILE)
-    print(f"\nЗагружено {len(tasks)} задач(и).")
+    # Компактное хранение: флаги в bytearray вместо словаря на задачу.
+    # Сначала пробуем бинарный снимок, иначе файл разбирается потоково
+    # и первая страница видна сразу. Файл может быть открыт и в других
+    # терминалах: их изменения подтягиваются перед каждым действием.
+    if sqlite_file is not None:
+        # Изменение одной задачи - одна строка базы, без перезаписи файла
+        migrated = migrate_json_to_sqlite(tasks_file, sqlite_file)
+        if migrated:
+            print(f"\nПеренесено в {sqlite_file}: {migrated} задач(и) из {tasks_file}.")
+        shared = SqliteTaskStore(sqlite_file)
+    elif records_file is not None:
+        # Выполнение и удаление задачи - один байт на месте, без перезаписи файла
+        try:
+            migrated = migrate_json_to_records(tasks_file, records_file)
+            shared = RecordTaskStore(records_file)
+        except (OSError, ValueError) as error:
+            print(f"\nОшибка: задачи не загружены ({error}). Файлы не изменены.")
+            return
+        if migrated:
+            print(f"\nПеренесено в {records_file}: {migrated} задач(и) из {tasks_file}.")
+    else:
+        try:
+            shared = SharedTaskFile(tasks_file, on_first_page=display_first_page,
+                                    cache_dir=cache_dir or get_cache_dir(), lazy=lazy)
+        except (OSError, ValueError) as error:
+            # Например, пропал шард: с пустым списком выход удалил бы остальные
+            print(f"\nОшибка: задачи не загружены ({error}). Файлы не изменены.")
+            return
+    print(f"\nЗагружено {len(shared.tasks)} задач(и).")
     
     running = True
     while running:
@@ -242,51 +1407,213 @@ def main():
         print("2. Добавить задачу")
         print("3. Выполнить задачу")
         print("4. Удалить задачу")
-        print("5. Выйти")
+        print("5. Найти задачу")
+        print("6. Выйти")
         print("=" * 40)
         
         choice = input("\nВыберите опцию: ").strip()
         
         if choice == "1":
-            display_tasks(tasks)
+            shared.refresh()
+            display_tasks(shared.tasks, page_size=PAGE_SIZE)
             
         elif choice == "2":
             description = get_task_input()
-            if add_task(tasks, description):
-                save_tasks_to_file(TASKS_FILE, tasks)
-                print("✓ Задача добавлена!")
-            else:
-                print("✗ Задача не может быть пустой.")
+            try:
+                if shared.commit({"op": "add", "description": description}):
+                    print("✓ Задача добавлена!")
+                else:
+                    print("✗ Задача не может быть пустой.")
+            except OSError as error:
+                print(f"✗ Задача не сохранена: {error}")
                 
         elif choice == "3":
-            display_tasks(tasks)
-            if len(tasks) > 0:
+            shared.refresh()
+            display_tasks(shared.tasks, page_size=PAGE_SIZE)
+            if len(shared.tasks) > 0:
                 number = get_task_number("\nНомер задачи для выполнения: ")
-                if number and complete_task(tasks, number):
-                    save_tasks_to_file(TASKS_FILE, tasks)
-                    print("✓ Задача выполнена!")
-                else:
-                    print("✗ Неверный номер задачи.")
+                # Номер переводится в ID задачи, которую видел пользователь:
+                # пока он вводил номер, другой процесс мог сдвинуть список
+                task = get_task_by_index(shared.tasks, number) if number else None
+                try:
+                    if task is not None and shared.commit({"op": "complete", "id": task["id"]}):
+                        print("✓ Задача выполнена!")
+                    else:
+                        print("✗ Неверный номер задачи.")
+                except OSError as error:
+                    print(f"✗ Изменение не сохранено: {error}")
                     
         elif choice == "4":
-            display_tasks(tasks)
-            if len(tasks) > 0:
+            shared.refresh()
+            display_tasks(shared.tasks, page_size=PAGE_SIZE)
+            if len(shared.tasks) > 0:
                 number = get_task_number("\nНомер задачи для удаления: ")
-                if number and delete_task(tasks, number):
-                    save_tasks_to_file(TASKS_FILE, tasks)
-                    print("✓ Задача удалена!")
-                else:
-                    print("✗ Неверный номер задачи.")
+                task = get_task_by_index(shared.tasks, number) if number else None
+                try:
+                    if task is not None and shared.commit({"op": "delete", "id": task["id"]}):
+                        print("✓ Задача удалена!")
+                    else:
+                        print("✗ Неверный номер задачи.")
+                except OSError as error:
+                    print(f"✗ Изменение не сохранено: {error}")
                     
         elif choice == "5":
+            query = input("\nНайти (слова через пробел, мол* - по началу слова): ")
+            shared.refresh()
+            display_search_results(search_tasks(shared.tasks, shared.get_search_index(), query))
+            
+        elif choice == "6":
             print("\nДо свидания!")
             running = False
             
         else:
             print("\nНеверный выбор.")
     
-    save_tasks_to_file(TASKS_FILE, tasks)
+    shared.close()
+
+
+# ============================================================
+# ПАКЕТНЫЙ РЕЖИМ (Без меню, для скриптов)
+# ============================================================
+
+def run_batch(lines, tasks, filename, save_every=None, out=None, errors=None):
+    """
+    Выполняет поток команд без меню и сохраняет задачи пачками.
+    
+    Изменения копятся в памяти; каждые save_every изменений они
+    одной операцией дописываются в журнал, а в конце сеанса журнал
+    сворачивается в снимок.
+    
+    Аргументы:
+        lines: Итерируемый набор строк команд (файл, sys.stdin, список)
+        tasks: Список задач
+        filename: Путь к JSON файлу задач
+        save_every: Сохранять каждые N изменений (None - только в конце)
+        out: Куда писать вывод команды list (по умолчанию sys.stdout)
+        errors: Куда писать ошибки (по умолчанию sys.stderr)
+        
+    Возвращает:
+        int: Количество строк с ошибками
+        
+    Исключения:
+        OSError: Если сохранить задачи в конце не удалось
+    """
+    out = sys.stdout if out is None else out
+    errors = sys.stderr if errors is None else errors
+    failed = 0
+    pending = []
+    for line_number, line in enumerate(lines, 1):
+        record, output, error = execute_command(tasks, line)
+        if output:
+            out.write("\n".join(output) + "\n")
+        if error is not None:
+            failed += 1
+            errors.write(f"строка {line_number}: {error}\n")
+        if record is not None:
+            pending.append(record)
+            if save_every is not None and len(pending) >= save_every:
+                # Если пачка не записалась, она всё равно есть в tasks
+                # и попадёт в снимок при сохранении в конце
+                record_task_changes(filename, tasks, pending)
+                pending = []
+    
+    # Всё несохранённое попадает в снимок при сворачивании журнала
+    if not save_session(filename, tasks):
+        raise OSError(f"Не удалось сохранить задачи в {filename}")
+    return failed
+
+
+def build_parser():
+    """
+    Создаёт разбор аргументов командной строки.
+    
+    Без --batch запускается меню, с --batch - пакетный режим.
+    
+    Возвращает:
+        argparse.ArgumentParser: Разбор аргументов
+    """
+    parser = argparse.ArgumentParser(description="Менеджер задач")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="ФАЙЛ",
+                        help="пакетный режим: файл с командами (по умолчанию stdin)")
+    parser.add_argument("--tasks", default="tasks.json", help="файл задач")
+    parser.add_argument("--save-every", type=int, metavar="N",
+                        help="сохранять каждые N изменений (пакетный режим)")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--sqlite", metavar="БАЗА",
+                         help="хранить задачи в базе SQLite (только меню)")
+    storage.add_argument("--records", metavar="ФАЙЛ",
+                         help="хранить задачи в файле записей фиксированного "
+                              "размера (только меню, один процесс)")
+    parser.add_argument("--cache-dir", metavar="ПАПКА",
+                        help="папка кэша разбора tasks.json (по умолчанию "
+                             "$TASK_CACHE_DIR или ~/.cache/task_manager)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="читать описания задач с диска по требованию "
+                             "(индекс tasks.json.idx, см. task_offsets.py)")
+    return parser
+
+
+def main_batch(args):
+    """
+    Точка входа пакетного режима.
+    
+    Примеры:
+        python task_manager_testable.py --batch commands.txt
+        python task_manager_testable.py --batch=commands.txt
+        cat commands.txt | python task_manager_testable.py --batch
+        python task_manager_testable.py --batch audit.txt --save-every 1000
+    
+    Аргументы:
+        args: Разобранные аргументы (build_parser().parse_args())
+        
+    Возвращает:
+        int: Код выхода (0 - без ошибок, 1 - были ошибки в командах,
+        файл команд не открылся или задачи не сохранились)
+    """
+    from task_sync import bump_version, task_file_lock
+    
+    # Файл команд открывается до загрузки: без него задачи не трогаются
+    if args.batch == "-":
+        commands = sys.stdin
+    else:
+        try:
+            commands = open(args.batch, "r", encoding="utf-8")
+        except OSError as error:
+            print(f"Ошибка: не удалось открыть файл команд {args.batch}: {error.strerror}",
+                  file=sys.stderr)
+            return 1
+    
+    try:
+        # Команды ссылаются на задачи по номерам, поэтому файл заблокирован
+        # на весь прогон; открытые менеджеры задач увидят новую версию
+        with task_file_lock(args.tasks):
+            tasks = load_tasks_fast(args.tasks, lazy=args.lazy,
+                                    cache_dir=args.cache_dir or get_cache_dir())
+            try:
+                failed = run_batch(commands, tasks, args.tasks, args.save_every)
+            finally:
+                # Пачки из --save-every могли попасть в журнал, даже если
+                # сохранение в конце не удалось
+                bump_version(args.tasks)
+    except OSError as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if commands is not sys.stdin:
+            commands.close()
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    # Замеры (--metrics или TASK_MANAGER_METRICS) подменяют функции
+    # этого модуля обёртками; без них код работает как обычно
+    from task_metrics import enable_metrics
+    
+    _, argv = enable_metrics(globals(), sys.argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch is not None:
+        if args.sqlite is not None or args.records is not None:
+            parser.error("пакетный режим работает только с JSON файлом задач")
+        sys.exit(main_batch(args))
+    main(args.tasks, args.sqlite, args.cache_dir, args.lazy, args.records)
@@ -0,0 +1,366 @@
+"""
+Замеры времени и объёма I/O менеджера задач
+
+Когда менеджер задач тормозит, непонятно, на что уходит время:
+на разбор JSON, на запись на диск или на вывод списка. Этот модуль
+подменяет функции менеджера обёртками, которые считают вызовы,
+время (p50/p95/p99) и прочитанные/записанные байты, и при выходе
+сохраняет статистику в JSON.
+
+Включение (по умолчанию выключено):
+    TASK_MANAGER_METRICS=metrics.json python task_manager_testable.py
+    python task_manager_testable.py --metrics                  # в task_metrics.json
+    python task_manager_testable.py --metrics=m.json --batch commands.txt
+
+Выключенные замеры ничего не стоят: функции не подменяются,
+и код вызывает оригиналы напрямую.
+"""
+
+import atexit
+import functools
+import importlib
+import json
+import math
+import os
+import time
+
+
+TASK_MANAGER_MODULE = "task_manager_testable"
+METRICS_ENV = "TASK_MANAGER_METRICS"
+METRICS_FLAG = "--metrics"
+DEFAULT_METRICS_FILE = "task_metrics.json"
+
+# Границы корзин гистограммы растут в 1.05 раза начиная с 1 мкс,
+# поэтому процентили точны до 5% при любом числе замеров,
+# а память гистограммы ограничена сотнями корзин.
+HISTOGRAM_MIN_SECONDS = 1e-6
+HISTOGRAM_GROWTH = 1.05
+
+# Загрузка, сохранение и вывод
+IO_FUNCTIONS = (
+    "load_tasks_from_file",
+    "load_tasks_streaming",
+    "load_tasks_cached",
+    "load_tasks_fast",
+    "load_snapshot",
+    "replay_journal",
+    "save_tasks_to_file",
+    "save_session",
+    "write_snapshot",
+    "append_journal_records",
+    "record_task_changes",
+    # Замеряется вывод, а не display_tasks: та ещё и ждёт ввода
+    # пользователя между страницами
+    "format_task_list",
+    "format_task_page",
+)
+
+# Действия меню (по ID) и команды пакетного режима (по номеру)
+ACTION_FUNCTIONS = (
+    "add_task",
+    "complete_task",
+    "complete_task_by_id",
+    "delete_task",
+    "delete_task_by_id",
+    "search_tasks",
+)
+
+# Функции других модулей, которые менеджер задач вызывает через модуль
+# (например, task_offsets.load_tasks_lazy), подменяются там же
+MODULE_FUNCTIONS = {
+    "task_offsets": ("load_tasks_lazy",),
+}
+
+
+def file_size(path):
+    """Размер файла в байтах (0, если файла нет)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def task_file_size(filename, *args, **kwargs):
+    """Сколько байт в файле задач: JSON файл или все шарды в папке."""
+    if not os.path.isdir(filename):
+        return file_size(filename)
+    return sum(file_size(os.path.join(filename, name)) for name in os.listdir(filename))
+
+
+def snapshot_size(filename, *args, **kwargs):
+    """Сколько байт в бинарном снимке."""
+    return file_size(filename)
+
+
+def journal_tail_size(filename, tasks=None, offset=0, **kwargs):
+    """Сколько байт журнала проигрывается начиная с offset."""
+    return max(0, file_size(filename + ".log") - offset)
+
+
+def offset_index_size(filename, *args, **kwargs):
+    """Сколько байт в индексе смещений ленивой загрузки (tasks.json.idx)."""
+    return file_size(filename + ".idx")
+
+
+# Сколько байт прочитано функцией: считается по файлам после вызова
+# (загрузка их не меняет, а ленивая может построить индекс). Каждый
+# файл учитывает та функция, которая его читает, поэтому вложенные
+# загрузки (load_tasks_fast -> load_snapshot -> replay_journal) не
+# считают одни и те же байты дважды.
+BYTES_READ = {
+    "load_tasks_from_file": task_file_size,
+    "load_tasks_streaming": task_file_size,
+    # При попадании в кэш читается marshal примерно того же размера
+    "load_tasks_cached": task_file_size,
+    "load_tasks_lazy": offset_index_size,
+    "load_snapshot": snapshot_size,
+    "replay_journal": journal_tail_size,
+}
+
+# Сколько байт записано функцией: считается по файлам после вызова
+BYTES_WRITTEN = {
+    "save_tasks_to_file": task_file_size,
+    "write_snapshot": snapshot_size,
+}
+
+
+class LatencyHistogram:
+    """
+    Гистограмма времени выполнения с логарифмическими корзинами.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """
+        Добавляет один замер.
+
+        Аргументы:
+            seconds: Время выполнения в секундах
+        """
+        if seconds <= HISTOGRAM_MIN_SECONDS:
+            bucket = 0
+        else:
+            bucket = math.ceil(math.log(seconds / HISTOGRAM_MIN_SECONDS, HISTOGRAM_GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent):
+        """
+        Возвращает процентиль времени.
+
+        Аргументы:
+            percent: Процент замеров (например, 95)
+
+        Возвращает:
+            float: Верхняя граница корзины, в которую попадает процентиль
+            (0.0, если замеров нет)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(HISTOGRAM_MIN_SECONDS * HISTOGRAM_GROWTH ** bucket, self.max)
+        return self.max
+
+    def summary(self):
+        """Словарь со статистикой в миллисекундах."""
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Metrics:
+    """
+    Счётчики, гистограммы времени и объём I/O по функциям.
+    """
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def record(self, name, seconds):
+        """
+        Записывает один вызов функции.
+
+        Аргументы:
+            name: Имя функции
+            seconds: Время выполнения в секундах
+        """
+        histogram = self.latencies.get(name)
+        if histogram is None:
+            histogram = self.latencies[name] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def record_error(self, name):
+        """Считает вызов, завершившийся исключением."""
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self):
+        """
+        Собирает статистику в словарь для JSON.
+
+        Возвращает:
+            dict: calls (по функциям), errors, bytes_read, bytes_written
+        """
+        return {
+            "calls": {
+                name: histogram.summary()
+                for name, histogram in sorted(self.latencies.items())
+            },
+            "errors": dict(sorted(self.errors.items())),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+    def dump(self, filename):
+        """
+        Сохраняет статистику в JSON файл.
+
+        Аргументы:
+            filename: Путь к файлу
+
+        Возвращает:
+            bool: True если успешно, False в противном случае
+        """
+        try:
+            with open(filename, "w", encoding="utf-8") as file:
+                json.dump(self.summary(), file, indent=2, ensure_ascii=False)
+            return True
+        except OSError:
+            return False
+
+
+def timed(function, name, metrics):
+    """
+    Оборачивает функцию замером времени и объёма I/O.
+
+    Аргументы:
+        function: Исходная функция
+        name: Под каким именем учитывать вызовы
+        metrics: Metrics, куда писать замеры
+
+    Возвращает:
+        function: Обёртка с той же сигнатурой
+    """
+    read_size = BYTES_READ.get(name)
+    written_size = BYTES_WRITTEN.get(name)
+    journal = name == "append_journal_records"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if journal:
+            journal_before = file_size(args[0] + ".log")
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            metrics.record_error(name)
+            raise
+        finally:
+            metrics.record(name, time.perf_counter() - start)
+        # Устаревший снимок (None) не читается дальше заголовка
+        if read_size is not None and result is not None:
+            metrics.bytes_read += read_size(*args, **kwargs)
+        if written_size is not None and result:
+            metrics.bytes_written += written_size(args[0])
+        if journal and result:
+            metrics.bytes_written += file_size(args[0] + ".log") - journal_before
+        return result
+
+    return wrapper
+
+
+def instrument(namespace, metrics, names=IO_FUNCTIONS + ACTION_FUNCTIONS):
+    """
+    Подменяет функции в пространстве имён модуля обёртками с замерами.
+
+    Функции модуля вызывают друг друга через его глобальные имена,
+    поэтому замеряются и вложенные вызовы (например, сохранение
+    при компактификации журнала).
+
+    Аргументы:
+        namespace: Словарь глобальных имён модуля (globals() или vars(module))
+        metrics: Metrics, куда писать замеры
+        names: Какие функции подменить (отсутствующие пропускаются)
+    """
+    for name in names:
+        if name in namespace:
+            namespace[name] = timed(namespace[name], name, metrics)
+
+
+def split_metrics_option(argv, environ=None):
+    """
+    Находит в аргументах флаг --metrics[=ФАЙЛ] или переменную окружения.
+
+    Аргументы:
+        argv: Аргументы командной строки (без имени программы)
+        environ: Переменные окружения (по умолчанию os.environ)
+
+    Возвращает:
+        tuple: (файл для статистики или None, аргументы без флага)
+    """
+    environ = os.environ if environ is None else environ
+    target = environ.get(METRICS_ENV) or None
+    if target == "1":
+        target = DEFAULT_METRICS_FILE
+
+    rest = []
+    for argument in argv:
+        if argument == METRICS_FLAG:
+            target = DEFAULT_METRICS_FILE
+        elif argument.startswith(METRICS_FLAG + "="):
+            target = argument.split("=", 1)[1] or DEFAULT_METRICS_FILE
+        else:
+            rest.append(argument)
+    return target, rest
+
+
+def enable_metrics(namespace, argv, environ=None):
+    """
+    Включает замеры, если они запрошены флагом или переменной окружения.
+
+    Функции подменяются в namespace и в импортируемом модуле
+    task_manager_testable (если namespace - это __main__, это разные
+    копии модуля). Статистика сохраняется в файл при выходе из программы.
+
+    Аргументы:
+        namespace: Словарь глобальных имён модуля менеджера задач
+        argv: Аргументы командной строки (без имени программы)
+        environ: Переменные окружения (по умолчанию os.environ)
+
+    Возвращает:
+        tuple: (Metrics или None, если замеры выключены; аргументы без флага)
+    """
+    target, rest = split_metrics_option(argv, environ)
+    if target is None:
+        return None, rest
+    metrics = Metrics()
+    instrument(namespace, metrics)
+    # Запущенный как скрипт менеджер задач - это модуль __main__, а
+    # task_sync и другие модули импортируют task_manager_testable заново.
+    # У этой второй копии свои функции: их подменяем тоже, до того как
+    # task_sync импортирует их к себе
+    module = importlib.import_module(TASK_MANAGER_MODULE)
+    if vars(module) is not namespace:
+        instrument(vars(module), metrics)
+    for module_name, names in MODULE_FUNCTIONS.items():
+        instrument(vars(importlib.import_module(module_name)), metrics, names)
+    atexit.register(metrics.dump, target)
+    return metrics, rest
@@ -0,0 +1,538 @@
+"""
+Ленивая загрузка описаний по индексу смещений
+
+Для большинства действий меню нужны только число задач, их флаги
+или одна задача, а load_tasks_from_file всё равно создаёт строку
+для каждого описания. Ленивый режим хранит рядом с tasks.json
+индекс (tasks.json.idx): для каждой задачи ID, смещение и длину её
+описания в байтах JSON файла и флаг completed. Описание читается
+из tasks.json через os.pread, только когда задача нужна, и
+попадает в ограниченный LRU кэш.
+
+Время загрузки и память тогда зависят от числа задач (около
+21 байта на задачу), но не от длины описаний.
+
+Формат индекса (little-endian):
+    заголовок    magic "TIDX", версия, число задач, следующий ID,
+                 размер и mtime_ns tasks.json, по которому он построен
+    ID задач     count * int64
+    смещения     count * uint64 - начало строки описания (с кавычкой)
+    длины        count * uint32 - длина строки описания в байтах
+    флаги        completed, по биту на задачу
+
+save_tasks_to_file пишет индекс вместе с tasks.json, отмечая
+смещения по ходу записи (OffsetIndexBuilder), так что после обычного
+сохранения файл заново не разбирается. Индекс строится заново, если
+tasks.json изменился в обход сохранения. Пока список
+открыт, описания читаются из того же файла, даже если сохранение
+подменило tasks.json новым: открытый файл остаётся прежним.
+
+Сравнение с обычной загрузкой:
+    python task_offsets.py bench 100000
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict
+from json.decoder import scanstring
+
+from task_list import TaskList, DONE, OPEN
+from task_snapshot import HEADER, pack_states, unpack_states
+
+
+INDEX_SUFFIX = ".idx"
+MAGIC = b"TIDX"
+VERSION = 1
+DESCRIPTION_CACHE_SIZE = 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Ключ описания целиком: внутри строки JSON кавычка всегда экранирована,
+# поэтому такая подстрока - это отдельная строка (ключ или значение)
+DESCRIPTION_KEY = '"description"'
+
+
+def get_index_filename(filename):
+    """
+    Возвращает путь к индексу смещений для файла задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+
+    Возвращает:
+        str: Путь к индексу (например, "tasks.json.idx")
+    """
+    return filename + INDEX_SUFFIX
+
+
+class LazyDescriptions:
+    """
+    Описания задач, которые читаются из JSON файла по требованию.
+
+    Подставляется в TaskList вместо обычного списка строк.
+    Прочитанные описания хранятся в LRU кэше на cache_size строк,
+    изменённые - поверх файла, новые - в хвосте.
+    """
+
+    def __init__(self, file, offsets, lengths, cache_size=DESCRIPTION_CACHE_SIZE):
+        """
+        Аргументы:
+            file: Открытый в режиме "rb" JSON файл задач
+            offsets: array("Q") смещений строк описаний
+            lengths: array("I") длин строк описаний
+            cache_size: Сколько прочитанных описаний держать в памяти
+        """
+        self.file = file
+        self.offsets = offsets
+        self.lengths = lengths
+        self.count = len(offsets)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.changed = {}
+        self.tail = []
+        self.reads = 0
+
+    def __len__(self):
+        return self.count + len(self.tail)
+
+    def __getitem__(self, slot):
+        if slot >= self.count:
+            return self.tail[slot - self.count]
+        if slot in self.changed:
+            return self.changed[slot]
+
+        cache = self.cache
+        if slot in cache:
+            cache.move_to_end(slot)
+            return cache[slot]
+
+        raw = os.pread(self.file.fileno(), self.lengths[slot], self.offsets[slot])
+        self.reads += 1
+        description = json.loads(raw)
+        cache[slot] = description
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return description
+
+    def __setitem__(self, slot, description):
+        if slot >= self.count:
+            self.tail[slot - self.count] = description
+        else:
+            self.changed[slot] = description
+            self.cache.pop(slot, None)
+
+    def __iter__(self):
+        for slot in range(len(self)):
+            yield self[slot]
+
+    def append(self, description):
+        self.tail.append(description)
+
+    def select(self, slots):
+        """
+        Оставляет только данные ячейки, не читая описаний из файла.
+
+        Вызывается TaskList.compact(), чтобы сжатие не загружало
+        все описания в память.
+
+        Аргументы:
+            slots: Возрастающий список ячеек, которые остаются
+
+        Возвращает:
+            LazyDescriptions: Новые описания для ячеек slots
+        """
+        selected = LazyDescriptions(self.file, array("Q"), array("I"), self.cache_size)
+        for slot in slots:
+            if slot < self.count:
+                if slot in self.changed:
+                    selected.changed[len(selected.offsets)] = self.changed[slot]
+                selected.offsets.append(self.offsets[slot])
+                selected.lengths.append(self.lengths[slot])
+            else:
+                selected.tail.append(self.tail[slot - self.count])
+        selected.count = len(selected.offsets)
+        return selected
+
+
+# ============================================================
+# ПОСТРОЕНИЕ И ЧТЕНИЕ ИНДЕКСА
+# ============================================================
+
+def find_description(text, start, end, description):
+    """
+    Находит строку описания внутри объекта задачи.
+
+    Ключ "description" может встретиться и во вложенном объекте, и как
+    значение другого поля, поэтому подходит только место, где после
+    ключа стоит строка с тем же описанием, что разобрал raw_decode.
+
+    Аргументы:
+        text: Текст tasks.json
+        start: Начало объекта задачи
+        end: Конец объекта задачи
+        description: Разобранное описание задачи
+
+    Возвращает:
+        tuple or None: (начало, конец) строки описания с кавычками
+    """
+    position = text.find(DESCRIPTION_KEY, start, end)
+    while position != -1:
+        value = WHITESPACE.match(text, position + len(DESCRIPTION_KEY)).end()
+        if text.startswith(":", value):
+            value = WHITESPACE.match(text, value + 1).end()
+            if text.startswith('"', value):
+                found, value_end = scanstring(text, value + 1)
+                if found == description:
+                    return value, value_end
+        position = text.find(DESCRIPTION_KEY, position + 1, end)
+    return None
+
+
+def scan_tasks(data):
+    """
+    Находит в JSON файле задач ID, описания и флаги.
+
+    Элементы массива разбираются json.JSONDecoder.raw_decode, как в
+    iter_tasks_from_file, и запоминается, где каждый кончается; время
+    линейно при любом содержимом файла. Невалидные задачи пропускаются,
+    а повторный или отсутствующий ID заменяется следующим свободным,
+    как при обычной загрузке в TaskList.
+
+    Аргументы:
+        data: Содержимое tasks.json (bytes)
+
+    Возвращает:
+        tuple: (ids, offsets, lengths, states, next_id)
+
+    Исключения:
+        ValueError: Файл не UTF-8, повреждён или это не массив
+            (json.JSONDecodeError - подкласс ValueError)
+    """
+    from task_manager_testable import validate_task_dict
+
+    text = data.decode("utf-8")
+    # Смещения нужны в байтах, а raw_decode считает символы
+    ascii_only = len(text) == len(data)
+    char_position = byte_position = 0
+
+    def to_bytes(position):
+        nonlocal char_position, byte_position
+        if ascii_only:
+            return position
+        byte_position += len(text[char_position:position].encode("utf-8"))
+        char_position = position
+        return byte_position
+
+    ids = array("q")
+    offsets = array("Q")
+    lengths = array("I")
+    states = bytearray()
+    seen = set()
+    next_id = 1
+    decoder = json.JSONDecoder()
+
+    position = WHITESPACE.match(text).end()
+    if not text.startswith("[", position):
+        raise json.JSONDecodeError("Ожидался массив задач", text, position)
+    position = WHITESPACE.match(text, position + 1).end()
+    if text.startswith("]", position):
+        return ids, offsets, lengths, states, next_id
+
+    while True:
+        task, end = decoder.raw_decode(text, position)
+        span = None
+        if validate_task_dict(task):
+            span = find_description(text, position, end, task["description"])
+        if span is not None:
+            task_id = task.get("id")
+            if not isinstance(task_id, int) or (task_id < next_id and task_id in seen):
+                task_id = next_id
+            next_id = max(next_id, task_id + 1)
+            seen.add(task_id)
+
+            value_start = to_bytes(span[0])
+            ids.append(task_id)
+            offsets.append(value_start)
+            lengths.append(to_bytes(span[1]) - value_start)
+            states.append(DONE if task.get("completed") else OPEN)
+
+        position = WHITESPACE.match(text, end).end()
+        if text.startswith("]", position):
+            return ids, offsets, lengths, states, next_id
+        if not text.startswith(",", position):
+            raise json.JSONDecodeError("Ожидалась запятая", text, position)
+        position = WHITESPACE.match(text, position + 1).end()
+
+
+def utf8_length(text):
+    """Длина текста в байтах UTF-8."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+class OffsetIndexBuilder:
+    """
+    Собирает индекс смещений, пока tasks.json пишется по задаче.
+
+    Писатель сообщает каждый записанный кусок текста: служебный -
+    через skip(), текст задачи - через add(). Позиция считается в
+    байтах UTF-8, как их читает os.pread.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.states = bytearray()
+        self.next_id = 1
+        self.position = 0
+
+    def skip(self, text):
+        """Учитывает записанный текст, в котором нет задачи."""
+        self.position += utf8_length(text)
+
+    def add(self, task, text):
+        """
+        Учитывает записанный JSON одной задачи.
+
+        Аргументы:
+            task: Словарь задачи с ID
+            text: Её текст в том виде, в каком он записан в файл
+        """
+        start, end = find_description(text, 0, len(text), task["description"])
+        value_start = self.position + utf8_length(text[:start])
+        self.ids.append(task["id"])
+        self.offsets.append(value_start)
+        self.lengths.append(utf8_length(text[start:end]))
+        self.states.append(DONE if task["completed"] else OPEN)
+        self.next_id = max(self.next_id, task["id"] + 1)
+        self.position += utf8_length(text)
+
+    def write(self, filename, source_stat):
+        """
+        Записывает собранный индекс.
+
+        Аргументы:
+            filename: Путь к JSON файлу задач
+            source_stat: os.stat_result записанного tasks.json
+
+        Возвращает:
+            bool: True если успешно, False в противном случае
+        """
+        return write_offset_index(
+            filename, self.ids, self.offsets, self.lengths, self.states,
+            self.next_id, source_stat,
+        )
+
+
+def build_offset_index(filename):
+    """
+    Строит индекс смещений для tasks.json.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        bool: True если успешно, False если файла нет или он не список
+    """
+    try:
+        with open(filename, "rb") as file:
+            source_stat = os.fstat(file.fileno())
+            data = file.read()
+        ids, offsets, lengths, states, next_id = scan_tasks(data)
+    except (OSError, ValueError):
+        return False
+    return write_offset_index(filename, ids, offsets, lengths, states, next_id, source_stat)
+
+
+def write_offset_index(filename, ids, offsets, lengths, states, next_id, source_stat):
+    """
+    Записывает индекс смещений (через временный файл).
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        ids, offsets, lengths, states, next_id: Колонки индекса
+        source_stat: os.stat_result той версии tasks.json, по которой
+            построены колонки
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    header = HEADER.pack(
+        MAGIC, VERSION, len(ids), next_id, source_stat.st_size, source_stat.st_mtime_ns
+    )
+    if sys.byteorder != "little":
+        ids.byteswap()
+        offsets.byteswap()
+        lengths.byteswap()
+
+    try:
+        temp_filename = get_index_filename(filename) + ".tmp"
+        with open(temp_filename, "wb") as file:
+            file.write(header)
+            file.write(ids.tobytes())
+            file.write(offsets.tobytes())
+            file.write(lengths.tobytes())
+            file.write(pack_states(states))
+        os.replace(temp_filename, get_index_filename(filename))
+        return True
+    except OSError:
+        return False
+
+
+def read_offset_index(filename, source_stat):
+    """
+    Читает индекс смещений, если он построен по этой версии tasks.json.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        source_stat: os.stat_result tasks.json
+
+    Возвращает:
+        tuple or None: (ids, offsets, lengths, states, next_id), или None
+        если индекса нет, он повреждён или устарел
+    """
+    try:
+        with open(get_index_filename(filename), "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    magic, version, count, next_id, source_size, source_mtime = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if (source_size, source_mtime) != (source_stat.st_size, source_stat.st_mtime_ns):
+        return None
+
+    ids_start = HEADER.size
+    offsets_start = ids_start + 8 * count
+    lengths_start = offsets_start + 8 * count
+    bitmap_start = lengths_start + 4 * count
+    if len(data) != bitmap_start + (count + 7) // 8:
+        return None
+
+    ids = array("q")
+    ids.frombytes(data[ids_start:offsets_start])
+    offsets = array("Q")
+    offsets.frombytes(data[offsets_start:lengths_start])
+    lengths = array("I")
+    lengths.frombytes(data[lengths_start:bitmap_start])
+    if sys.byteorder != "little":
+        ids.byteswap()
+        offsets.byteswap()
+        lengths.byteswap()
+    states = unpack_states(data[bitmap_start:], count)
+    return ids, offsets, lengths, states, next_id
+
+
+def load_tasks_lazy(filename, cache_size=DESCRIPTION_CACHE_SIZE):
+    """
+    Загружает задачи без описаний: описания читаются при обращении.
+
+    Индекс смещений берётся из tasks.json.idx или строится заново,
+    если его нет или tasks.json изменился. Журнал применяется как
+    обычно.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        cache_size: Сколько прочитанных описаний держать в памяти
+
+    Возвращает:
+        TaskList: Задачи с ленивыми описаниями (пустой TaskList,
+        если файла нет или он не читается)
+    """
+    from task_manager_testable import replay_journal, reserve_archived_ids
+
+    try:
+        file = open(filename, "rb")
+    except OSError:
+        tasks = TaskList()
+        reserve_archived_ids(filename, tasks)
+        replay_journal(filename, tasks)
+        return tasks
+
+    # Индекс сверяется с тем файлом, который открыт: если tasks.json
+    # успеют подменить, описания всё равно читаются из открытой версии
+    source_stat = os.fstat(file.fileno())
+    index = read_offset_index(filename, source_stat)
+    if index is None and build_offset_index(filename):
+        index = read_offset_index(filename, source_stat)
+    if index is None:
+        file.close()
+        return TaskList()
+
+    ids, offsets, lengths, states, next_id = index
+    descriptions = LazyDescriptions(file, offsets, lengths, cache_size)
+    tasks = TaskList.from_columns(ids, descriptions, states, next_id)
+    reserve_archived_ids(filename, tasks)
+    replay_journal(filename, tasks)
+    return tasks
+
+
+# ============================================================
+# СРАВНЕНИЕ С ОБЫЧНОЙ ЗАГРУЗКОЙ
+# ============================================================
+
+def measure_load(load, filename):
+    """
+    Замеряет загрузку и память, которую держит загруженный список.
+
+    Возвращает:
+        tuple: (секунды, байт в памяти после загрузки)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = load(filename)
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return seconds, current
+
+
+def benchmark_lazy(count, directory):
+    """
+    Сравнивает обычную и ленивую загрузку на коротких и длинных описаниях.
+
+    Аргументы:
+        count: Количество задач
+        directory: Папка для временных файлов
+
+    Возвращает:
+        dict: {(режим, длина описания): (секунды, байт)}
+    """
+    from task_manager_testable import load_tasks_streaming, save_tasks_to_file
+
+    results = {}
+    for length in (20, 500):
+        filename = os.path.join(directory, f"tasks_{count}_{length}.json")
+        filler = "x" * length
+        save_tasks_to_file(filename, [
+            {"id": i + 1, "description": f"{i} {filler}"[:length], "completed": i % 2 == 0}
+            for i in range(count)
+        ])
+        build_offset_index(filename)
+        results[("streaming", length)] = measure_load(load_tasks_streaming, filename)
+        results[("lazy", length)] = measure_load(load_tasks_lazy, filename)
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        sizes = [int(size) for size in sys.argv[2:]] or [100_000]
+        with tempfile.TemporaryDirectory() as directory:
+            for count in sizes:
+                print(f"\n{count} задач:")
+                print(f"  {'загрузка':<12}{'описание':>10}{'время, с':>12}{'память, МБ':>14}")
+                for (mode, length), (seconds, size) in benchmark_lazy(count, directory).items():
+                    print(f"  {mode:<12}{length:>10}{seconds:>12.3f}{size / 1024 / 1024:>14.1f}")
+    else:
+        print("Использование:")
+        print("  python task_offsets.py bench [размеры...]")
+        sys.exit(2)
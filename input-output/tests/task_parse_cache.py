@@ -0,0 +1,219 @@
+"""
+Кэш разобранного tasks.json
+
+Каждый запуск заново разбирает tasks.json, даже если файл не менялся
+с прошлого раза. Кэш хранит уже разобранный список в формате marshal
+(быстрый двоичный формат Python для списков, словарей и строк) в
+отдельной папке и отдаёт его, пока файл не изменился.
+
+Ключ кэша:
+    - абсолютный путь к файлу
+    - mtime_ns и размер файла
+    - SHA-256 первых HASH_PREFIX_BYTES байт файла (на случай, если
+      файл подменили, сохранив время и размер)
+    - версия Python (формат marshal меняется между версиями)
+
+Любое несовпадение или повреждённый кэш - это промах: файл
+разбирается как обычно, и кэш перезаписывается.
+
+Папка кэша: $TASK_CACHE_DIR, иначе ~/.cache/task_manager.
+
+Сравнение холодного и тёплого запуска:
+    python task_parse_cache.py bench 100000
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import time
+
+
+HASH_PREFIX_BYTES = 64 * 1024
+CACHE_SUFFIX = ".marshal"
+
+
+def get_cache_dir():
+    """
+    Возвращает папку кэша.
+
+    Возвращает:
+        str: $TASK_CACHE_DIR или ~/.cache/task_manager
+    """
+    directory = os.environ.get("TASK_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "task_manager")
+
+
+def get_cache_filename(filename, cache_dir):
+    """
+    Возвращает путь к файлу кэша для данного файла задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+        cache_dir: Папка кэша
+
+    Возвращает:
+        str: Путь вида cache_dir/<sha1 пути>.marshal
+    """
+    name = hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, name + CACHE_SUFFIX)
+
+
+def cache_key(filename):
+    """
+    Вычисляет ключ кэша для текущего состояния файла.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+
+    Возвращает:
+        tuple: (путь, mtime_ns, размер, хэш начала файла, версия Python)
+
+    Исключения:
+        OSError: Если файл не читается (например, FileNotFoundError)
+    """
+    with open(filename, "rb") as file:
+        stat = os.fstat(file.fileno())
+        prefix_hash = hashlib.sha256(file.read(HASH_PREFIX_BYTES)).hexdigest()
+    return (
+        os.path.abspath(filename),
+        stat.st_mtime_ns,
+        stat.st_size,
+        prefix_hash,
+        sys.version_info[:2],
+    )
+
+
+def read_cache(filename, key, cache_dir):
+    """
+    Читает разобранные данные из кэша, если ключ совпадает.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+        key: Ключ из cache_key()
+        cache_dir: Папка кэша
+
+    Возвращает:
+        tuple: (True, данные) при попадании, (False, None) при промахе
+    """
+    try:
+        with open(get_cache_filename(filename, cache_dir), "rb") as file:
+            # marshal.loads по готовым байтам намного быстрее marshal.load(file)
+            cached_key, data = marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return False, None
+    if cached_key != key:
+        return False, None
+    return True, data
+
+
+def write_cache(filename, key, data, cache_dir):
+    """
+    Сохраняет разобранные данные в кэш (через временный файл).
+
+    Аргументы:
+        filename: Путь к JSON файлу
+        key: Ключ из cache_key() для той версии файла, из которой data
+        data: Разобранные данные (списки, словари, строки, числа)
+        cache_dir: Папка кэша
+
+    Возвращает:
+        bool: True если сохранено, False в противном случае
+    """
+    try:
+        blob = marshal.dumps((key, data))
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_filename = get_cache_filename(filename, cache_dir)
+        temp_filename = f"{cache_filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "wb") as file:
+            file.write(blob)
+        os.replace(temp_filename, cache_filename)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def load_json_cached(filename, cache_dir=None):
+    """
+    Загружает JSON файл, используя кэш разбора, если файл не менялся.
+
+    Ведёт себя как json.load: при отсутствии файла поднимается
+    FileNotFoundError, при битом JSON - json.JSONDecodeError,
+    поэтому заменяет json.load без изменения обработки ошибок.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+        cache_dir: Папка кэша (по умолчанию get_cache_dir())
+
+    Возвращает:
+        object: Разобранные данные (каждый раз новые объекты)
+    """
+    cache_dir = get_cache_dir() if cache_dir is None else cache_dir
+    key = cache_key(filename)
+    hit, data = read_cache(filename, key, cache_dir)
+    if hit:
+        return data
+
+    with open(filename, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    # Файл могли изменить, пока он разбирался: тогда кэш не пишем
+    if cache_key(filename) == key:
+        write_cache(filename, key, data, cache_dir)
+    return data
+
+
+# ============================================================
+# ХОЛОДНЫЙ И ТЁПЛЫЙ ЗАПУСК
+# ============================================================
+
+def benchmark_startup(count, directory, repeat=3):
+    """
+    Сравнивает загрузку без кэша (холодный запуск) и из кэша (тёплый).
+
+    Аргументы:
+        count: Количество задач
+        directory: Папка для временных файлов
+        repeat: Сколько раз замерять (берётся лучший результат)
+
+    Возвращает:
+        dict: Секунды для "cold" и "warm"
+    """
+    from task_manager_testable import load_tasks_fast, save_tasks_to_file
+
+    filename = os.path.join(directory, f"tasks_{count}.json")
+    cache_dir = os.path.join(directory, "cache")
+    save_tasks_to_file(filename, [
+        {"id": i + 1, "description": f"Задача номер {i}", "completed": i % 2 == 0}
+        for i in range(count)
+    ])
+
+    # Как при запуске менеджера без свежего бинарного снимка: без кэша
+    # файл читается потоково, с кэшем - из marshal
+    def measure(cache):
+        start = time.perf_counter()
+        load_tasks_fast(filename, cache_dir=cache)
+        return time.perf_counter() - start
+
+    cold = min(measure(None) for _ in range(repeat))
+    measure(cache_dir)
+    warm = min(measure(cache_dir) for _ in range(repeat))
+    return {"cold": cold, "warm": warm}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        with tempfile.TemporaryDirectory() as directory:
+            for count in [int(size) for size in sys.argv[2:]] or [100_000]:
+                result = benchmark_startup(count, directory)
+                print(f"{count} задач: без кэша {result['cold'] * 1000:.0f} мс, "
+                      f"из кэша {result['warm'] * 1000:.0f} мс "
+                      f"(в {result['cold'] / result['warm']:.1f} раза быстрее)")
+    else:
+        print("Использование:")
+        print("  python task_parse_cache.py bench [размеры...]")
+        sys.exit(2)
@@ -0,0 +1,756 @@
+"""
+Файл задач из записей фиксированного размера
+
+Отметка о выполнении меняет один флаг, но tasks.json после неё
+приходится переписывать целиком. В файле записей каждая задача
+занимает одинаковое число байт, поэтому её место в файле известно
+заранее, и выполнение задачи - это запись одного байта через mmap
+и сброс на диск одной страницы памяти.
+
+Формат tasks.rec (все числа little-endian):
+    заголовок    magic "TREC", версия, размер ячейки описания,
+                 число записей, следующий ID, флаги, поколение
+                 файла переполнения (32 байта)
+    записи       по RECORD_HEADER.size + slot_size байт:
+                     ID            int64
+                     состояние     1 байт: OPEN, DONE или DELETED
+                     длина         uint32 - длина описания в байтах UTF-8
+                     ячейка        описание, если оно помещается,
+                                   иначе uint64 - смещение в tasks.rec.ovf
+
+Длинные описания лежат в файле переполнения tasks.rec.ovf, который
+только дописывается. Место под записи выделяется с запасом, поэтому
+добавление задачи не переписывает файл. Удаление тоже выполняется
+на месте: запись помечается как DELETED.
+
+Полная перезапись (write_records) кладёт описания в новый файл
+переполнения (tasks.rec.ovf.1, .2, ...), номер которого записан в
+заголовке, и только потом подменяет tasks.rec. Сбой посередине
+оставляет старые записи вместе с их старым файлом переполнения.
+
+В менеджере задач (один процесс на файл):
+    python task_manager_testable.py --records tasks.rec
+
+Конвертация (без потерь: ID, описания и флаги сохраняются):
+    python task_records.py to-rec tasks.json tasks.rec
+    python task_records.py to-json tasks.rec tasks.json
+Сравнение с сохранением JSON:
+    python task_records.py bench 100000
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+
+from task_list import TaskList, DELETED, DONE, OPEN
+
+
+OVERFLOW_SUFFIX = ".ovf"
+MAGIC = b"TREC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQqII")
+RECORD_HEADER = struct.Struct("<qBxxxI")
+OVERFLOW_POINTER = struct.Struct("<Q")
+STATE_OFFSET = 8
+# 16 байт заголовка записи + 48 байт описания = 64 байта, 64 записи на страницу
+DEFAULT_SLOT_SIZE = 48
+# Флаг заголовка: ID записей идут по возрастанию (поиск по ID двоичный)
+FLAG_SORTED = 1
+MIN_CAPACITY = 64
+# Сколько записей читать за раз при построении колонки ID
+READ_CHUNK_RECORDS = 4096
+
+
+def get_overflow_filename(filename, generation=0):
+    """
+    Возвращает путь к файлу переполнения для файла записей.
+
+    Аргументы:
+        filename: Путь к файлу записей
+        generation: Поколение файла переполнения из заголовка
+
+    Возвращает:
+        str: Путь вида "tasks.rec.ovf" (поколение 0) или "tasks.rec.ovf.2"
+    """
+    if generation == 0:
+        return filename + OVERFLOW_SUFFIX
+    return f"{filename}{OVERFLOW_SUFFIX}.{generation}"
+
+
+def read_overflow_generation(filename):
+    """
+    Читает поколение файла переполнения из заголовка файла записей.
+
+    Аргументы:
+        filename: Путь к файлу записей
+
+    Возвращает:
+        int or None: Поколение, или None если файла нет или это не
+        файл записей
+    """
+    try:
+        with open(filename, "rb") as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, *_, generation = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return generation
+
+
+def pack_record(task_id, state, blob, slot_size, overflow_offset=0):
+    """
+    Упаковывает одну запись.
+
+    Аргументы:
+        task_id: ID задачи
+        state: OPEN, DONE или DELETED
+        blob: Описание в UTF-8
+        slot_size: Размер ячейки описания
+        overflow_offset: Смещение описания в файле переполнения
+            (используется, если описание не помещается в ячейку)
+
+    Возвращает:
+        bytes: Запись длиной RECORD_HEADER.size + slot_size
+    """
+    slot = blob if len(blob) <= slot_size else OVERFLOW_POINTER.pack(overflow_offset)
+    return RECORD_HEADER.pack(task_id, state, len(blob)) + slot.ljust(slot_size, b"\0")
+
+
+def write_records(filename, tasks, slot_size=DEFAULT_SLOT_SIZE):
+    """
+    Записывает задачи в файл записей (и файл переполнения).
+
+    Задачам без ID выдаются новые ID, как при сохранении в JSON.
+    Описания пишутся в файл переполнения следующего поколения, а
+    tasks.rec подменяется последним: до этого момента старые записи
+    ссылаются на свой, нетронутый файл переполнения.
+
+    Аргументы:
+        filename: Путь к файлу записей
+        tasks: TaskList или список словарей задач
+        slot_size: Размер ячейки описания в байтах (не меньше 8)
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    if slot_size < OVERFLOW_POINTER.size:
+        raise ValueError(f"Ячейка описания должна быть не меньше {OVERFLOW_POINTER.size} байт")
+
+    records = bytearray()
+    overflow = bytearray()
+    next_id = 1
+    previous_id = None
+    flags = FLAG_SORTED
+    count = 0
+    for task in tasks:
+        task_id = task.get("id")
+        if not isinstance(task_id, int):
+            task_id = next_id
+        next_id = max(next_id, task_id + 1)
+        if previous_id is not None and task_id <= previous_id:
+            flags &= ~FLAG_SORTED
+        previous_id = task_id
+        blob = task["description"].encode("utf-8")
+        state = DONE if task.get("completed") else OPEN
+        records += pack_record(task_id, state, blob, slot_size, len(overflow))
+        if len(blob) > slot_size:
+            overflow += blob
+        count += 1
+
+    old_generation = read_overflow_generation(filename)
+    generation = 0 if old_generation is None else old_generation + 1
+    capacity = max(MIN_CAPACITY, 2 * count)
+    size = HEADER.size + capacity * (RECORD_HEADER.size + slot_size)
+    header = HEADER.pack(MAGIC, VERSION, slot_size, count, next_id, flags, generation)
+    try:
+        # На файл нового поколения ещё ничто не ссылается: его можно
+        # писать сразу на место (остаток прерванной записи перезапишется)
+        with open(get_overflow_filename(filename, generation), "wb") as file:
+            file.write(overflow)
+        with open(filename + ".tmp", "wb") as file:
+            file.write(header)
+            file.write(records)
+            # Свободные записи - нули; на большинстве файловых систем
+            # truncate не занимает под них место на диске
+            file.truncate(size)
+        os.replace(filename + ".tmp", filename)
+    except OSError:
+        return False
+    if old_generation is not None:
+        try:
+            os.remove(get_overflow_filename(filename, old_generation))
+        except OSError:
+            pass  # Лишний старый файл не мешает: на него никто не ссылается
+    return True
+
+
+class RecordFile:
+    """
+    Открытый файл записей, отображённый в память.
+
+    Задачи находятся по ID: двоичным поиском, если ID идут по
+    возрастанию (обычный случай), иначе через словарь. Колонка ID
+    читается из файла при первом поиске.
+
+    Пример:
+        with RecordFile("tasks.rec") as records:
+            records.complete(7)
+    """
+
+    def __init__(self, filename):
+        """
+        Аргументы:
+            filename: Путь к файлу записей
+
+        Исключения:
+            OSError: Если файл не открывается
+            ValueError: Если это не файл записей или он повреждён
+        """
+        self.filename = filename
+        self._file = open(filename, "r+b")
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError("Файл записей повреждён")
+            (magic, version, self.slot_size, self.count, self.next_id, self.flags,
+             self.overflow_generation) = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Это не файл записей задач")
+            self.record_size = RECORD_HEADER.size + self.slot_size
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        except BaseException:
+            self._file.close()
+            raise
+        if self.capacity < self.count:
+            self._map.close()
+            self._file.close()
+            raise ValueError("Файл записей повреждён")
+        self._overflow = open(get_overflow_filename(filename, self.overflow_generation), "a+b")
+        self._ids = None
+        self._slot_by_id = None
+
+    @property
+    def capacity(self):
+        """Сколько записей помещается в файл без его увеличения."""
+        return (len(self._map) - HEADER.size) // self.record_size
+
+    def close(self):
+        """Сбрасывает изменения на диск и закрывает файл."""
+        if self._map.closed:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._overflow.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    # ----- Поиск записи по ID -----
+
+    def _offset(self, slot):
+        return HEADER.size + slot * self.record_size
+
+    def _id_column(self):
+        """Возвращает array("q") с ID всех записей, читая его при первом вызове."""
+        if self._ids is None:
+            ids = array("q")
+            stride = self.record_size // 8
+            for first in range(0, self.count, READ_CHUNK_RECORDS):
+                last = min(self.count, first + READ_CHUNK_RECORDS)
+                chunk = self._map[self._offset(first):self._offset(last)]
+                if self.record_size % 8 == 0:
+                    ids.extend(memoryview(chunk).cast("q")[::stride])
+                else:
+                    ids.extend(RECORD_HEADER.unpack_from(chunk, slot * self.record_size)[0]
+                               for slot in range(last - first))
+            if sys.byteorder != "little" and self.record_size % 8 == 0:
+                ids.byteswap()
+            self._ids = ids
+        return self._ids
+
+    def _slot_index(self):
+        """Словарь ID -> запись, если ID идут не по порядку (иначе None)."""
+        if self.flags & FLAG_SORTED:
+            return None
+        if self._slot_by_id is None:
+            self._slot_by_id = {task_id: slot for slot, task_id in enumerate(self._id_column())}
+        return self._slot_by_id
+
+    def find(self, task_id):
+        """
+        Находит запись задачи по ID.
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            int or None: Номер записи, или None если задачи нет
+            (или она удалена)
+        """
+        ids = self._id_column()
+        slot_by_id = self._slot_index()
+        if slot_by_id is None:
+            slot = bisect_left(ids, task_id)
+            if slot == len(ids) or ids[slot] != task_id:
+                return None
+        else:
+            slot = slot_by_id.get(task_id)
+            if slot is None:
+                return None
+        if self._map[self._offset(slot) + STATE_OFFSET] == DELETED:
+            return None
+        return slot
+
+    # ----- Чтение -----
+
+    def read(self, slot):
+        """
+        Читает запись.
+
+        Аргументы:
+            slot: Номер записи
+
+        Возвращает:
+            tuple: (ID, состояние, описание)
+        """
+        offset = self._offset(slot)
+        task_id, state, length = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        if length <= self.slot_size:
+            blob = self._map[start:start + length]
+        else:
+            (overflow_offset,) = OVERFLOW_POINTER.unpack_from(self._map, start)
+            blob = os.pread(self._overflow.fileno(), length, overflow_offset)
+        return task_id, state, str(blob, "utf-8")
+
+    def get(self, task_id):
+        """
+        Возвращает задачу по ID.
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            dict or None: Словарь задачи, или None если задачи нет
+        """
+        slot = self.find(task_id)
+        if slot is None:
+            return None
+        task_id, state, description = self.read(slot)
+        return {"id": task_id, "description": description, "completed": state == DONE}
+
+    def __iter__(self):
+        """Перебирает живые задачи в виде словарей в порядке записей."""
+        for slot in range(self.count):
+            task_id, state, description = self.read(slot)
+            if state != DELETED:
+                yield {"id": task_id, "description": description, "completed": state == DONE}
+
+    def to_task_list(self):
+        """
+        Читает все живые задачи в TaskList.
+
+        Возвращает:
+            TaskList: Задачи в порядке записей
+        """
+        ids = array("q")
+        descriptions = []
+        states = bytearray()
+        for slot in range(self.count):
+            task_id, state, description = self.read(slot)
+            if state != DELETED:
+                ids.append(task_id)
+                descriptions.append(description)
+                states.append(state)
+        return TaskList.from_columns(ids, descriptions, states, self.next_id)
+
+    # ----- Изменение на месте -----
+
+    def _flush_range(self, start, end):
+        """Сбрасывает на диск страницы памяти, в которые попадает [start, end)."""
+        start -= start % mmap.ALLOCATIONGRANULARITY
+        end = min(len(self._map), end)
+        self._map.flush(start, end - start)
+
+    def _set_states(self, task_ids, state, flush):
+        """Меняет состояние задач на месте. Возвращает число изменённых."""
+        # Цикл без вызовов методов: при тысячах задач вся работа - в нём
+        ids = self._id_column()
+        count = len(ids)
+        slot_by_id = self._slot_index()
+        buffer = self._map
+        base = HEADER.size + STATE_OFFSET
+        record_size = self.record_size
+        positions = []
+        for task_id in task_ids:
+            if slot_by_id is None:
+                slot = bisect_left(ids, task_id)
+                if slot == count or ids[slot] != task_id:
+                    continue
+            else:
+                slot = slot_by_id.get(task_id)
+                if slot is None:
+                    continue
+            position = base + slot * record_size
+            if buffer[position] != DELETED:
+                buffer[position] = state
+                positions.append(position)
+        if positions and flush:
+            self._flush_range(min(positions), max(positions) + 1)
+        return len(positions)
+
+    def complete(self, task_id, flush=True):
+        """
+        Отмечает задачу выполненной: один байт в памяти и одна страница на диск.
+
+        Аргументы:
+            task_id: ID задачи
+            flush: Сразу сбросить страницу на диск
+
+        Возвращает:
+            bool: True если задача найдена
+        """
+        return self._set_states((task_id,), DONE, flush) == 1
+
+    def complete_many(self, task_ids, flush=True):
+        """
+        Отмечает выполненными много задач и сбрасывает изменения один раз.
+
+        Аргументы:
+            task_ids: ID задач
+            flush: Сбросить изменённые страницы на диск в конце
+
+        Возвращает:
+            int: Сколько задач найдено и отмечено
+        """
+        return self._set_states(task_ids, DONE, flush)
+
+    def delete(self, task_id, flush=True):
+        """
+        Удаляет задачу: запись помечается DELETED и остаётся на месте.
+
+        Аргументы:
+            task_id: ID задачи
+            flush: Сразу сбросить страницу на диск
+
+        Возвращает:
+            bool: True если задача найдена
+        """
+        return self._set_states((task_id,), DELETED, flush) == 1
+
+    def _grow(self, capacity):
+        """Увеличивает файл до capacity записей и отображает его заново."""
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(HEADER.size + capacity * self.record_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def add(self, description, flush=True):
+        """
+        Дописывает новую задачу в конец.
+
+        Аргументы:
+            description: Описание задачи
+            flush: Сразу сбросить запись и заголовок на диск
+
+        Возвращает:
+            int: ID новой задачи
+        """
+        if self.count == self.capacity:
+            self._grow(max(MIN_CAPACITY, 2 * self.capacity))
+
+        blob = description.encode("utf-8")
+        overflow_offset = 0
+        if len(blob) > self.slot_size:
+            # Описание дописывается раньше записи, которая на него ссылается
+            self._overflow.seek(0, os.SEEK_END)
+            overflow_offset = self._overflow.tell()
+            self._overflow.write(blob)
+            self._overflow.flush()
+
+        task_id = self.next_id
+        slot = self.count
+        offset = self._offset(slot)
+        self._map[offset:offset + self.record_size] = pack_record(
+            task_id, OPEN, blob, self.slot_size, overflow_offset
+        )
+        self.count += 1
+        self.next_id += 1
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, self.slot_size,
+                         self.count, self.next_id, self.flags, self.overflow_generation)
+        if self._ids is not None:
+            self._ids.append(task_id)
+        if self._slot_by_id is not None:
+            self._slot_by_id[task_id] = slot
+        if flush:
+            self._flush_range(offset, offset + self.record_size)
+            self._flush_range(0, HEADER.size)
+        return task_id
+
+    def flush(self):
+        """Сбрасывает на диск все изменения."""
+        self._map.flush()
+
+
+def load_records(filename):
+    """
+    Читает файл записей как TaskList.
+
+    Аргументы:
+        filename: Путь к файлу записей
+
+    Возвращает:
+        TaskList or None: Задачи, или None если файла нет или он повреждён
+    """
+    try:
+        with RecordFile(filename) as records:
+            return records.to_task_list()
+    except (OSError, ValueError):
+        return None
+
+
+# ============================================================
+# ХРАНИЛИЩЕ ДЛЯ МЕНЕДЖЕРА ЗАДАЧ
+# ============================================================
+
+class RecordTaskStore:
+    """
+    Задачи в файле записей для main() менеджера задач.
+
+    Список держится в памяти как TaskList (его принимают display_tasks,
+    get_task_by_index и search_tasks), а каждое изменение сразу
+    пишется на место в файл записей: выполнение и удаление - один
+    байт, добавление - одна запись. Методы commit, refresh,
+    get_search_index и close повторяют SharedTaskFile.
+
+    Блокировки у файла записей нет, поэтому его должен открывать
+    один процесс: изменения других процессов не подтягиваются.
+    """
+
+    def __init__(self, filename):
+        """
+        Аргументы:
+            filename: Путь к файлу записей
+
+        Исключения:
+            OSError: Если файл не открывается
+            ValueError: Если это не файл записей или он повреждён
+        """
+        self.filename = filename
+        self.records = RecordFile(filename)
+        self.tasks = self.records.to_task_list()
+        self.search_index = None
+
+    def commit(self, record):
+        """
+        Применяет запись в формате журнала (add, complete, delete).
+
+        Аргументы:
+            record: Например {"op": "add", "description": "..."}
+                или {"op": "delete", "id": 7}
+
+        Возвращает:
+            bool: True если изменение применено и записано
+
+        Исключения:
+            OSError: Если описание не удалось дописать в файл переполнения
+        """
+        from task_manager_testable import (
+            apply_journal_record,
+            get_task_by_index,
+            validate_task_description,
+        )
+
+        if not isinstance(record, dict):
+            return False
+        op = record.get("op")
+        if op == "add":
+            description = record.get("description")
+            if not validate_task_description(description):
+                return False
+            description = description.strip()
+            task_id = self.records.add(description)
+            record = {"op": "add", "description": description, "id": task_id}
+        elif op in ("complete", "delete"):
+            task_id = record.get("id")
+            if task_id is None:
+                task = get_task_by_index(self.tasks, record.get("index"))
+                if task is None:
+                    return False
+                task_id = task["id"]
+            if op == "complete":
+                found = self.records.complete(task_id)
+            else:
+                found = self.records.delete(task_id)
+            if not found:
+                return False
+            record = {"op": op, "id": task_id}
+        else:
+            return False
+        return apply_journal_record(self.tasks, record, self.search_index)
+
+    def refresh(self):
+        """
+        Файл меняет только этот процесс, поэтому подтягивать нечего.
+
+        Возвращает:
+            bool: Всегда False
+        """
+        return False
+
+    def get_search_index(self):
+        """
+        Возвращает поисковый индекс, строя его при первом обращении.
+
+        Возвращает:
+            TaskSearchIndex: Индекс текущего списка
+        """
+        from task_search import TaskSearchIndex
+
+        if self.search_index is None:
+            self.search_index = TaskSearchIndex.build(self.tasks)
+        return self.search_index
+
+    def close(self):
+        """
+        Сбрасывает изменения на диск и закрывает файл.
+
+        Возвращает:
+            bool: True (все изменения уже записаны на место)
+        """
+        self.records.close()
+        return True
+
+
+def migrate_json_to_records(json_filename, records_filename):
+    """
+    Однократно переносит задачи из JSON файла (и его журнала) в файл записей.
+
+    Если файл записей уже есть, перенос не выполняется, чтобы повторный
+    запуск не затёр сделанные в нём изменения. JSON файл не изменяется.
+
+    Аргументы:
+        json_filename: Путь к tasks.json
+        records_filename: Путь к файлу записей
+
+    Возвращает:
+        int: Количество перенесённых задач (0 если файл записей уже есть)
+
+    Исключения:
+        OSError: Если файл записей не удалось записать
+    """
+    from task_manager_testable import load_tasks_streaming
+
+    if os.path.exists(records_filename):
+        return 0
+    tasks = load_tasks_streaming(json_filename)
+    if not write_records(records_filename, tasks):
+        raise OSError(f"Не удалось записать {records_filename}")
+    return len(tasks)
+
+
+# ============================================================
+# КОНВЕРТАЦИЯ JSON <-> ЗАПИСИ
+# ============================================================
+
+def json_to_records(json_filename, records_filename, slot_size=DEFAULT_SLOT_SIZE):
+    """
+    Делает файл записей из JSON файла задач (с учётом журнала).
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    from task_manager_testable import load_tasks_streaming
+
+    return write_records(records_filename, load_tasks_streaming(json_filename), slot_size)
+
+
+def records_to_json(records_filename, json_filename):
+    """
+    Сохраняет задачи из файла записей обратно в JSON.
+
+    Возвращает:
+        bool: True если успешно, False если файл записей не читается
+    """
+    from task_manager_testable import save_tasks_to_file
+
+    tasks = load_records(records_filename)
+    if tasks is None:
+        return False
+    return save_tasks_to_file(json_filename, tasks)
+
+
+def benchmark_records(count, directory):
+    """
+    Сравнивает сохранение выполненных задач в JSON и в файле записей.
+
+    Аргументы:
+        count: Количество задач
+        directory: Папка для временных файлов
+
+    Возвращает:
+        dict: Миллисекунды для каждой операции
+    """
+    from task_manager_testable import complete_tasks, save_tasks_to_file
+
+    tasks = TaskList({"description": f"Задача номер {i}", "completed": False}
+                     for i in range(count))
+    json_filename = os.path.join(directory, f"tasks_{count}.json")
+    records_filename = os.path.join(directory, f"tasks_{count}.rec")
+    save_tasks_to_file(json_filename, tasks)
+    write_records(records_filename, tasks)
+    bulk = range(1, count + 1, 10)
+
+    def measure(action):
+        start = time.perf_counter()
+        action()
+        return (time.perf_counter() - start) * 1000
+
+    results = {}
+    results["complete 1, json"] = measure(
+        lambda: (complete_tasks(tasks, [1]), save_tasks_to_file(json_filename, tasks))
+    )
+    results[f"complete {len(bulk)}, json"] = measure(
+        lambda: (complete_tasks(tasks, list(bulk)), save_tasks_to_file(json_filename, tasks))
+    )
+    with RecordFile(records_filename) as records:
+        records.find(1)  # Колонка ID читается один раз при открытии
+        results["complete 1, records"] = measure(lambda: records.complete(1))
+        results[f"complete {len(bulk)}, records"] = measure(
+            lambda: records.complete_many(bulk)
+        )
+    return results
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "to-rec" and len(sys.argv) == 4:
+        print("Готово." if json_to_records(sys.argv[2], sys.argv[3]) else "Ошибка конвертации.")
+    elif command == "to-json" and len(sys.argv) == 4:
+        print("Готово." if records_to_json(sys.argv[2], sys.argv[3]) else "Ошибка конвертации.")
+    elif command == "bench":
+        with tempfile.TemporaryDirectory() as workdir:
+            for size in [int(size) for size in sys.argv[2:]] or [100_000]:
+                print(f"\n{size} задач (мс):")
+                for operation, milliseconds in benchmark_records(size, workdir).items():
+                    print(f"  {operation:<28}{milliseconds:>10.2f}")
+    else:
+        print("Использование:")
+        print("  python task_records.py to-rec tasks.json tasks.rec")
+        print("  python task_records.py to-json tasks.rec tasks.json")
+        print("  python task_records.py bench [размеры...]")
+        sys.exit(2)
@@ -0,0 +1,175 @@
+"""
+Полнотекстовый поиск по задачам
+
+Поиск перебором проверяет каждое описание. Инвертированный индекс
+хранит для каждого слова множество ID задач, где оно встречается,
+поэтому запрос трогает только множества слов из запроса.
+
+Запросы:
+    молоко          - задачи со словом "молоко"
+    купить молоко   - задачи, где есть оба слова (И)
+    мол*            - задачи со словом, начинающимся на "мол"
+
+Слова выделяются регулярным выражением \\w+, которое понимает
+Юникод, поэтому кириллица ищется так же, как латиница.
+Регистр не важен.
+
+Индекс хранит стабильные ID задач, поэтому работает с TaskList.
+"""
+
+import re
+from bisect import bisect_left, insort
+
+
+WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Разбивает текст на слова без учёта регистра.
+
+    Аргументы:
+        text: Строка
+
+    Возвращает:
+        set: Множество слов в нижнем регистре
+    """
+    return {word.casefold() for word in WORD.findall(text)}
+
+
+class TaskSearchIndex:
+    """
+    Инвертированный индекс: слово -> множество ID задач.
+
+    Индекс обновляется по одной задаче (add/remove), а не
+    перестраивается на каждый запрос.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        # Отсортированный словарь слов для поиска по префиксу
+        self.words = []
+
+    @classmethod
+    def build(cls, tasks):
+        """
+        Строит индекс по всем задачам списка.
+
+        Аргументы:
+            tasks: TaskList (у задач должен быть "id")
+
+        Возвращает:
+            TaskSearchIndex: Новый индекс
+        """
+        index = cls()
+        for task in tasks:
+            for word in tokenize(task["description"]):
+                index.postings.setdefault(word, set()).add(task["id"])
+        index.words = sorted(index.postings)
+        return index
+
+    def add(self, task_id, description):
+        """
+        Добавляет задачу в индекс.
+
+        Аргументы:
+            task_id: Стабильный ID задачи
+            description: Описание задачи
+        """
+        for word in tokenize(description):
+            ids = self.postings.get(word)
+            if ids is None:
+                ids = self.postings[word] = set()
+                insort(self.words, word)
+            ids.add(task_id)
+
+    def remove(self, task_id, description):
+        """
+        Убирает задачу из индекса.
+
+        Аргументы:
+            task_id: Стабильный ID задачи
+            description: Описание задачи (то, с которым она добавлялась)
+        """
+        for word in tokenize(description):
+            ids = self.postings.get(word)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def match_prefix(self, prefix):
+        """
+        Находит задачи со словом, начинающимся на prefix.
+
+        Аргументы:
+            prefix: Начало слова (в нижнем регистре)
+
+        Возвращает:
+            set: ID подходящих задач
+        """
+        ids = set()
+        position = bisect_left(self.words, prefix)
+        while position < len(self.words) and self.words[position].startswith(prefix):
+            ids |= self.postings[self.words[position]]
+            position += 1
+        return ids
+
+    def search(self, query):
+        """
+        Выполняет запрос: все слова должны встретиться в задаче (И).
+
+        Слово со звёздочкой на конце (мол*) ищется по префиксу.
+
+        Аргументы:
+            query: Строка запроса
+
+        Возвращает:
+            set: ID подходящих задач (пустое множество для пустого запроса)
+        """
+        matches = []
+        for term in query.split():
+            is_prefix = term.endswith("*")
+            words = WORD.findall(term.casefold())
+            if not words:
+                continue
+            if is_prefix:
+                # "мол*" - префикс; всё, что до последнего слова, ищется целиком
+                last = words.pop()
+                matches.append(self.match_prefix(last))
+            for word in words:
+                matches.append(self.postings.get(word, set()))
+        if not matches:
+            return set()
+
+        # Пересекаем, начиная с самого маленького множества
+        matches.sort(key=len)
+        result = set(matches[0])
+        for ids in matches[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+
+def search_tasks(tasks, index, query):
+    """
+    Ищет задачи и возвращает их с отображаемыми номерами.
+
+    Аргументы:
+        tasks: TaskList
+        index: TaskSearchIndex для этого списка
+        query: Строка запроса
+
+    Возвращает:
+        list: Пары (номер начиная с 1, задача), по возрастанию номера
+    """
+    found = []
+    for task_id in index.search(query):
+        position = tasks.position_of(task_id)
+        if position is not None:
+            found.append((position, tasks.get_by_id(task_id)))
+    found.sort(key=lambda pair: pair[0])
+    return found
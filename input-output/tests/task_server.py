@@ -0,0 +1,398 @@
+"""
+Сервер задач на asyncio
+
+Каждый запуск менеджера задач заново читает и разбирает tasks.json.
+Если списком пользуются много маленьких клиентов (виджет в оболочке,
+плагин редактора), проще держать список в памяти одного процесса,
+а клиентам отвечать через локальный сокет.
+
+Протокол: одна строка JSON - один запрос, одна строка JSON - ответ.
+    {"op": "add", "description": "Купить молоко"}  -> {"ok": true, "id": 7}
+    {"op": "get", "index": 1}                      -> {"ok": true, "task": {...}}
+    {"op": "complete", "index": 1}                 -> {"ok": true}
+    {"op": "complete", "id": 7}                    -> {"ok": true}
+    {"op": "delete", "index": 1}                   -> {"ok": true}
+    {"op": "list", "offset": 0, "limit": 20}       -> {"ok": true, "total": 50, "tasks": [...]}
+    {"op": "count"}                                -> {"ok": true, "count": 50}
+    {"op": "search", "query": "мол*"}              -> {"ok": true, "results": [...]}
+    ошибка                                         -> {"ok": false, "error": "..."}
+
+Сохранение пачками: изменения, пришедшие за FLUSH_INTERVAL секунд,
+дописываются в журнал одной записью, и клиент получает ответ на
+изменение, когда оно уже на диске. Чтения отвечаются из памяти сразу.
+
+Файл задач сервер делит с обычным менеджером задач через
+SharedTaskFile: перед каждой пачкой он догоняет чужие изменения
+по tasks.json.version, поэтому запись из другого терминала не
+перезаписывается. Блокировка файла и дисковый ввод-вывод выполняются
+в отдельном потоке (asyncio.to_thread), не останавливая цикл событий.
+
+Запуск:
+    python task_server.py --socket tasks.sock --tasks tasks.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from task_manager_testable import (
+    PAGE_SIZE,
+    apply_journal_record,
+    get_task_by_index,
+    validate_task_description,
+)
+from task_search import search_tasks
+from task_sync import SharedTaskFile
+
+
+DEFAULT_SOCKET = "tasks.sock"
+FLUSH_INTERVAL = 0.05
+# Операции, которые меняют список и идут в журнал
+CHANGE_OPS = ("add", "complete", "delete")
+# Самая длинная строка запроса (защита от клиента, который не шлёт \n)
+MAX_REQUEST_BYTES = 1024 * 1024
+# Очередь ещё не принятых соединений: при сотнях клиентов, которые
+# подключаются одновременно, стандартных 100 не хватает
+BACKLOG = 1024
+
+
+def task_to_json(task):
+    """
+    Превращает задачу в словарь для ответа.
+
+    Аргументы:
+        task: Словарь задачи или TaskView
+
+    Возвращает:
+        dict: Обычный словарь задачи
+    """
+    return task.to_dict() if hasattr(task, "to_dict") else dict(task)
+
+
+def error(message):
+    """Ответ с ошибкой."""
+    return {"ok": False, "error": message}
+
+
+def encode_response(response):
+    """Ответ в виде строки протокола (JSON и перевод строки)."""
+    return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def resolve_index(tasks, request):
+    """
+    Находит номер задачи из запроса по "index" или по "id".
+
+    Аргументы:
+        tasks: TaskList
+        request: Словарь запроса
+
+    Возвращает:
+        int or None: Номер начиная с 1, или None если задачи нет
+    """
+    if "id" in request:
+        task_id = request["id"]
+        return tasks.position_of(task_id) if isinstance(task_id, int) else None
+    index = request.get("index")
+    return index if get_task_by_index(tasks, index) is not None else None
+
+
+def prepare_change(tasks, request):
+    """
+    Проверяет запрос на изменение и строит для него запись журнала.
+
+    Сам список не меняется: номер задачи сразу переводится в ID,
+    чтобы запись можно было применить и к списку, который успел
+    измениться.
+
+    Аргументы:
+        tasks: TaskList
+        request: Словарь запроса с op "add", "complete" или "delete"
+
+    Возвращает:
+        tuple: (ответ с ошибкой или None, запись журнала или None)
+    """
+    op = request.get("op")
+    if op == "add":
+        description = request.get("description")
+        if not validate_task_description(description):
+            return error("Задача не может быть пустой"), None
+        return None, {"op": "add", "description": description.strip()}
+
+    index = resolve_index(tasks, request)
+    if index is None:
+        return error("Неверный номер задачи"), None
+    return None, {"op": op, "id": get_task_by_index(tasks, index)["id"]}
+
+
+def change_response(record):
+    """
+    Ответ на изменение по применённой записи журнала.
+
+    Аргументы:
+        record: Применённая запись (у добавления - с ID) или None
+
+    Возвращает:
+        dict: Ответ
+    """
+    if record is None:
+        return error("Задача уже удалена")
+    if record["op"] == "add":
+        return {"ok": True, "id": record["id"]}
+    return {"ok": True}
+
+
+def handle_request(tasks, request, search_index=None):
+    """
+    Выполняет один запрос над списком задач.
+
+    Изменения сразу применяются к списку в памяти; для сохранения
+    возвращается запись журнала по ID задачи.
+
+    Аргументы:
+        tasks: TaskList
+        request: Словарь запроса (см. протокол в начале модуля)
+        search_index: TaskSearchIndex, который нужно обновлять при
+            изменениях (обязателен для "search")
+
+    Возвращает:
+        tuple: (ответ - словарь, запись журнала или None)
+    """
+    if not isinstance(request, dict):
+        return error("Запрос должен быть JSON объектом"), None
+    op = request.get("op")
+
+    if op in CHANGE_OPS:
+        response, record = prepare_change(tasks, request)
+        if record is None:
+            return response, None
+        apply_journal_record(tasks, record, search_index)
+        if op == "add":
+            record = dict(record, id=tasks[-1]["id"])
+        return change_response(record), record
+
+    if op == "get":
+        index = resolve_index(tasks, request)
+        if index is None:
+            return error("Неверный номер задачи"), None
+        return {"ok": True, "task": task_to_json(get_task_by_index(tasks, index))}, None
+
+    if op == "list":
+        offset = request.get("offset", 0)
+        limit = request.get("limit", PAGE_SIZE)
+        if not isinstance(offset, int) or not isinstance(limit, int) or offset < 0 or limit < 0:
+            return error("offset и limit должны быть неотрицательными числами"), None
+        end = min(len(tasks), offset + limit)
+        page = [task_to_json(tasks[i]) for i in range(offset, end)]
+        return {"ok": True, "total": len(tasks), "tasks": page}, None
+
+    if op == "count":
+        return {"ok": True, "count": len(tasks)}, None
+
+    if op == "search":
+        query = request.get("query")
+        if not isinstance(query, str) or search_index is None:
+            return error("Нужна строка запроса query"), None
+        results = [
+            {"number": number, "task": task_to_json(task)}
+            for number, task in search_tasks(tasks, search_index, query)
+        ]
+        return {"ok": True, "results": results}, None
+
+    return error(f"Неизвестная операция: {op}"), None
+
+
+class TaskServer:
+    """
+    Держит список задач в памяти и обслуживает клиентов.
+
+    Запросы выполняются в потоке цикла событий, а пачка изменений
+    сохраняется в отдельном потоке. Пока она сохраняется, список
+    меняется в том потоке, поэтому запросы ждут её на self.lock.
+    """
+
+    def __init__(self, filename, flush_interval=FLUSH_INTERVAL):
+        """
+        Аргументы:
+            filename: Путь к JSON файлу задач
+            flush_interval: Как часто сохранять изменения и проверять
+                чужие (секунды)
+        """
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.shared = SharedTaskFile(filename)
+        self.synced_at = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.pending = []
+        self.flush_task = None
+        self.requests = 0
+
+    @property
+    def tasks(self):
+        """Текущий TaskList (после перезагрузки файла - новый объект)."""
+        return self.shared.tasks
+
+    async def sync(self):
+        """
+        Догоняет чужие изменения файла не чаще раза в flush_interval
+        (вызывать под self.lock).
+        """
+        if time.monotonic() - self.synced_at < self.flush_interval:
+            return
+        await asyncio.to_thread(self.shared.refresh)
+        self.synced_at = time.monotonic()
+
+    async def handle(self, request):
+        """
+        Выполняет запрос; изменение ставится в очередь на сохранение.
+
+        Аргументы:
+            request: Словарь запроса
+
+        Возвращает:
+            dict: Ответ (на изменение - когда оно сохранено)
+        """
+        self.requests += 1
+        async with self.lock:
+            await self.sync()
+            if not isinstance(request, dict) or request.get("op") not in CHANGE_OPS:
+                search_index = None
+                if isinstance(request, dict) and request.get("op") == "search":
+                    search_index = self.shared.get_search_index()
+                return handle_request(self.tasks, request, search_index)[0]
+            response, record = prepare_change(self.tasks, request)
+            if record is None:
+                return response
+
+        saved = asyncio.get_running_loop().create_future()
+        self.pending.append((record, saved))
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_later())
+        return await saved
+
+    async def flush_later(self):
+        """Ждёт flush_interval, собирая изменения в пачку, и сохраняет её."""
+        await asyncio.sleep(self.flush_interval)
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        """
+        Сохраняет накопленные изменения одной записью журнала.
+
+        В потоке под блокировкой файла: догнать чужие изменения,
+        применить пачку, дописать её в журнал. Ожидающие клиенты
+        получают ответы по результату; если пачку не удалось записать
+        (commit_many поднимает OSError), каждый получает ошибку, а не
+        {"ok": true}.
+
+        Возвращает:
+            bool: True если успешно (или нечего сохранять)
+        """
+        async with self.lock:
+            if not self.pending:
+                return True
+            batch, self.pending = self.pending, []
+            try:
+                applied = await asyncio.to_thread(
+                    self.shared.commit_many, [record for record, _ in batch]
+                )
+            except OSError as exc:
+                responses = [error(f"Не удалось сохранить: {exc}")] * len(batch)
+                ok = False
+            else:
+                responses = [change_response(record) for record in applied]
+                ok = True
+            self.synced_at = time.monotonic()
+            for (_, saved), response in zip(batch, responses):
+                # Клиент мог уже отключиться, и его ожидание отменено
+                if not saved.done():
+                    saved.set_result(response)
+            return ok
+
+    async def close(self):
+        """
+        Сохраняет всё несохранённое и сворачивает журнал.
+
+        Возвращает:
+            bool: True если успешно, False в противном случае
+        """
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        ok = await self.flush()
+        async with self.lock:
+            return await asyncio.to_thread(self.shared.close) and ok
+
+    async def serve_client(self, reader, writer):
+        """Обслуживает одно соединение: строка запроса -> строка ответа."""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(encode_response(error("Слишком длинный запрос")))
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = error("Запрос не является JSON")
+                else:
+                    response = await self.handle(request)
+                writer.write(encode_response(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, socket_path):
+        """
+        Открывает Unix сокет и начинает принимать соединения.
+
+        Аргументы:
+            socket_path: Путь к файлу сокета
+
+        Возвращает:
+            asyncio.Server: Запущенный сервер
+        """
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return await asyncio.start_unix_server(
+            self.serve_client, socket_path, limit=MAX_REQUEST_BYTES, backlog=BACKLOG
+        )
+
+
+async def run_server(filename, socket_path):
+    """Запускает сервер и работает, пока процесс не остановят."""
+    server = TaskServer(filename)
+    listener = await server.start(socket_path)
+    print(f"Задач: {len(server.tasks)}. Сервер слушает {socket_path}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Сервер задач на Unix сокете")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="путь к сокету")
+    parser.add_argument("--tasks", default="tasks.json", help="файл задач")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args.tasks, args.socket))
+    except KeyboardInterrupt:
+        print("\nСервер остановлен, задачи сохранены.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
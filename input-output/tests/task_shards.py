@@ -0,0 +1,383 @@
+"""
+Хранение задач в нескольких файлах (шардах)
+
+Один tasks.json на сотни тысяч задач приходится целиком разбирать
+при загрузке и целиком переписывать при каждом сохранении.
+Шардированное хранилище - это папка:
+
+    tasks.d/
+        manifest.json                  список шардов
+        shard-000000-1a2b3c4d.json     задачи с ID 1 ... 10000
+        shard-000001-5e6f7a8b.json     задачи с ID 10001 ... 20000
+        ...
+
+Задачи раскладываются по шардам по диапазонам ID, поэтому изменение
+задачи трогает только её шард. TaskList, загруженный из папки,
+запоминает ID изменённых задач, и сохранение сериализует только их
+шарды. Для обычного списка сериализуются все шарды, но по контрольной
+сумме в имени шарда видно, какие не изменились: они не перезаписываются.
+Сохранение атомарное: новые шарды пишутся под новыми именами,
+затем подменяется manifest.json, и только потом удаляются старые.
+
+Шарды загружаются параллельно в ThreadPoolExecutor. Чтение файлов
+при этом идёт одновременно, а разбор JSON держит GIL, так что
+выигрыш в основном на медленных дисках.
+
+load_tasks_from_file и save_tasks_to_file принимают и файл, и папку.
+Задачи без ID получают ID при сохранении; порядок задач - по ID.
+
+Разделить файл на шарды и собрать обратно:
+    python task_shards.py split tasks.json tasks.d
+    python task_shards.py join tasks.d tasks.json
+Сравнить с одним файлом:
+    python task_shards.py bench 300000
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "task-shards"
+MANIFEST_VERSION = 1
+DEFAULT_SHARD_SIZE = 10_000
+LOAD_WORKERS = 8
+
+
+def is_shard_directory(path):
+    """
+    Проверяет, что путь - папка с шардами, а не обычный файл задач.
+
+    Аргументы:
+        path: Путь к файлу или папке задач
+
+    Возвращает:
+        bool: True для папки
+    """
+    return os.path.isdir(path)
+
+
+def read_manifest(directory):
+    """
+    Читает manifest.json шардированного хранилища.
+
+    Аргументы:
+        directory: Папка с шардами
+
+    Возвращает:
+        dict or None: Манифест, или None если его нет или он не наш
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("format") != MANIFEST_FORMAT:
+        return None
+    return manifest
+
+
+def read_shard(path):
+    """
+    Читает один шард.
+
+    Аргументы:
+        path: Путь к файлу шарда
+
+    Возвращает:
+        list: Задачи шарда
+
+    Исключения:
+        OSError, json.JSONDecodeError: Если шард не читается
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tasks = json.load(file)
+    if not isinstance(tasks, list):
+        raise json.JSONDecodeError("Шард должен быть списком задач", "", 0)
+    return tasks
+
+
+def load_shards(directory, max_workers=LOAD_WORKERS):
+    """
+    Загружает задачи из всех шардов параллельно.
+
+    Аргументы:
+        directory: Папка с шардами
+        max_workers: Сколько шардов читать одновременно
+
+    Возвращает:
+        list: Список словарей задач в порядке ID (пустой, если
+        манифеста нет)
+
+    Исключения:
+        OSError, json.JSONDecodeError: Если шард из манифеста пропал
+            или повреждён. Это не пустой список: иначе следующее
+            сохранение переписало бы манифест и удалило все шарды
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return []
+    paths = [os.path.join(directory, shard["file"]) for shard in manifest["shards"]]
+    tasks = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for shard_tasks in pool.map(read_shard, paths):
+            tasks.extend(shard_tasks)
+    return tasks
+
+
+def group_by_shard(tasks, shard_size):
+    """
+    Раскладывает задачи по шардам по диапазонам ID.
+
+    Задачам без ID выдаются новые ID после самого большого
+    (словари вызывающего кода не изменяются).
+
+    Аргументы:
+        tasks: TaskList или список словарей задач
+        shard_size: Сколько ID в одном шарде
+
+    Возвращает:
+        dict: Номер шарда -> список словарей задач
+    """
+    tasks = tasks.to_dicts() if hasattr(tasks, "to_dicts") else list(tasks)
+    next_id = 1 + max(
+        (task["id"] for task in tasks if isinstance(task.get("id"), int)), default=0
+    )
+    shards = {}
+    for task in tasks:
+        task_id = task.get("id")
+        if not isinstance(task_id, int):
+            task = dict(task, id=next_id)
+            task_id = next_id
+            next_id += 1
+        shards.setdefault((task_id - 1) // shard_size, []).append(task)
+    for shard_tasks in shards.values():
+        shard_tasks.sort(key=lambda task: task["id"])
+    return shards
+
+
+def write_shard(directory, number, shard_tasks, shard_size):
+    """
+    Записывает один шард, если шарда с таким содержимым ещё нет.
+
+    Аргументы:
+        directory: Папка с шардами
+        number: Номер шарда
+        shard_tasks: Задачи шарда в порядке ID
+        shard_size: Сколько ID в одном шарде
+
+    Возвращает:
+        tuple: (запись манифеста, True если файл записан)
+    """
+    # Компактный JSON пишется C-кодировщиком: это быстро, а по
+    # контрольной сумме видно, изменился ли шард
+    data = json.dumps(shard_tasks, ensure_ascii=False).encode("utf-8")
+    checksum = zlib.crc32(data)
+    name = f"shard-{number:06d}-{checksum:08x}.json"
+    path = os.path.join(directory, name)
+    written = not os.path.exists(path)
+    if written:
+        with open(path + ".tmp", "wb") as file:
+            file.write(data)
+        os.replace(path + ".tmp", path)
+    entry = {"file": name, "first_id": number * shard_size + 1, "count": len(shard_tasks)}
+    return entry, written
+
+
+def write_changed_shards(directory, tasks, manifest, changed):
+    """
+    Переписывает только шарды, в которых есть изменённые задачи.
+
+    Аргументы:
+        directory: Папка с шардами
+        tasks: TaskList, загруженный из этой папки
+        manifest: Текущий манифест папки
+        changed: ID добавленных, изменённых и удалённых задач
+
+    Возвращает:
+        tuple: (записи манифеста по порядку, сколько шардов записано)
+    """
+    shard_size = manifest["shard_size"]
+    entries = {(entry["first_id"] - 1) // shard_size: entry for entry in manifest["shards"]}
+    written = 0
+    for number in sorted({(task_id - 1) // shard_size for task_id in changed}):
+        first_id = number * shard_size + 1
+        shard_tasks = []
+        for task_id in range(first_id, first_id + shard_size):
+            task = tasks.get_by_id(task_id)
+            if task is not None:
+                shard_tasks.append(task.to_dict())
+        # Шард, из которого удалили все задачи, пропадает из манифеста
+        entries.pop(number, None)
+        if shard_tasks:
+            entries[number], was_written = write_shard(directory, number, shard_tasks, shard_size)
+            written += was_written
+    return [entries[number] for number in sorted(entries)], written
+
+
+def get_manifest_filename(directory):
+    """Путь к manifest.json папки с шардами."""
+    return os.path.join(directory, MANIFEST_NAME)
+
+
+def save_shards(directory, tasks, shard_size=None, before_commit=None):
+    """
+    Сохраняет задачи в шарды, переписывая только изменившиеся.
+
+    Если tasks отслеживает изменения (TaskList из load_tasks_fast),
+    сериализуются только шарды изменённых задач; иначе сериализуются
+    все, а записываются те, чья контрольная сумма изменилась.
+
+    Аргументы:
+        directory: Папка с шардами (создаётся при необходимости)
+        tasks: TaskList или список словарей задач
+        shard_size: Сколько ID в одном шарде (по умолчанию как в
+            манифесте или DEFAULT_SHARD_SIZE)
+        before_commit: Вызывается, когда шарды и manifest.json.tmp уже
+            записаны, прямо перед подменой манифеста
+
+    Возвращает:
+        int: Сколько шардов записано (-1 при ошибке)
+    """
+    manifest = read_manifest(directory)
+    if shard_size is None:
+        shard_size = manifest["shard_size"] if manifest else DEFAULT_SHARD_SIZE
+    changed = tasks.changed_ids() if hasattr(tasks, "changed_ids") else None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if changed is not None and manifest is not None and manifest["shard_size"] == shard_size:
+            entries, written = write_changed_shards(directory, tasks, manifest, changed)
+        else:
+            entries = []
+            written = 0
+            for number, shard_tasks in sorted(group_by_shard(tasks, shard_size).items()):
+                entry, was_written = write_shard(directory, number, shard_tasks, shard_size)
+                entries.append(entry)
+                written += was_written
+
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "shard_size": shard_size,
+            "shards": entries,
+        }
+        manifest_path = get_manifest_filename(directory)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        if before_commit is not None:
+            before_commit()
+        os.replace(manifest_path + ".tmp", manifest_path)
+    except OSError:
+        return -1
+    if changed is not None:
+        tasks.clear_changes()
+
+    # Старые шарды удаляются только после подмены манифеста
+    keep = {entry["file"] for entry in entries}
+    for name in os.listdir(directory):
+        if name.startswith("shard-") and name.endswith(".json") and name not in keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+    return written
+
+
+# ============================================================
+# КОНВЕРТАЦИЯ И СРАВНЕНИЕ
+# ============================================================
+
+def split_file(filename, directory, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Раскладывает tasks.json (с журналом) по шардам в папке.
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    from task_manager_testable import load_tasks_streaming
+
+    return save_shards(directory, load_tasks_streaming(filename), shard_size) >= 0
+
+
+def join_shards(directory, filename):
+    """
+    Собирает шарды (с журналом) обратно в один tasks.json.
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    from task_manager_testable import load_tasks_from_file, save_tasks_to_file
+
+    return save_tasks_to_file(filename, load_tasks_from_file(directory))
+
+
+def benchmark_shards(count, directory):
+    """
+    Сравнивает один файл и шарды: загрузку и сохранение одного изменения.
+
+    Аргументы:
+        count: Количество задач
+        directory: Папка для временных файлов
+
+    Возвращает:
+        dict: Миллисекунды для каждой операции
+    """
+    from task_manager_testable import (
+        complete_task,
+        load_tasks_fast,
+        load_tasks_from_file,
+        save_tasks_to_file,
+    )
+
+    tasks = [{"id": i + 1, "description": f"Задача номер {i}", "completed": False}
+             for i in range(count)]
+    single = os.path.join(directory, f"tasks_{count}.json")
+    sharded = os.path.join(directory, f"tasks_{count}.d")
+    save_tasks_to_file(single, tasks)
+    save_shards(sharded, tasks)
+
+    def measure(action):
+        start = time.perf_counter()
+        action()
+        return (time.perf_counter() - start) * 1000
+
+    results = {}
+    loaded = []
+    results["load file"] = measure(lambda: loaded.append(load_tasks_from_file(single)))
+    results["load shards, 1 thread"] = measure(lambda: load_shards(sharded, max_workers=1))
+    results[f"load shards, {LOAD_WORKERS} threads"] = measure(lambda: load_shards(sharded))
+    file_tasks = loaded[0]
+    # Как в менеджере задач: TaskList из папки отслеживает изменения
+    shard_tasks = load_tasks_fast(sharded)
+    complete_task(file_tasks, count // 2)
+    complete_task(shard_tasks, count // 2)
+    results["save change, file"] = measure(lambda: save_tasks_to_file(single, file_tasks))
+    results["save change, shards"] = measure(lambda: save_tasks_to_file(sharded, shard_tasks))
+    return results
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "split" and len(sys.argv) in (4, 5):
+        size = int(sys.argv[4]) if len(sys.argv) == 5 else DEFAULT_SHARD_SIZE
+        print("Готово." if split_file(sys.argv[2], sys.argv[3], size) else "Ошибка.")
+    elif command == "join" and len(sys.argv) == 4:
+        print("Готово." if join_shards(sys.argv[2], sys.argv[3]) else "Ошибка.")
+    elif command == "bench":
+        with tempfile.TemporaryDirectory() as workdir:
+            for size in [int(size) for size in sys.argv[2:]] or [300_000]:
+                print(f"\n{size} задач (мс):")
+                for operation, milliseconds in benchmark_shards(size, workdir).items():
+                    print(f"  {operation:<28}{milliseconds:>10.1f}")
+    else:
+        print("Использование:")
+        print("  python task_shards.py split tasks.json tasks.d [размер шарда]")
+        print("  python task_shards.py join tasks.d tasks.json")
+        print("  python task_shards.py bench [размеры...]")
+        sys.exit(2)
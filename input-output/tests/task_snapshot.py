@@ -0,0 +1,313 @@
+"""
+Бинарный снимок списка задач
+
+Разбор большого tasks.json при каждом запуске занимает секунды.
+Бинарный снимок хранит те же задачи в виде, который не нужно
+разбирать: файл отображается в память (mmap), а описания
+декодируются только когда к ним обращаются.
+
+Формат файла (все числа little-endian):
+    заголовок    magic "TSNP", версия, число задач, следующий ID,
+                 размер и mtime_ns tasks.json, из которого сделан снимок
+    ID задач     count * int64
+    смещения     (count + 1) * uint64 - границы описаний в блоке текста
+    флаги        completed, упакованные по биту на задачу
+    текст        описания в UTF-8 подряд
+    CRC-32       всего, что до него (uint32 и 4 байта выравнивания)
+
+Снимок лежит рядом с JSON файлом (tasks.json.bin) и считается
+актуальным, только пока размер и mtime_ns tasks.json совпадают
+с записанными в заголовке. Повреждённый снимок (не сходится CRC-32)
+тоже пропускается: задачи читаются из JSON.
+
+Конвертация:
+    python task_snapshot.py to-bin tasks.json tasks.json.bin
+    python task_snapshot.py to-json tasks.json.bin tasks.json
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from task_list import TaskList, DONE, OPEN
+
+
+SNAPSHOT_SUFFIX = ".bin"
+MAGIC = b"TSNP"
+VERSION = 2
+HEADER = struct.Struct("<4sHxxQqqq")
+CHECKSUM = struct.Struct("<I4x")
+
+# Распаковка байта флагов в 8 байт состояний и обратно (младший бит - первая задача)
+UNPACK_BITS = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+PACK_BITS = {bits: byte for byte, bits in enumerate(UNPACK_BITS)}
+
+
+def get_snapshot_filename(filename):
+    """
+    Возвращает путь к бинарному снимку для файла задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу
+
+    Возвращает:
+        str: Путь к снимку (например, "tasks.json.bin")
+    """
+    return filename + SNAPSHOT_SUFFIX
+
+
+def pack_states(states):
+    """
+    Упаковывает состояния задач (по байту) в битовую карту.
+
+    Аргументы:
+        states: bytes/bytearray из значений OPEN и DONE
+
+    Возвращает:
+        bytes: По биту на задачу
+    """
+    padded = bytes(states) + bytes(-len(states) % 8)
+    return bytes(PACK_BITS[padded[i:i + 8]] for i in range(0, len(padded), 8))
+
+
+def unpack_states(bitmap, count):
+    """
+    Распаковывает битовую карту в bytearray состояний.
+
+    Аргументы:
+        bitmap: Битовая карта из снимка
+        count: Количество задач
+
+    Возвращает:
+        bytearray: По байту OPEN/DONE на задачу
+    """
+    states = bytearray(b"".join(map(UNPACK_BITS.__getitem__, bitmap)))
+    del states[count:]
+    return states
+
+
+class MappedDescriptions:
+    """
+    Описания задач, которые декодируются из снимка по требованию.
+
+    Подставляется в TaskList вместо обычного списка строк.
+    Изменённые описания хранятся поверх снимка, новые - в хвосте.
+    """
+
+    def __init__(self, buffer, offsets, text_start, count):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.text_start = text_start
+        self.count = count
+        self.changed = {}
+        self.tail = []
+
+    def __len__(self):
+        return self.count + len(self.tail)
+
+    def __getitem__(self, slot):
+        if slot >= self.count:
+            return self.tail[slot - self.count]
+        if slot in self.changed:
+            return self.changed[slot]
+        start = self.text_start + self.offsets[slot]
+        end = self.text_start + self.offsets[slot + 1]
+        return str(self.buffer[start:end], "utf-8")
+
+    def __setitem__(self, slot, description):
+        if slot >= self.count:
+            self.tail[slot - self.count] = description
+        else:
+            self.changed[slot] = description
+
+    def __iter__(self):
+        for slot in range(len(self)):
+            yield self[slot]
+
+    def append(self, description):
+        self.tail.append(description)
+
+
+def write_snapshot(filename, tasks, source_stat=None):
+    """
+    Записывает задачи в бинарный снимок.
+
+    Аргументы:
+        filename: Путь к файлу снимка
+        tasks: TaskList или список словарей задач
+        source_stat: os.stat_result JSON файла, из которого сделан снимок
+            (None - снимок не привязан к JSON файлу)
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    ids = array("q")
+    offsets = array("Q", [0])
+    states = bytearray()
+    blobs = []
+    next_id = 1
+    for task in tasks:
+        task_id = task.get("id")
+        if not isinstance(task_id, int):
+            task_id = next_id
+        next_id = max(next_id, task_id + 1)
+        ids.append(task_id)
+        blob = task["description"].encode("utf-8")
+        blobs.append(blob)
+        offsets.append(offsets[-1] + len(blob))
+        states.append(DONE if task.get("completed") else OPEN)
+
+    source_size, source_mtime = (-1, -1) if source_stat is None else (
+        source_stat.st_size, source_stat.st_mtime_ns
+    )
+    header = HEADER.pack(MAGIC, VERSION, len(ids), next_id, source_size, source_mtime)
+    if sys.byteorder != "little":
+        ids.byteswap()
+        offsets.byteswap()
+
+    checksum = 0
+    parts = [header, ids.tobytes(), offsets.tobytes(), pack_states(states), b"".join(blobs)]
+    for part in parts:
+        checksum = zlib.crc32(part, checksum)
+    try:
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, "wb") as file:
+            file.writelines(parts)
+            file.write(CHECKSUM.pack(checksum))
+        os.replace(temp_filename, filename)
+        return True
+    except OSError:
+        return False
+
+
+def load_snapshot(filename, source_stat=None):
+    """
+    Открывает бинарный снимок как TaskList с ленивыми описаниями.
+
+    Файл отображается в память: ID и флаги копируются одним блоком,
+    а описания декодируются при обращении к задаче. Отображение
+    живёт, пока жив список, а при промахе закрывается сразу.
+
+    Перед загрузкой сверяется CRC-32 всего файла: иначе испорченная
+    таблица смещений всплыла бы ошибкой UnicodeDecodeError уже при
+    выводе задач, когда вернуться к JSON поздно.
+
+    Аргументы:
+        filename: Путь к файлу снимка
+        source_stat: os.stat_result JSON файла; если задан, снимок
+            должен быть сделан именно из этой версии JSON
+
+    Возвращает:
+        TaskList or None: Задачи, или None если снимка нет,
+        он повреждён или устарел
+    """
+    try:
+        with open(filename, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    tasks = read_snapshot(buffer, source_stat)
+    if tasks is None:
+        buffer.close()
+    return tasks
+
+
+def read_snapshot(buffer, source_stat):
+    """
+    Разбирает отображённый в память снимок (см. load_snapshot).
+
+    Возвращает:
+        TaskList or None: Задачи, или None если снимок повреждён или устарел
+    """
+    if len(buffer) < HEADER.size + CHECKSUM.size:
+        return None
+    magic, version, count, next_id, source_size, source_mtime = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if source_stat is not None and (source_size, source_mtime) != (
+        source_stat.st_size, source_stat.st_mtime_ns
+    ):
+        return None
+
+    ids_start = HEADER.size
+    offsets_start = ids_start + 8 * count
+    bitmap_start = offsets_start + 8 * (count + 1)
+    text_start = bitmap_start + (count + 7) // 8
+    text_end = len(buffer) - CHECKSUM.size
+    if text_end < text_start:
+        return None
+    (checksum,) = CHECKSUM.unpack_from(buffer, text_end)
+    # memoryview не копирует файл, но его нужно отпустить до закрытия mmap
+    with memoryview(buffer) as view:
+        if zlib.crc32(view[:text_end]) != checksum:
+            return None
+
+    ids = array("q")
+    ids.frombytes(buffer[ids_start:offsets_start])
+    offsets = array("Q")
+    offsets.frombytes(buffer[offsets_start:bitmap_start])
+    if sys.byteorder != "little":
+        ids.byteswap()
+        offsets.byteswap()
+    if text_start + offsets[-1] != text_end:
+        return None
+    states = unpack_states(buffer[bitmap_start:text_start], count)
+
+    descriptions = MappedDescriptions(buffer, offsets, text_start, count)
+    return TaskList.from_columns(ids, descriptions, states, next_id)
+
+
+# ============================================================
+# КОНВЕРТАЦИЯ JSON <-> СНИМОК
+# ============================================================
+
+def json_to_snapshot(json_filename, snapshot_filename):
+    """
+    Делает бинарный снимок из JSON файла задач (с учётом журнала).
+
+    Аргументы:
+        json_filename: Путь к tasks.json
+        snapshot_filename: Путь к файлу снимка
+
+    Возвращает:
+        bool: True если успешно, False в противном случае
+    """
+    from task_manager_testable import load_tasks_streaming
+
+    return write_snapshot(snapshot_filename, load_tasks_streaming(json_filename))
+
+
+def snapshot_to_json(snapshot_filename, json_filename):
+    """
+    Сохраняет задачи из бинарного снимка обратно в JSON.
+
+    Аргументы:
+        snapshot_filename: Путь к файлу снимка
+        json_filename: Путь к tasks.json
+
+    Возвращает:
+        bool: True если успешно, False если снимок не читается
+    """
+    from task_manager_testable import save_tasks_to_file
+
+    tasks = load_snapshot(snapshot_filename)
+    if tasks is None:
+        return False
+    return save_tasks_to_file(json_filename, tasks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "to-bin":
+        ok = json_to_snapshot(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 4 and sys.argv[1] == "to-json":
+        ok = snapshot_to_json(sys.argv[2], sys.argv[3])
+    else:
+        print("Использование:")
+        print("  python task_snapshot.py to-bin tasks.json tasks.json.bin")
+        print("  python task_snapshot.py to-json tasks.json.bin tasks.json")
+        sys.exit(2)
+    print("Готово." if ok else "Ошибка конвертации.")
@@ -0,0 +1,513 @@
+"""
+Хранилище задач в SQLite
+
+JSON файл приходится читать целиком перед любой операцией и
+переписывать целиком после любого изменения. SQLite (модуль sqlite3
+из стандартной библиотеки, без отдельного сервера) хранит задачи
+в таблице, поэтому:
+- изменение одной задачи трогает одну строку, а не весь файл
+- выборка страницы или задачи по номеру идёт по индексу
+
+Те же операции, что и у чистых функций менеджера задач:
+добавить, получить по номеру, выполнить, удалить, показать список.
+Номер задачи переводится в её ID через список ID в памяти, поэтому
+операция по номеру - это одна строка по первичному ключу, а не
+OFFSET с перебором всех строк перед ней.
+
+Менеджер задач работает с базой вместо tasks.json так (при первом
+запуске задачи из tasks.json переносятся в базу):
+    python task_manager_testable.py --sqlite tasks.db
+
+Перенести существующий tasks.json в базу:
+    python task_store_sqlite.py migrate tasks.json tasks.db
+
+Сравнить с JSON на 10k, 100k и 1M задач:
+    python task_store_sqlite.py bench 10000 100000 1000000
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+
+from task_manager_testable import (
+    validate_task_description,
+    complete_task,
+    delete_task,
+    get_task_by_index,
+    load_tasks_from_file,
+    load_tasks_streaming,
+    save_tasks_to_file,
+)
+from task_search import TaskSearchIndex
+
+
+# id - это rowid таблицы: по нему строки и лежат на диске,
+# так что он же служит индексом порядка вставки.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    description TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_by_completed ON tasks (completed, id);
+"""
+
+
+def row_to_task(row):
+    """
+    Превращает строку таблицы в словарь задачи.
+
+    Аргументы:
+        row: Кортеж (id, description, completed)
+
+    Возвращает:
+        dict: Словарь задачи
+    """
+    task_id, description, completed = row
+    return {"id": task_id, "description": description, "completed": completed == 1}
+
+
+class SqliteTaskStore:
+    """
+    Задачи в базе SQLite.
+
+    Каждая операция сразу фиксируется на диске. База работает в
+    режиме WAL: запись одной задачи дописывает несколько страниц
+    в журнал, а читатели не блокируются писателями.
+
+    Снаружи хранилище ведёт себя как список задач (len(), индексация,
+    итерация, get_by_id, position_of), поэтому его принимают
+    display_tasks, get_task_by_index и search_tasks. Методы commit,
+    refresh, get_search_index и close повторяют SharedTaskFile, так
+    что main() менеджера задач работает с ним без изменений.
+    """
+
+    def __init__(self, filename):
+        """
+        Аргументы:
+            filename: Путь к файлу базы (создаётся при необходимости)
+        """
+        self.filename = filename
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # ID задач по порядку; строится при первом обращении по номеру
+        self._ids = None
+        self._data_version = None
+        self.search_index = None
+
+    def _task_ids(self):
+        """
+        Возвращает ID задач по порядку (array), строя его при первом вызове.
+
+        Свои изменения хранилище вносит в список само, а изменения
+        других соединений видны по PRAGMA data_version: тогда список
+        строится заново.
+        """
+        version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if self._ids is None or version != self._data_version:
+            self._ids = array("q", (row[0] for row in self.connection.execute(
+                "SELECT id FROM tasks ORDER BY id"
+            )))
+            self._data_version = version
+            self.search_index = None
+        return self._ids
+
+    def _task_id_at(self, index):
+        """ID задачи по номеру (начиная с 1) или None если номер невалиден."""
+        if not isinstance(index, int) or index < 1:
+            return None
+        ids = self._task_ids()
+        return ids[index - 1] if index <= len(ids) else None
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    def count_tasks(self, completed=None):
+        """
+        Считает задачи.
+
+        Аргументы:
+            completed: True/False - считать только выполненные/невыполненные,
+                None - считать все
+
+        Возвращает:
+            int: Количество задач
+        """
+        if completed is None:
+            query, params = "SELECT COUNT(*) FROM tasks", ()
+        else:
+            query, params = "SELECT COUNT(*) FROM tasks WHERE completed = ?", (int(completed),)
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def __len__(self):
+        return len(self._task_ids())
+
+    def __getitem__(self, index):
+        ids = self._task_ids()
+        return self.get_by_id(ids[index])
+
+    def __iter__(self):
+        return self.iter_tasks()
+
+    @property
+    def tasks(self):
+        """Список задач для main(): само хранилище, как SharedTaskFile.tasks."""
+        return self
+
+    def add_task(self, description):
+        """
+        Добавляет задачу, если она валидна.
+
+        Аргументы:
+            description: Строка с описанием задачи
+
+        Возвращает:
+            bool: True если добавлена, False если невалидна
+        """
+        if not validate_task_description(description):
+            return False
+        ids = self._task_ids()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO tasks (description) VALUES (?)", (description.strip(),)
+            )
+        # AUTOINCREMENT выдаёт ID больше всех прежних: список остаётся упорядоченным
+        ids.append(cursor.lastrowid)
+        return True
+
+    def add_tasks(self, tasks):
+        """
+        Добавляет пачку задач одной транзакцией.
+
+        Аргументы:
+            tasks: Итерируемый набор словарей задач. Если в задаче
+                есть "id", он сохраняется.
+
+        Возвращает:
+            int: Количество добавленных задач
+        """
+        rows = (
+            (task.get("id"), task["description"], 1 if task.get("completed") else 0)
+            for task in tasks
+        )
+        with self.connection:
+            cursor = self.connection.executemany(
+                "INSERT INTO tasks (id, description, completed) VALUES (?, ?, ?)", rows
+            )
+        # Явные ID могли лечь в середину списка: он построится заново
+        self._ids = None
+        return cursor.rowcount
+
+    def get_task_by_index(self, index):
+        """
+        Получает задачу по её номеру (начиная с 1).
+
+        Аргументы:
+            index: Номер начиная с 1
+
+        Возвращает:
+            dict or None: Словарь задачи или None если номер невалиден
+        """
+        task_id = self._task_id_at(index)
+        return None if task_id is None else self.get_by_id(task_id)
+
+    def get_by_id(self, task_id):
+        """
+        Получает задачу по стабильному ID (первичный ключ).
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            dict or None: Словарь задачи или None если такого ID нет
+        """
+        row = self.connection.execute(
+            "SELECT id, description, completed FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return None if row is None else row_to_task(row)
+
+    def position_of(self, task_id):
+        """
+        Возвращает номер задачи (начиная с 1) по её ID.
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            int or None: Номер или None если такого ID нет
+        """
+        ids = self._task_ids()
+        position = bisect_left(ids, task_id)
+        if position < len(ids) and ids[position] == task_id:
+            return position + 1
+        return None
+
+    def complete_task(self, index):
+        """
+        Отмечает задачу как выполненную (обновляется одна строка).
+
+        Аргументы:
+            index: Номер начиная с 1
+
+        Возвращает:
+            bool: True если успешно, False если номер невалиден
+        """
+        task_id = self._task_id_at(index)
+        return task_id is not None and self.complete_task_by_id(task_id)
+
+    def complete_task_by_id(self, task_id):
+        """
+        Отмечает задачу с данным ID как выполненную.
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            bool: True если успешно, False если такого ID нет
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET completed = 1 WHERE id = ?", (task_id,)
+            )
+        return cursor.rowcount == 1
+
+    def delete_task(self, index):
+        """
+        Удаляет задачу (удаляется одна строка, остальные не сдвигаются).
+
+        Аргументы:
+            index: Номер начиная с 1
+
+        Возвращает:
+            bool: True если удалена, False если номер невалиден
+        """
+        task_id = self._task_id_at(index)
+        return task_id is not None and self.delete_task_by_id(task_id)
+
+    def delete_task_by_id(self, task_id):
+        """
+        Удаляет задачу с данным ID.
+
+        Аргументы:
+            task_id: ID задачи
+
+        Возвращает:
+            bool: True если удалена, False если такого ID нет
+        """
+        task = self.get_by_id(task_id) if self.search_index is not None else None
+        ids = self._task_ids()
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        if cursor.rowcount != 1:
+            return False
+        del ids[bisect_left(ids, task_id)]
+        if task is not None:
+            self.search_index.remove(task_id, task["description"])
+        return True
+
+    # ----- Те же методы, что у SharedTaskFile (для main()) -----
+
+    def commit(self, record):
+        """
+        Применяет запись в формате журнала (add, complete, delete).
+
+        Аргументы:
+            record: Например {"op": "add", "description": "..."}
+                или {"op": "delete", "id": 7}
+
+        Возвращает:
+            bool: True если изменение применено и сохранено
+        """
+        if not isinstance(record, dict):
+            return False
+        op = record.get("op")
+        task_id = record.get("id")
+        if op == "add" and task_id is None:
+            if not self.add_task(record.get("description")):
+                return False
+            if self.search_index is not None:
+                new_id = self._ids[-1]
+                self.search_index.add(new_id, self.get_by_id(new_id)["description"])
+            return True
+        if op == "complete":
+            if task_id is not None:
+                return self.complete_task_by_id(task_id)
+            return self.complete_task(record.get("index"))
+        if op == "delete":
+            if task_id is not None:
+                return self.delete_task_by_id(task_id)
+            task_id = self._task_id_at(record.get("index"))
+            return task_id is not None and self.delete_task_by_id(task_id)
+        return False
+
+    def refresh(self):
+        """
+        Подтягивает изменения других процессов, если они были.
+
+        Возвращает:
+            bool: True если база изменилась с прошлого обращения
+        """
+        version = self._data_version
+        self._task_ids()
+        return version is not None and version != self._data_version
+
+    def get_search_index(self):
+        """
+        Возвращает поисковый индекс, строя его при первом обращении.
+
+        Возвращает:
+            TaskSearchIndex: Индекс задач базы
+        """
+        self._task_ids()
+        if self.search_index is None:
+            self.search_index = TaskSearchIndex.build(self.iter_tasks())
+        return self.search_index
+
+    def iter_tasks(self, offset=0, limit=None, completed=None):
+        """
+        Отдаёт задачи в порядке добавления, окном.
+
+        Аргументы:
+            offset: Сколько задач пропустить
+            limit: Сколько задач отдать (None - все)
+            completed: Фильтр по статусу (None - без фильтра)
+
+        Возвращает:
+            generator: Словари задач
+        """
+        query = "SELECT id, description, completed FROM tasks"
+        params = []
+        if completed is not None:
+            query += " WHERE completed = ?"
+            params.append(int(completed))
+        query += " ORDER BY id LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        for row in self.connection.execute(query, params):
+            yield row_to_task(row)
+
+
+# ============================================================
+# ПЕРЕНОС ИЗ JSON
+# ============================================================
+
+def migrate_json_to_sqlite(json_filename, db_filename):
+    """
+    Однократно переносит задачи из JSON файла (и его журнала) в базу.
+
+    Если в базе уже есть задачи, перенос не выполняется, чтобы
+    повторный запуск не задвоил список. JSON файл не изменяется.
+
+    Аргументы:
+        json_filename: Путь к tasks.json
+        db_filename: Путь к файлу базы
+
+    Возвращает:
+        int: Количество перенесённых задач (0 если база уже заполнена)
+    """
+    with SqliteTaskStore(db_filename) as store:
+        if store.count_tasks() > 0:
+            return 0
+        return store.add_tasks(load_tasks_streaming(json_filename))
+
+
+# ============================================================
+# СРАВНЕНИЕ С JSON
+# ============================================================
+
+def measure(action):
+    """Возвращает время выполнения action() в миллисекундах."""
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark_backends(count, directory):
+    """
+    Сравнивает JSON файл и SQLite на одном наборе задач.
+
+    Для JSON каждое изменение - это загрузка в память (один раз)
+    и полная перезапись файла; для SQLite - список ID в памяти
+    (один раз) и одна строка по первичному ключу.
+
+    Аргументы:
+        count: Количество задач
+        directory: Папка для временных файлов
+
+    Возвращает:
+        dict: Миллисекунды на операцию для каждого хранилища
+    """
+    tasks = [{"description": f"Задача номер {i}", "completed": False} for i in range(count)]
+    json_filename = os.path.join(directory, f"tasks_{count}.json")
+    db_filename = os.path.join(directory, f"tasks_{count}.db")
+    save_tasks_to_file(json_filename, tasks)
+    with SqliteTaskStore(db_filename) as store:
+        store.add_tasks(tasks)
+    del tasks
+    middle = count // 2
+
+    results = {"json": {}, "sqlite": {}}
+    loaded = []
+    results["json"]["open"] = measure(lambda: loaded.append(load_tasks_from_file(json_filename)))
+    json_tasks = loaded[0]
+    results["json"]["get"] = measure(lambda: get_task_by_index(json_tasks, middle))
+    results["json"]["complete"] = measure(
+        lambda: complete_task(json_tasks, middle) and save_tasks_to_file(json_filename, json_tasks)
+    )
+    results["json"]["delete"] = measure(
+        lambda: delete_task(json_tasks, 1) and save_tasks_to_file(json_filename, json_tasks)
+    )
+
+    stores = []
+    # Открытие включает построение списка ID, как открытие JSON - загрузку
+    results["sqlite"]["open"] = measure(
+        lambda: stores.append(SqliteTaskStore(db_filename)) or len(stores[0])
+    )
+    store = stores[0]
+    results["sqlite"]["get"] = measure(lambda: store.get_task_by_index(middle))
+    results["sqlite"]["complete"] = measure(lambda: store.complete_task(middle))
+    results["sqlite"]["delete"] = measure(lambda: store.delete_task(1))
+    store.close()
+    return results
+
+
+def print_benchmark(sizes):
+    """Печатает таблицу сравнения для каждого размера списка."""
+    operations = ("open", "get", "complete", "delete")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in sizes:
+            results = benchmark_backends(count, directory)
+            print(f"\n{count} задач (мс):")
+            print(f"  {'операция':<10}{'json':>12}{'sqlite':>12}")
+            for operation in operations:
+                print(
+                    f"  {operation:<10}"
+                    f"{results['json'][operation]:>12.2f}"
+                    f"{results['sqlite'][operation]:>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "migrate" and len(sys.argv) == 4:
+        migrated = migrate_json_to_sqlite(sys.argv[2], sys.argv[3])
+        print(f"Перенесено {migrated} задач(и).")
+    elif command == "bench":
+        print_benchmark([int(size) for size in sys.argv[2:]] or [10_000, 100_000, 1_000_000])
+    else:
+        print("Использование:")
+        print("  python task_store_sqlite.py migrate tasks.json tasks.db")
+        print("  python task_store_sqlite.py bench [размеры...]")
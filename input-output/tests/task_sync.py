@@ -0,0 +1,402 @@
+"""
+Совместная работа нескольких процессов с одним tasks.json
+
+Каждый запуск менеджера задач держит свой список в памяти. Если
+два терминала работают с одним файлом, побеждает тот, кто сохранил
+последним, а изменения другого молча теряются.
+
+SharedTaskFile решает это так:
+- все чтения и записи файла идут под блокировкой (fcntl.flock
+  на tasks.json.lock), так что процессы пишут по очереди
+- рядом с данными лежит счётчик версий (tasks.json.version);
+  каждое изменение увеличивает его
+- перед изменением процесс сверяет версию: если файл изменил кто-то
+  другой, процесс сначала догоняет его (доигрывает новые записи
+  журнала или перечитывает файл) и только потом применяет своё
+  изменение
+- изменения записываются по стабильному ID задачи, а не по номеру,
+  поэтому "выполнить задачу 3" относится к той задаче, которую
+  видел пользователь, даже если номера успели сдвинуться
+
+Нагрузочный тест (много процессов пишут одновременно):
+    python task_sync.py stress 8 200
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool
+
+from task_manager_testable import (
+    apply_journal_record,
+    get_journal_filename,
+    load_tasks_fast,
+    load_tasks_streaming,
+    record_task_changes,
+    replay_journal,
+    save_session,
+)
+from task_search import TaskSearchIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировки нет, работает как один процесс
+    fcntl = None
+
+
+LOCK_SUFFIX = ".lock"
+VERSION_SUFFIX = ".version"
+
+
+def get_lock_filename(filename):
+    """Путь к файлу блокировки (например, "tasks.json.lock")."""
+    return filename + LOCK_SUFFIX
+
+
+def get_version_filename(filename):
+    """Путь к счётчику версий (например, "tasks.json.version")."""
+    return filename + VERSION_SUFFIX
+
+
+@contextmanager
+def task_file_lock(filename):
+    """
+    Захватывает исключительную блокировку файла задач.
+
+    Блокировка держится на отдельном файле tasks.json.lock: сам
+    tasks.json подменяется через os.replace при сохранении, и
+    блокировка на нём потерялась бы вместе со старым файлом.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+    """
+    with open(get_lock_filename(filename), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_version(filename):
+    """
+    Читает счётчик версий файла задач.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        int: Версия (0 если счётчика ещё нет, -1 если он повреждён)
+    """
+    try:
+        with open(get_version_filename(filename), "r", encoding="utf-8") as file:
+            return int(file.read())
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError):
+        return -1
+
+
+def write_version(filename, version):
+    """
+    Записывает счётчик версий (вызывать под блокировкой).
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        version: Новая версия
+    """
+    temp_filename = get_version_filename(filename) + ".tmp"
+    with open(temp_filename, "w", encoding="utf-8") as file:
+        file.write(str(version))
+    os.replace(temp_filename, get_version_filename(filename))
+
+
+def bump_version(filename):
+    """
+    Увеличивает версию после изменения файла (вызывать под блокировкой).
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        int: Новая версия
+    """
+    version = max(read_version(filename), 0) + 1
+    write_version(filename, version)
+    return version
+
+
+def file_state(filename):
+    """
+    Запоминает, какой снимок и сколько журнала уже прочитано.
+
+    Снимок при сохранении подменяется новым файлом, поэтому
+    (inode, размер, mtime) меняются при каждой компактификации.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+
+    Возвращает:
+        tuple: (отпечаток снимка или None, размер журнала)
+    """
+    try:
+        stat = os.stat(filename)
+        snapshot = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        snapshot = None
+    try:
+        journal_size = os.path.getsize(get_journal_filename(filename))
+    except OSError:
+        journal_size = 0
+    return snapshot, journal_size
+
+
+class SharedTaskFile:
+    """
+    Список задач, который безопасно делят несколько процессов.
+
+    tasks - текущий TaskList. Менять его нужно только через commit():
+    тогда изменение попадёт в файл, и другие процессы его увидят.
+    """
+
+    def __init__(self, filename, on_first_page=None, cache_dir=None, lazy=False):
+        """
+        Аргументы:
+            filename: Путь к JSON файлу задач
+            on_first_page: Передаётся в load_tasks_fast
+            cache_dir: Папка кэша разбора (None - без кэша), передаётся
+                в load_tasks_fast и при загрузке, и при перечитывании
+            lazy: Ленивая загрузка описаний, тоже для обоих случаев
+        """
+        self.filename = filename
+        self.cache_dir = cache_dir
+        self.lazy = lazy
+        self.search_index = None
+        self.reloads = 0
+        with task_file_lock(filename):
+            self.tasks = load_tasks_fast(filename, on_first_page, lazy=lazy, cache_dir=cache_dir)
+            self.version = read_version(filename)
+            self.state = file_state(filename)
+
+    def _catch_up(self):
+        """
+        Догоняет изменения других процессов (вызывать под блокировкой).
+
+        Если снимок тот же и журнал только вырос, доигрываются новые
+        записи журнала; иначе список перечитывается целиком.
+
+        Возвращает:
+            bool: True если список пришлось обновить
+        """
+        version = read_version(self.filename)
+        if version == self.version and version != -1:
+            return False
+
+        snapshot, journal_size = file_state(self.filename)
+        known_snapshot, known_journal_size = self.state
+        if snapshot == known_snapshot and journal_size >= known_journal_size:
+            # Доигранные записи обновляют и поисковый индекс
+            replay_journal(self.filename, self.tasks, offset=known_journal_size,
+                           search_index=self.search_index)
+        else:
+            self._reload()
+        self.version = version
+        self.state = file_state(self.filename)
+        return True
+
+    def _reload(self):
+        """Перечитывает список с диска целиком (вызывать под блокировкой)."""
+        # load_tasks_fast понимает и бинарный снимок, и папку шардов
+        self.tasks = load_tasks_fast(self.filename, lazy=self.lazy, cache_dir=self.cache_dir)
+        self.reloads += 1
+        self.search_index = None
+        self.state = file_state(self.filename)
+
+    def refresh(self):
+        """
+        Подтягивает изменения других процессов, если они были.
+
+        Возвращает:
+            bool: True если список изменился
+        """
+        with task_file_lock(self.filename):
+            return self._catch_up()
+
+    def commit(self, record):
+        """
+        Применяет изменение и сохраняет его для всех процессов.
+
+        Аргументы:
+            record: Запись журнала; для выполнения и удаления -
+                по ID ({"op": "complete", "id": 7})
+
+        Возвращает:
+            bool: True если изменение применено, False если запись
+            невалидна или задачу уже удалил другой процесс
+
+        Исключения:
+            OSError: Если изменение не удалось записать (см. commit_many)
+        """
+        return self.commit_many([record])[0] is not None
+
+    def commit_many(self, records):
+        """
+        Применяет пачку изменений и сохраняет её одной записью журнала.
+
+        Под блокировкой: догнать чужие изменения, применить записи,
+        дописать их в журнал и увеличить версию. Добавленным задачам
+        записывается их ID, чтобы у всех процессов он совпадал.
+
+        Аргументы:
+            records: Записи журнала (см. commit)
+
+        Возвращает:
+            list: Для каждой записи - применённая запись (у добавления
+            с выданным ID) или None, если она не применена
+
+        Исключения:
+            OSError: Если изменения не удалось записать; список в памяти
+                перечитывается с диска, а версия не меняется
+        """
+        with task_file_lock(self.filename):
+            self._catch_up()
+            applied = []
+            for record in records:
+                if not apply_journal_record(self.tasks, record, self.search_index):
+                    applied.append(None)
+                    continue
+                if record.get("op") == "add":
+                    record = dict(record, id=self.tasks[-1]["id"])
+                applied.append(record)
+
+            written = [record for record in applied if record is not None]
+            if written:
+                if not record_task_changes(self.filename, self.tasks, written):
+                    # В памяти изменения уже применены: возвращаемся к тому,
+                    # что лежит на диске, чтобы не показывать несохранённое
+                    self._reload()
+                    raise OSError(f"Не удалось сохранить изменения в {self.filename}")
+                self.version = bump_version(self.filename)
+                self.state = file_state(self.filename)
+            return applied
+
+    def get_search_index(self):
+        """
+        Возвращает поисковый индекс, строя его при первом обращении.
+
+        Чужие изменения из журнала доигрываются и в индекс, а после
+        полной перезагрузки списка индекс строится заново.
+
+        Возвращает:
+            TaskSearchIndex: Индекс текущего списка
+        """
+        if self.search_index is None:
+            self.search_index = TaskSearchIndex.build(self.tasks)
+        return self.search_index
+
+    def close(self):
+        """
+        Сохраняет сеанс: догоняет чужие изменения и сворачивает журнал.
+
+        Возвращает:
+            bool: True если успешно, False в противном случае
+        """
+        with task_file_lock(self.filename):
+            self._catch_up()
+            return save_session(self.filename, self.tasks)
+
+
+# ============================================================
+# НАГРУЗОЧНЫЙ ТЕСТ
+# ============================================================
+
+def writer_description(writer, number):
+    """Описание задачи, которую добавляет писатель в нагрузочном тесте."""
+    return f"Писатель {writer} задача {number}"
+
+
+def run_writer(filename, writer, count):
+    """
+    Один процесс-писатель: добавляет count задач и выполняет каждую вторую.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач
+        writer: Номер писателя
+        count: Сколько задач добавить
+
+    Возвращает:
+        int: Количество выполненных изменений
+    """
+    shared = SharedTaskFile(filename)
+    commits = 0
+    for number in range(count):
+        commits += shared.commit({"op": "add", "description": writer_description(writer, number)})
+        if number % 2 == 0:
+            task_id = shared.tasks[-1]["id"]
+            commits += shared.commit({"op": "complete", "id": task_id})
+    return commits
+
+
+def stress_test(filename, processes, count):
+    """
+    Запускает писателей параллельно и проверяет, что ничего не потеряно.
+
+    Аргументы:
+        filename: Путь к JSON файлу задач (должен не существовать или быть пустым)
+        processes: Количество процессов-писателей
+        count: Сколько задач добавляет каждый писатель
+
+    Возвращает:
+        dict: commits, seconds, commits_per_second, lost, duplicated, wrong_status
+    """
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        commits = sum(pool.starmap(
+            run_writer, [(filename, writer, count) for writer in range(processes)]
+        ))
+    seconds = time.perf_counter() - start
+
+    with task_file_lock(filename):
+        tasks = load_tasks_streaming(filename)
+    seen = {}
+    for task in tasks:
+        seen.setdefault(task["description"], []).append(task["completed"])
+
+    lost = duplicated = wrong_status = 0
+    for writer in range(processes):
+        for number in range(count):
+            statuses = seen.get(writer_description(writer, number), [])
+            if not statuses:
+                lost += 1
+            elif len(statuses) > 1:
+                duplicated += 1
+            elif statuses[0] != (number % 2 == 0):
+                wrong_status += 1
+    return {
+        "commits": commits,
+        "seconds": seconds,
+        "commits_per_second": commits / seconds if seconds else 0.0,
+        "lost": lost,
+        "duplicated": duplicated,
+        "wrong_status": wrong_status,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "stress":
+        with tempfile.TemporaryDirectory() as directory:
+            result = stress_test(
+                os.path.join(directory, "tasks.json"), int(sys.argv[2]), int(sys.argv[3])
+            )
+        print(f"Изменений: {result['commits']} за {result['seconds']:.2f} с "
+              f"({result['commits_per_second']:.0f} в секунду)")
+        print(f"Потеряно: {result['lost']}, задвоено: {result['duplicated']}, "
+              f"неверный статус: {result['wrong_status']}")
+        sys.exit(1 if result["lost"] or result["duplicated"] or result["wrong_status"] else 0)
+    print("Использование:")
+    print("  python task_sync.py stress ПРОЦЕССОВ ЗАДАЧ_НА_ПРОЦЕСС")
+    sys.exit(2)
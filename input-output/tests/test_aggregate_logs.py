@@ -0,0 +1,108 @@
+"""
+Тесты для сводки по журналам приключений (examples/aggregate_logs.py)
+
+Запустить: pytest test_aggregate_logs.py -v
+"""
+
+import importlib.util
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+
+AGGREGATE_LOGS = os.path.join(os.path.dirname(__file__), "..", "examples", "aggregate_logs.py")
+
+LOG = (
+    "Путешествие началось\n"
+    "Вошёл в тёмный лес\n"
+    "Победил 3 гоблинов\n"
+    "Нашёл сундук с сокровищами\n"
+    "Получил 100 золота\n"
+    "Победил дракона\n"
+    "Потерял 20 золота в болоте\n"
+    "Торговец предложил 500 золотых\n"
+    "Получил 7 золотых монет\n"
+)
+
+
+@pytest.fixture
+def aggregate_logs(monkeypatch):
+    """Загружает examples/aggregate_logs.py как модуль (его видит и пул процессов)."""
+    spec = importlib.util.spec_from_file_location("aggregate_logs", AGGREGATE_LOGS)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "aggregate_logs", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_aggregate_text_counts_events(aggregate_logs):
+    """Тест подсчёта событий: золото только из строк "Получил N золота"."""
+    assert aggregate_logs.aggregate_text(LOG) == Counter({
+        "строки": 9,
+        "победы": 2,
+        "врагов побеждено": 4,
+        "сундуки": 1,
+        "золото": 107,
+    })
+
+
+def test_aggregate_text_ignores_events_inside_lines(aggregate_logs):
+    """Тест что событие считается только в начале строки."""
+    text = "Торговец сказал: Получил 50 золота\nСтарик: Победил 9 троллей\n"
+
+    counts = aggregate_logs.aggregate_text(text)
+
+    assert counts["золото"] == 0
+    assert counts["победы"] == 0
+
+
+def write_logs(directory, count):
+    """Создаёт count журналов с разным числом копий LOG."""
+    filenames = []
+    for number in range(count):
+        path = directory / f"adventure_log_{number}.txt"
+        path.write_text(LOG * (number + 1), encoding="utf-8")
+        filenames.append(str(path))
+    return filenames
+
+
+def test_chunk_boundary_does_not_split_events(tmp_path, aggregate_logs, monkeypatch):
+    """Тест что маленькие куски дают тот же счёт, что и весь текст сразу."""
+    filenames = write_logs(tmp_path, 1)
+    expected = aggregate_logs.aggregate_file(filenames[0])
+
+    for chunk_size in (1, 5, 17, 64):
+        monkeypatch.setattr(aggregate_logs, "CHUNK_SIZE", chunk_size)
+        assert aggregate_logs.aggregate_file(filenames[0]) == expected
+    assert expected["золото"] == 107
+
+
+def test_pool_matches_single_process(tmp_path, aggregate_logs, monkeypatch):
+    """Тест что два процесса дают ту же сумму, что и один, на маленьких кусках."""
+    monkeypatch.setattr(aggregate_logs, "CHUNK_SIZE", 13)
+    filenames = write_logs(tmp_path, 5)
+    filenames.append(str(tmp_path / "missing.txt"))
+
+    single = aggregate_logs.aggregate_files(filenames, workers=1)
+    pooled = aggregate_logs.aggregate_files(filenames, workers=2)
+
+    assert pooled == single
+    assert single["файлы"] == 5
+    assert single["не прочитано"] == 1
+    assert single["золото"] == 107 * (1 + 2 + 3 + 4 + 5)
+    assert single["строки"] == 9 * (1 + 2 + 3 + 4 + 5)
+
+
+def test_find_logs_walks_directories(tmp_path, aggregate_logs):
+    """Тест что в папках берутся только журналы, а файлы - как есть."""
+    (tmp_path / "session_1").mkdir()
+    (tmp_path / "session_1" / "adventure_log.txt").write_text(LOG, encoding="utf-8")
+    (tmp_path / "session_1" / "notes.txt").write_text("заметки", encoding="utf-8")
+    extra = tmp_path / "other.txt"
+    extra.write_text(LOG, encoding="utf-8")
+
+    found = aggregate_logs.find_logs([str(tmp_path / "session_1"), str(extra)])
+
+    assert found == sorted([str(tmp_path / "session_1" / "adventure_log.txt"), str(extra)])
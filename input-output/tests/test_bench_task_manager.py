@@ -0,0 +1,93 @@
+"""
+Тесты для бенчмарка масштабирования
+
+Запустить: pytest test_bench_task_manager.py -v
+"""
+
+import json
+
+import pytest
+
+from bench_task_manager import find_regressions, main, run_benchmarks
+
+
+OPERATIONS = {
+    "add_task",
+    "delete_task",
+    "format_task_list",
+    "load_tasks_from_file",
+    "save_tasks_to_file",
+}
+
+
+def make_result(operation, size, seconds, peak_bytes=1000):
+    return {"operation": operation, "size": size, "seconds": seconds, "peak_bytes": peak_bytes}
+
+
+def test_run_benchmarks_covers_all_operations(tmp_path):
+    """Каждая операция измеряется на каждом размере"""
+    results = run_benchmarks([10, 20], repeat=1, directory=tmp_path)
+
+    assert {(item["operation"], item["size"]) for item in results} == {
+        (operation, size) for operation in OPERATIONS for size in (10, 20)
+    }
+    assert all(item["seconds"] > 0 and item["peak_bytes"] >= 0 for item in results)
+
+
+def test_run_benchmarks_on_empty_list(tmp_path):
+    """Пустой список не ломает замер (нет деления на ноль)"""
+    results = run_benchmarks([0], repeat=1, directory=tmp_path)
+
+    assert {item["operation"] for item in results} == OPERATIONS
+
+
+@pytest.mark.parametrize("argv", [["--sizes", "0"], ["--sizes", "10", "-5"], ["--repeat", "0"]])
+def test_main_rejects_non_positive_counts(argv):
+    """Размер и число повторов меньше единицы отклоняются argparse"""
+    with pytest.raises(SystemExit) as error:
+        main(argv)
+    assert error.value.code == 2
+
+
+def test_find_regressions_within_tolerance():
+    """Замедление в пределах допуска - не регрессия"""
+    baseline = [make_result("add_task", 100, 1.0)]
+    results = [make_result("add_task", 100, 1.4)]
+
+    assert find_regressions(results, baseline, tolerance=0.5) == []
+
+
+def test_find_regressions_reports_slowdown_and_memory():
+    """Замедление и рост памяти сверх допуска - регрессии"""
+    baseline = [make_result("add_task", 100, 1.0), make_result("delete_task", 100, 1.0)]
+    results = [
+        make_result("add_task", 100, 2.0),
+        make_result("delete_task", 100, 1.0, peak_bytes=5000),
+    ]
+
+    regressions = find_regressions(results, baseline, tolerance=0.5)
+    assert len(regressions) == 2
+    assert "add_task" in regressions[0] and "seconds" in regressions[0]
+    assert "delete_task" in regressions[1] and "peak_bytes" in regressions[1]
+
+
+def test_find_regressions_ignores_unknown_sizes():
+    """Размеры, которых нет в эталоне, не сравниваются"""
+    baseline = [make_result("add_task", 100, 1.0)]
+    results = [make_result("add_task", 1000, 50.0)]
+
+    assert find_regressions(results, baseline, tolerance=0.5) == []
+
+
+def test_main_fails_on_regression(tmp_path):
+    """С невыполнимым эталоном скрипт завершается с кодом 1"""
+    output = tmp_path / "results.json"
+    assert main(["--sizes", "10", "--repeat", "1", "--output", str(output)]) == 0
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    for item in report["results"]:
+        item["seconds"] = 0.0
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+
+    assert main(["--sizes", "10", "--repeat", "1", "--baseline", str(baseline)]) == 1
@@ -0,0 +1,189 @@
+"""
+Тесты для буферизованного лога с ротацией (examples/game_log.py)
+
+Запустить: pytest test_game_log.py -v
+"""
+
+import gzip
+import importlib.util
+import os
+import time
+
+import pytest
+
+
+GAME_LOG = os.path.join(os.path.dirname(__file__), "..", "examples", "game_log.py")
+
+spec = importlib.util.spec_from_file_location("game_log", GAME_LOG)
+game_log = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(game_log)
+
+
+class FailingFile:
+    """Файл, запись в который не удаётся, пока failing равно True."""
+
+    def __init__(self, file):
+        self.file = file
+        self.failing = True
+
+    def write(self, data):
+        if self.failing:
+            raise OSError(28, "No space left on device")
+        return self.file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def read_entries(filename):
+    """Все записи лога по порядку: сжатые части, затем текущий файл."""
+    directory = os.path.dirname(filename)
+    prefix = os.path.basename(filename) + "."
+    numbers = sorted(int(name[len(prefix):-len(".gz")]) for name in os.listdir(directory)
+                     if name.startswith(prefix) and name.endswith(".gz"))
+    lines = []
+    for number in numbers:
+        with gzip.open(f"{filename}.{number}.gz", "rt", encoding="utf-8") as file:
+            lines.extend(file.read().splitlines())
+    with open(filename, encoding="utf-8") as file:
+        lines.extend(file.read().splitlines())
+    return lines
+
+
+def test_rotation_keeps_every_entry_in_order(tmp_path):
+    """Тест что при ротации части сжимаются, а записи не теряются."""
+    filename = str(tmp_path / "game_log.txt")
+    entries = [f"Игрок победил гоблина номер {i}" for i in range(40)]
+
+    with game_log.GameLog(filename, buffer_size=1, flush_interval=None,
+                          max_bytes=200, backup_count=100) as log:
+        for entry in entries:
+            log.write(entry)
+
+    names = os.listdir(tmp_path)
+    assert any(name.endswith(".gz") for name in names)
+    assert not any(name.endswith(".tmp") for name in names)
+    assert os.path.getsize(filename) <= 200
+    assert read_entries(filename) == entries
+
+
+def test_backup_count_keeps_only_newest_segments(tmp_path):
+    """Тест что хранятся только последние backup_count сжатых частей."""
+    filename = str(tmp_path / "game_log.txt")
+
+    with game_log.GameLog(filename, buffer_size=1, flush_interval=None,
+                          max_bytes=50, backup_count=2) as log:
+        for i in range(30):
+            log.write(f"Запись {i:02d} " + "x" * 30)
+
+    segments = sorted(name for name in os.listdir(tmp_path) if name != "game_log.txt")
+    assert len(segments) == 2
+    assert all(name.endswith(".gz") for name in segments)
+    # Остались самые новые части: их записи идут прямо перед текущим файлом
+    assert read_entries(filename)[-3:] == [f"Запись {i:02d} " + "x" * 30 for i in range(27, 30)]
+
+
+def test_failed_rotation_keeps_writing_to_same_file(tmp_path, monkeypatch):
+    """Тест что при постоянной ошибке переименования записи идут в тот же файл."""
+    filename = str(tmp_path / "game_log.txt")
+    entries = [f"Запись {i:02d}" for i in range(20)]
+    replace = os.replace
+
+    def failing_replace(source, target):
+        if source == filename:
+            raise PermissionError(13, "Permission denied")
+        return replace(source, target)
+
+    monkeypatch.setattr(game_log.os, "replace", failing_replace)
+    log = game_log.GameLog(filename, buffer_size=1, flush_interval=None,
+                           max_bytes=50, backup_count=100)
+    for entry in entries[:10]:
+        log.write(entry)
+
+    assert isinstance(log.rotate_error, PermissionError)
+    assert os.listdir(tmp_path) == ["game_log.txt"]
+    assert read_entries(filename) == entries[:10]
+
+    # Когда переименование снова работает, ротация продолжается
+    monkeypatch.setattr(game_log.os, "replace", replace)
+    for entry in entries[10:]:
+        log.write(entry)
+    log.close()
+
+    assert log.rotate_error is None
+    assert len(os.listdir(tmp_path)) > 1
+    assert read_entries(filename) == entries
+
+
+def test_close_flushes_buffer(tmp_path):
+    """Тест что записи из буфера попадают в файл при закрытии."""
+    filename = str(tmp_path / "game_log.txt")
+    log = game_log.GameLog(filename, flush_interval=None)
+    log.write("Игрок вошёл в мир")
+    log.write("Игрок победил гоблина")
+
+    assert os.path.getsize(filename) == 0
+
+    log.close()
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == "Игрок вошёл в мир\nИгрок победил гоблина\n"
+    with pytest.raises(ValueError):
+        log.write("После закрытия")
+
+
+def test_failed_write_keeps_entries_in_buffer(tmp_path):
+    """Тест что после ошибки записи буфер сохраняется и уходит следующим сбросом."""
+    filename = str(tmp_path / "game_log.txt")
+    log = game_log.GameLog(filename, flush_interval=None)
+    failing = FailingFile(log._file)
+    log._file = failing
+    log.write("Первая")
+    log.write("Вторая")
+
+    with pytest.raises(OSError):
+        log.flush()
+
+    failing.failing = False
+    log.write("Третья")
+    log.close()
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == "Первая\nВторая\nТретья\n"
+
+
+def test_close_closes_file_even_if_last_flush_fails(tmp_path):
+    """Тест что close сообщает об ошибке, но всё равно закрывает лог."""
+    filename = str(tmp_path / "game_log.txt")
+    log = game_log.GameLog(filename, flush_interval=None)
+    log._file = FailingFile(log._file)
+    log.write("Запись")
+
+    with pytest.raises(OSError):
+        log.close()
+
+    assert log._file.closed
+    log.close()  # Повторное закрытие ничего не делает
+
+
+def test_background_flush_reports_error_and_keeps_running(tmp_path, capsys):
+    """Тест что фоновый сброс сообщает об ошибке и продолжает работать."""
+    filename = str(tmp_path / "game_log.txt")
+    log = game_log.GameLog(filename, flush_interval=0.01)
+    failing = FailingFile(log._file)
+    log._file = failing
+    log.write("Запись")
+
+    deadline = time.monotonic() + 5
+    while log.flush_error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert isinstance(log.flush_error, OSError)
+    assert log._flusher.is_alive()
+
+    failing.failing = False
+    while os.path.getsize(filename) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    log.close()
+
+    assert log.flush_error is None
+    assert capsys.readouterr().err.count("не удалось записать") == 1
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == "Запись\n"
@@ -0,0 +1,83 @@
+"""
+Тесты для счётчика строк больших файлов
+
+Запустить: pytest test_line_counter.py -v
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+LINE_COUNTER = os.path.join(os.path.dirname(__file__), "..", "examples", "line_counter.py")
+
+
+@pytest.fixture
+def line_counter(monkeypatch):
+    """Загружает examples/line_counter.py как модуль (его видит и пул процессов)."""
+    spec = importlib.util.spec_from_file_location("line_counter", LINE_COUNTER)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "line_counter", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def readlines_count(path):
+    with open(path, "rb") as file:
+        return len(file.readlines())
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\n",
+    b"one line without newline",
+    b"first\nsecond\nthird",
+    b"first\nsecond\nthird\n",
+    b"\n\n\n",
+    "Игрок победил гоблина\r\nИ получил 10 золота\r\n".encode("utf-8"),
+])
+def test_count_matches_readlines(tmp_path, line_counter, data):
+    """Тест что счёт совпадает с len(readlines()), в том числе без \\n в конце"""
+    path = tmp_path / "log.txt"
+    path.write_bytes(data)
+
+    assert line_counter.count_lines(str(path), workers=1) == readlines_count(path)
+
+
+def test_chunk_and_block_boundaries(tmp_path, line_counter, monkeypatch):
+    """Тест маленьких кусков и блоков: \\n на границе не теряется и не считается дважды"""
+    monkeypatch.setattr(line_counter, "BLOCK_SIZE", 3)
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"".join(b"x" * (i % 5) + b"\n" for i in range(100)) + b"tail")
+
+    for chunk_size in (1, 2, 5, 7, 64, 10_000):
+        assert line_counter.count_lines(str(path), workers=1, chunk_size=chunk_size) == 101
+
+
+def test_workers_use_pool_for_small_file(tmp_path, line_counter, monkeypatch):
+    """Тест что явное workers > 1 считает в пуле и совпадает с readlines()"""
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"".join(b"line %d\n" % i for i in range(1000)) + b"last")
+    pools = []
+    executor = line_counter.ProcessPoolExecutor
+
+    def counting_executor(*args, **kwargs):
+        pools.append(kwargs)
+        return executor(*args, **kwargs)
+
+    monkeypatch.setattr(line_counter, "ProcessPoolExecutor", counting_executor)
+
+    assert line_counter.count_lines(str(path), workers=2, chunk_size=997) == readlines_count(path)
+    assert pools == [{"max_workers": 2}]
+
+    # Без явного числа процессов маленький файл считается без пула
+    assert line_counter.count_lines(str(path)) == readlines_count(path)
+    assert len(pools) == 1
+
+
+def test_missing_file(tmp_path, line_counter):
+    """Тест что отсутствующий файл - FileNotFoundError, как у open()"""
+    with pytest.raises(FileNotFoundError):
+        line_counter.count_lines(str(tmp_path / "missing.txt"))
@@ -0,0 +1,152 @@
+"""
+Тесты для индекса строк (examples/line_index.py)
+
+Ответы индекса сравниваются с readlines() того же файла.
+
+Запустить: pytest test_line_index.py -v
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+
+LINE_INDEX = os.path.join(os.path.dirname(__file__), "..", "examples", "line_index.py")
+
+spec = importlib.util.spec_from_file_location("line_index", LINE_INDEX)
+line_index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(line_index)
+
+EVERY = 3
+
+
+def expected_lines(filename):
+    """Строки файла так, как их видит 05_read_file.py."""
+    with open(filename, "rb") as file:
+        return [line_index.decode_line(line) for line in file.readlines()]
+
+
+def assert_matches_readlines(index, filename):
+    """Проверяет каждую строку и каждый диапазон через границы отметок."""
+    lines = expected_lines(filename)
+    for number in range(len(lines) + 2):
+        expected = lines[number - 1] if 1 <= number <= len(lines) else None
+        assert index.read_line(number) == expected
+    for first in range(1, len(lines) + 1):
+        for last in range(first, len(lines) + 2):
+            assert index.read_range(first, last) == lines[first - 1:last]
+
+
+def write_log(path, data):
+    path.write_bytes(data.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("data", [
+    "",
+    "одна строка без перевода",
+    "".join(f"Строка {i}\n" for i in range(1, 11)),
+    "".join(f"Строка {i}\r\n" for i in range(1, 8)) + "хвост без перевода",
+    "\n\n\nпосле пустых\n\n",
+])
+def test_lines_match_readlines(tmp_path, data):
+    """Тест строк и диапазонов через границы отметок на маленьком шаге."""
+    filename = write_log(tmp_path / "game_log.txt", data)
+
+    index = line_index.open_index(filename, every=EVERY)
+
+    assert_matches_readlines(index, filename)
+
+
+def test_small_blocks_match_readlines(tmp_path, monkeypatch):
+    """Тест что отметки верны, когда строки пересекают границы блоков чтения."""
+    monkeypatch.setattr(line_index, "BLOCK_SIZE", 7)
+    filename = write_log(tmp_path / "game_log.txt",
+                         "".join(f"Игрок {i} получил золото\n" for i in range(20)))
+
+    index = line_index.open_index(filename, every=EVERY)
+
+    assert_matches_readlines(index, filename)
+
+
+def test_append_is_indexed_incrementally(tmp_path, monkeypatch):
+    """Тест что после дописывания индекс дочитывает только новый хвост."""
+    path = tmp_path / "game_log.txt"
+    filename = write_log(path, "".join(f"Строка {i}\n" for i in range(1, 8)) + "недописанная")
+    line_index.open_index(filename, every=EVERY)
+    with open(filename, "a", encoding="utf-8") as file:
+        file.write(" строка\n" + "".join(f"Новая {i}\n" for i in range(1, 6)))
+
+    scanned = []
+    original_scan = line_index.LineIndex._scan
+
+    def recording_scan(self, file, end):
+        scanned.append(self.size)
+        return original_scan(self, file, end)
+
+    monkeypatch.setattr(line_index.LineIndex, "_scan", recording_scan)
+    index = line_index.open_index(filename, every=EVERY)
+
+    assert scanned and scanned[0] > 0
+    assert_matches_readlines(index, filename)
+    assert line_index.LineIndex.load(filename, every=EVERY).size == os.path.getsize(filename)
+
+
+def test_rewrite_rebuilds_index(tmp_path):
+    """Тест что перезаписанный файл (длиннее и короче прежнего) индексируется заново."""
+    path = tmp_path / "game_log.txt"
+    filename = write_log(path, "".join(f"Строка {i}\n" for i in range(1, 10)))
+    line_index.open_index(filename, every=EVERY)
+
+    write_log(path, "".join(f"Запись {i}\n" for i in range(1, 14)))
+    index = line_index.open_index(filename, every=EVERY)
+    assert_matches_readlines(index, filename)
+
+    write_log(path, "коротко\n")
+    index = line_index.open_index(filename, every=EVERY)
+    assert_matches_readlines(index, filename)
+
+
+def test_index_with_other_step_is_rebuilt(tmp_path):
+    """Тест что сохранённый индекс с другим шагом не используется."""
+    filename = write_log(tmp_path / "game_log.txt",
+                         "".join(f"Строка {i}\n" for i in range(1, 10)))
+    line_index.open_index(filename, every=EVERY)
+
+    assert line_index.LineIndex.load(filename, every=EVERY + 1) is None
+    assert_matches_readlines(line_index.open_index(filename, every=EVERY + 1), filename)
+
+
+def test_main_prints_requested_lines(tmp_path, capsys):
+    """Тест вывода строк из командной строки."""
+    filename = write_log(tmp_path / "game_log.txt",
+                         "".join(f"Строка {i}\n" for i in range(1, 6)))
+
+    assert line_index.main([filename, "2", "3"]) == 0
+    assert capsys.readouterr().out == "Строка 2: Строка 2\nСтрока 3: Строка 3\n"
+
+
+@pytest.mark.parametrize("argv", [["game_log.txt"], ["game_log.txt", "пять"],
+                                  ["game_log.txt", "1", "x"]])
+def test_main_rejects_bad_arguments(argv, capsys):
+    """Тест что неверные аргументы - подсказка и код 2, а не исключение."""
+    assert line_index.main(argv, command="python 05_read_file.py --line") == 2
+    assert "python 05_read_file.py --line НОМЕР" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("first", ["0", "-3"])
+def test_main_rejects_line_before_first(tmp_path, capsys, first):
+    """Тест что номер строки меньше 1 - ошибка, а не неверная нумерация."""
+    filename = write_log(tmp_path / "game_log.txt", "Строка 1\nСтрока 2\n")
+
+    assert line_index.main([filename, first, "2"]) == 2
+    out = capsys.readouterr().out
+    assert "нумеруются с 1" in out
+    assert "Строка 0" not in out
+
+
+def test_main_reports_missing_file(tmp_path, capsys):
+    """Тест сообщения об отсутствующем файле."""
+    assert line_index.main([str(tmp_path / "missing.txt"), "1"]) == 1
+    assert "не найден" in capsys.readouterr().out
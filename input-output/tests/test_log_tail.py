@@ -0,0 +1,140 @@
+"""
+Тесты для последних строк лога и слежения за ним
+
+Запустить: pytest test_log_tail.py -v
+"""
+
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+
+LOG_TAIL = os.path.join(os.path.dirname(__file__), "..", "examples", "log_tail.py")
+
+
+@pytest.fixture
+def log_tail():
+    """Загружает examples/log_tail.py как модуль."""
+    spec = importlib.util.spec_from_file_location("log_tail", LOG_TAIL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================
+# ПОСЛЕДНИЕ СТРОКИ
+# ============================================================
+
+def test_tail_more_than_file_has(tmp_path, log_tail):
+    """Тест что при count больше числа строк возвращается весь файл"""
+    path = tmp_path / "game_log.txt"
+    path.write_text("Путешествие началось\nПобедил дракона\n", encoding="utf-8")
+
+    assert log_tail.tail_lines(str(path), 10) == ["Путешествие началось", "Победил дракона"]
+    assert log_tail.tail_lines(str(path), 10, block_size=4) == ["Путешествие началось", "Победил дракона"]
+
+
+def test_tail_across_blocks_and_without_last_newline(tmp_path, log_tail):
+    """Тест маленьких блоков и последней строки без \\n"""
+    path = tmp_path / "game_log.txt"
+    lines = [f"Запись {i}" for i in range(50)]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    for block_size in (1, 3, 7, 8192):
+        assert log_tail.tail_lines(str(path), 3, block_size=block_size) == lines[-3:]
+    assert log_tail.tail_lines(str(path), 0) == []
+
+
+def test_tail_crlf_file(tmp_path, log_tail):
+    """Тест файла с переводами строк Windows: \\r не попадает в строки"""
+    path = tmp_path / "game_log.txt"
+    path.write_bytes("Вошёл в лес\r\nНашёл сундук\r\nПолучил 100 золота\r\n".encode("utf-8"))
+
+    assert log_tail.tail_lines(str(path), 2, block_size=5) == ["Нашёл сундук", "Получил 100 золота"]
+
+
+def test_tail_empty_and_missing_file(tmp_path, log_tail):
+    """Тест пустого и отсутствующего файла"""
+    path = tmp_path / "game_log.txt"
+    path.write_bytes(b"")
+    assert log_tail.tail_lines(str(path), 5) == []
+
+    with pytest.raises(FileNotFoundError):
+        log_tail.tail_lines(str(tmp_path / "missing.txt"))
+
+
+# ============================================================
+# СЛЕЖЕНИЕ
+# ============================================================
+
+@pytest.fixture
+def scripted_sleep(log_tail, monkeypatch):
+    """
+    Подменяет паузу follow(): каждая пауза выполняет следующее
+    действие с файлом, так что строки появляются между проверками.
+    """
+    actions = []
+
+    def sleep(seconds):
+        if not actions:
+            raise AssertionError("follow() ждёт новых строк, а действий больше нет")
+        actions.pop(0)()
+
+    monkeypatch.setattr(log_tail, "time", SimpleNamespace(sleep=sleep))
+    return actions
+
+
+def append(path, data):
+    with open(path, "ab") as file:
+        file.write(data)
+
+
+def test_follow_new_lines_partial_and_crlf(tmp_path, log_tail, scripted_sleep):
+    """Тест слежения: старые строки пропускаются, недописанная строка ждёт \\n"""
+    path = tmp_path / "game_log.txt"
+    path.write_bytes(b"old\n")
+    lines = log_tail.follow(str(path), poll_interval=0.01)
+
+    scripted_sleep.append(lambda: append(path, "Победил гоблина\n".encode("utf-8")))
+    assert next(lines) == "Победил гоблина"
+
+    scripted_sleep.extend([lambda: append(path, b"par"), lambda: append(path, b"tial\r\n")])
+    assert next(lines) == "partial"
+    assert not scripted_sleep
+    lines.close()
+
+
+def test_follow_after_truncation(tmp_path, log_tail, scripted_sleep):
+    """Тест что после перезаписи файла чтение начинается с начала"""
+    path = tmp_path / "game_log.txt"
+    path.write_bytes(b"first line of the old log\n")
+    lines = log_tail.follow(str(path), poll_interval=0.01)
+
+    scripted_sleep.append(lambda: path.write_bytes(b"new\n"))
+    assert next(lines) == "new"
+    lines.close()
+
+
+def test_follow_after_rotation(tmp_path, log_tail, scripted_sleep):
+    """Тест ротации: лог переименован, на его месте новый файл"""
+    path = tmp_path / "game_log.txt"
+    path.write_bytes(b"before rotation\n")
+    lines = log_tail.follow(str(path), poll_interval=0.01)
+
+    def rotate():
+        os.replace(path, tmp_path / "game_log.txt.1")
+        path.write_bytes(b"rotated 1\nrotated 2\n")
+
+    scripted_sleep.append(rotate)
+    assert next(lines) == "rotated 1"
+    assert next(lines) == "rotated 2"
+
+    # Пока нового файла нет, follow ждёт, а не падает
+    scripted_sleep.extend([
+        lambda: os.remove(path),
+        lambda: path.write_bytes(b"recreated\n"),
+    ])
+    assert next(lines) == "recreated"
+    lines.close()
@@ -0,0 +1,115 @@
+"""
+Тесты для отложенной записи в шаге 5 мини-проекта
+
+Запустить: pytest test_step5_error_handling.py -v
+"""
+
+import importlib.util
+import json
+import os
+import time
+
+import pytest
+
+
+STEP5 = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "10_mini_project", "step5_error_handling.py"
+)
+
+
+@pytest.fixture
+def step5(tmp_path, monkeypatch):
+    """Загружает шаг 5 как модуль с отложенной записью и файлом задач в tmp_path."""
+    spec = importlib.util.spec_from_file_location("step5_error_handling", STEP5)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "WRITE_BEHIND", True)
+    monkeypatch.setattr(module, "TASKS_FILE", str(tmp_path / "tasks.json"))
+    module.tasks[:] = [
+        {"description": "Купить молоко", "completed": False},
+        {"description": "Позвонить маме", "completed": False},
+    ]
+    yield module
+    if module.save_timer is not None:
+        module.save_timer.cancel()
+
+
+def test_delete_is_saved_before_it_is_reported(step5, monkeypatch, capsys):
+    """Тест что удаление сохраняется сразу, а не через таймер."""
+    monkeypatch.setattr("builtins.input", lambda prompt: "1")
+
+    step5.delete_task()
+
+    assert "✓ Удалено: Купить молоко" in capsys.readouterr().out
+    with open(step5.TASKS_FILE, encoding="utf-8") as file:
+        assert json.load(file) == [{"description": "Позвонить маме", "completed": False}]
+
+
+def test_delete_rolls_back_when_its_flush_fails(step5, monkeypatch, capsys):
+    """Тест отката удаления по результату сохранения, в которое оно попало."""
+    monkeypatch.setattr("builtins.input", lambda prompt: "1")
+    # Прошлое сохранение было успешным, а это - не удастся (папки нет)
+    step5.last_save_ok = True
+    monkeypatch.setattr(step5, "TASKS_FILE", os.path.join(step5.TASKS_FILE, "missing", "tasks.json"))
+
+    step5.delete_task()
+
+    assert "Удаление не удалось" in capsys.readouterr().out
+    assert [task["description"] for task in step5.tasks] == ["Купить молоко", "Позвонить маме"]
+    assert step5.dirty
+
+
+def test_flush_survives_unserializable_task(step5, capsys):
+    """Тест что ошибка сериализации - это неудачное сохранение, а не исключение."""
+    step5.tasks.append({"description": object(), "completed": False})
+    step5.dirty = True
+
+    assert not step5.flush_tasks()
+    assert "Ошибка сохранения задач" in capsys.readouterr().out
+    assert step5.dirty
+    assert not os.path.exists(step5.TASKS_FILE)
+
+
+def wait_for(condition, timeout=5):
+    """Ждёт, пока condition() станет истинным (или истечёт timeout)."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_add_does_not_report_stale_save_result(step5, monkeypatch, capsys):
+    """Тест что добавление не выдаёт результат прошлого сохранения за своё."""
+    monkeypatch.setattr("builtins.input", lambda prompt: "Новая задача")
+    step5.last_save_ok = False
+
+    step5.add_task()
+
+    out = capsys.readouterr().out
+    assert "сохранится в фоне" in out
+    assert "сохранение не удалось" not in out
+
+
+def test_failed_background_save_is_retried_and_reported(step5, monkeypatch, capsys):
+    """Тест что фоновое сохранение повторяется, а об ошибке сообщает главный поток."""
+    monkeypatch.setattr(step5, "SAVE_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(step5, "RETRY_DELAY_SECONDS", 0.05)
+    good_file = step5.TASKS_FILE
+    monkeypatch.setattr(step5, "TASKS_FILE", os.path.join(good_file, "missing", "tasks.json"))
+
+    assert step5.request_save() is None
+    assert wait_for(lambda: step5.save_error is not None)
+    # Фоновый поток ничего не печатает
+    assert capsys.readouterr().out == ""
+
+    step5.report_save_error()
+    assert "Фоновое сохранение не удалось" in capsys.readouterr().out
+
+    monkeypatch.setattr(step5, "TASKS_FILE", good_file)
+    # last_save_ok меняется только после записи, так что файл уже полный
+    assert wait_for(lambda: step5.last_save_ok)
+    assert not step5.dirty
+    with open(good_file, encoding="utf-8") as file:
+        assert len(json.load(file)) == 2
+    step5.report_save_error()
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,236 @@
+"""
+Тесты для архива выполненных задач
+
+Запустить: pytest test_task_archive.py -v
+"""
+
+import gzip
+import json
+import os
+
+import task_archive
+
+from task_archive import (
+    append_archive,
+    archive_tasks,
+    get_archive_filename,
+    get_done_times_filename,
+    get_next_id_filename,
+    iter_archive,
+    load_archive,
+    read_done_times,
+    restore_task,
+    search_archive,
+    select_for_archive,
+    update_done_times,
+)
+from task_list import TaskList
+from task_manager_testable import (
+    add_task,
+    complete_task,
+    load_tasks_fast,
+    load_tasks_from_file,
+    load_tasks_streaming,
+    record_task_change,
+    save_session,
+    save_tasks_to_file,
+)
+
+
+DAY = 24 * 60 * 60
+TASKS = [
+    {"id": 1, "description": "Купить молоко", "completed": True},
+    {"id": 2, "description": "Позвонить маме", "completed": False},
+    {"id": 3, "description": "Купить хлеб", "completed": True},
+    {"id": 4, "description": "Сделать домашку", "completed": True},
+]
+
+
+def make_file(tmp_path):
+    """Файл задач и время выполнения задач 1, 3, 4 (30, 10 и 1 день назад)."""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, TaskList(TASKS))
+    now = 100 * DAY
+    times = {1: now - 30 * DAY, 3: now - 10 * DAY, 4: now - DAY}
+    with open(get_done_times_filename(filename), "w", encoding="utf-8") as file:
+        json.dump(times, file)
+    return filename, now
+
+
+# ============================================================
+# ВРЕМЯ ВЫПОЛНЕНИЯ И ВЫБОР ЗАДАЧ
+# ============================================================
+
+def test_update_done_times_stamps_new_and_drops_reopened(tmp_path):
+    """Тест что новые выполненные получают время, а остальные выбрасываются."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = TaskList(TASKS)
+
+    assert update_done_times(filename, tasks, now=10) == {1: 10, 3: 10, 4: 10}
+    tasks[0]["completed"] = False
+    complete_task(tasks, 2)
+
+    assert update_done_times(filename, tasks, now=20) == {2: 20, 3: 10, 4: 10}
+    assert read_done_times(filename) == {2: 20, 3: 10, 4: 10}
+
+
+def test_save_session_records_done_times(tmp_path):
+    """Тест что конец сеанса отмечает выполненные задачи."""
+    filename = str(tmp_path / "tasks.json")
+
+    save_session(filename, TaskList(TASKS))
+
+    assert set(read_done_times(filename)) == {1, 3, 4}
+
+
+def test_select_by_age_and_by_count():
+    """Тест выбора по возрасту и по числу оставшихся выполненных."""
+    times = {1: 0, 3: 50, 4: 90}
+
+    assert select_for_archive(times, now=100, max_age=40) == [1, 3]
+    assert select_for_archive(times, now=100, keep=1) == [1, 3]
+    assert select_for_archive(times, now=100, max_age=60, keep=2) == [1]
+    assert select_for_archive(times, now=100, max_age=1000) == []
+    assert select_for_archive(times, now=100) == []
+
+
+# ============================================================
+# ФАЙЛ АРХИВА
+# ============================================================
+
+def test_archive_is_append_only_gzip(tmp_path):
+    """Тест что каждый перенос - отдельный gzip-блок в конце файла."""
+    filename = str(tmp_path / "archive.gz")
+
+    append_archive(filename, [{"id": 1, "description": "А"}])
+    size = (tmp_path / "archive.gz").stat().st_size
+    append_archive(filename, [{"id": 2, "description": "Б"}, {"id": 1, "restored": True}])
+
+    with open(filename, "rb") as file:
+        assert gzip.decompress(file.read(size)) == b'{"id": 1, "description": "\xd0\x90"}\n'
+    assert len(list(iter_archive(filename))) == 3
+    assert list(load_archive(filename)) == [2]
+
+
+def test_torn_archive_block_is_skipped(tmp_path):
+    """Тест что оборванный последний блок не ломает чтение архива."""
+    filename = str(tmp_path / "archive.gz")
+    append_archive(filename, [{"id": 1, "description": "А"}])
+    with open(filename, "ab") as file:
+        file.write(gzip.compress(b'{"id": 2, "description": "B"}\n')[:15])
+
+    assert list(load_archive(filename)) == [1]
+    assert list(load_archive(str(tmp_path / "missing.gz"))) == []
+
+
+# ============================================================
+# КОМАНДЫ
+# ============================================================
+
+def test_archive_tasks_moves_old_completed(tmp_path):
+    """Тест переноса: файл задач уменьшается, архив пополняется."""
+    filename, now = make_file(tmp_path)
+
+    assert archive_tasks(filename, max_age=7 * DAY, now=now) == 2
+
+    assert load_tasks_from_file(filename) == [TASKS[1], TASKS[3]]
+    archived = load_archive(get_archive_filename(filename))
+    assert list(archived) == [1, 3]
+    assert archived[1]["completed_at"] == now - 30 * DAY
+    assert archived[1]["archived_at"] == now
+    assert set(read_done_times(filename)) == {4}
+    assert archive_tasks(filename, max_age=7 * DAY, now=now) == 0
+
+
+def test_archive_tasks_by_count(tmp_path):
+    """Тест переноса лишних выполненных задач сверх keep."""
+    filename, now = make_file(tmp_path)
+
+    assert archive_tasks(filename, keep=1, now=now) == 2
+
+    assert [task["id"] for task in load_tasks_from_file(filename)] == [2, 4]
+
+
+def test_search_archive(tmp_path):
+    """Тест поиска по архиву теми же запросами, что и по задачам."""
+    filename, now = make_file(tmp_path)
+    archive_tasks(filename, keep=0, now=now)
+
+    assert [task["id"] for task in search_archive(filename, "купить")] == [1, 3]
+    assert [task["id"] for task in search_archive(filename, "дом*")] == [4]
+    assert search_archive(filename, "маме") == []
+
+
+def test_restore_task(tmp_path):
+    """Тест восстановления: задача возвращается с тем же ID и пропадает из архива."""
+    filename, now = make_file(tmp_path)
+    archive_tasks(filename, keep=0, now=now)
+
+    assert restore_task(filename, 3, reopen=True)
+    assert not restore_task(filename, 3)
+    assert not restore_task(filename, 99)
+
+    tasks = load_tasks_fast(filename)
+    assert tasks.get_by_id(3).to_dict() == {"id": 3, "description": "Купить хлеб", "completed": False}
+    assert list(load_archive(get_archive_filename(filename))) == [1, 4]
+    assert search_archive(filename, "хлеб") == []
+
+
+def test_archived_ids_are_not_reused(tmp_path):
+    """Тест что новая задача не получает ID задачи из архива."""
+    filename, now = make_file(tmp_path)
+    # Задача 4 - с наибольшим ID
+    assert archive_tasks(filename, keep=0, now=now) == 3
+
+    for load in (load_tasks_fast, load_tasks_streaming):
+        tasks = load(filename)
+        add_task(tasks, "Новая задача")
+        assert tasks[-1]["id"] == 5
+
+    # Добавление из журнала без ID тоже получает ID после архивных
+    record_task_change(filename, load_tasks_from_file(filename), {"op": "add", "description": "Из журнала"})
+    assert [task["id"] for task in load_tasks_fast(filename)] == [2, 5]
+
+    # Без файла next_id число считается по архиву
+    os.remove(get_next_id_filename(filename))
+    tasks = load_tasks_streaming(filename)
+    add_task(tasks, "Ещё одна")
+    assert tasks[-1]["id"] == 6
+    assert restore_task(filename, 4)
+
+
+def test_restore_rolls_back_when_marker_is_not_written(tmp_path, monkeypatch):
+    """Тест отката: отметка о восстановлении не записалась - задача остаётся только в архиве."""
+    filename, now = make_file(tmp_path)
+    archive_tasks(filename, keep=0, now=now)
+    append = task_archive.append_archive
+    monkeypatch.setattr(task_archive, "append_archive", lambda name, records: False)
+
+    assert not restore_task(filename, 3)
+
+    monkeypatch.setattr(task_archive, "append_archive", append)
+    assert [task["id"] for task in load_tasks_fast(filename)] == [2]
+    assert list(load_archive(get_archive_filename(filename))) == [1, 3, 4]
+    assert restore_task(filename, 3)
+
+
+def test_restore_rolls_back_on_os_error(tmp_path, monkeypatch):
+    """Тест отката: ошибка записи на любом шаге - False, а не исключение."""
+    import task_sync
+
+    filename, now = make_file(tmp_path)
+    archive_tasks(filename, keep=0, now=now)
+    bump_version = task_sync.bump_version
+    calls = []
+
+    def failing_bump_version(name):
+        calls.append(name)
+        if len(calls) == 1:
+            raise OSError("диск заполнен")
+        return bump_version(name)
+
+    monkeypatch.setattr(task_sync, "bump_version", failing_bump_version)
+
+    assert not restore_task(filename, 3)
+    assert [task["id"] for task in load_tasks_fast(filename)] == [2]
+    assert 3 in load_archive(get_archive_filename(filename))
@@ -0,0 +1,197 @@
+"""
+Тесты для компактного списка задач
+
+Запустить: pytest test_task_list.py -v
+
+TaskList должен работать с теми же чистыми функциями,
+что и обычный список словарей.
+"""
+
+import json
+
+import task_list
+from task_list import TaskList, TaskView
+from task_manager_testable import (
+    add_task,
+    get_task_by_index,
+    complete_task,
+    delete_task,
+    get_task_by_id,
+    complete_task_by_id,
+    delete_task_by_id,
+    format_task_list,
+    load_tasks_from_file,
+    save_tasks_to_file,
+)
+
+
+def make_task_list():
+    """Создаёт TaskList с тремя задачами."""
+    return TaskList([
+        {"description": "Task 1", "completed": False},
+        {"description": "Task 2", "completed": True},
+        {"description": "Task 3", "completed": False},
+    ])
+
+
+# ============================================================
+# Тесты контейнера
+# ============================================================
+
+def test_task_list_behaves_like_list_of_dicts():
+    """Тест что TaskList хранит и отдаёт те же данные."""
+    tasks = make_task_list()
+    
+    assert len(tasks) == 3
+    assert tasks[0]["description"] == "Task 1"
+    assert tasks[1]["completed"]
+    assert tasks[-1]["description"] == "Task 3"
+    assert tasks == make_task_list().to_dicts()
+
+
+def test_task_view_is_slotted():
+    """Тест что представление задачи не заводит словарь на задачу."""
+    view = make_task_list()[0]
+    
+    assert isinstance(view, TaskView)
+    assert not hasattr(view, "__dict__")
+    assert view == {"id": 1, "description": "Task 1", "completed": False}
+
+
+def test_task_list_pop_returns_dict():
+    """Тест что pop удаляет задачу и возвращает обычный словарь."""
+    tasks = make_task_list()
+    
+    assert tasks.pop(0) == {"id": 1, "description": "Task 1", "completed": False}
+    assert len(tasks) == 2
+    assert tasks[0]["description"] == "Task 2"
+
+
+# ============================================================
+# Тесты стабильных ID и надгробий
+# ============================================================
+
+def test_ids_survive_deletion():
+    """Тест что удаление не меняет ID остальных задач."""
+    tasks = make_task_list()
+    
+    delete_task(tasks, 1)
+    
+    assert [task.id for task in tasks] == [2, 3]
+    assert get_task_by_id(tasks, 3)["description"] == "Task 3"
+    assert get_task_by_id(tasks, 1) is None
+
+
+def test_numbering_is_overlay_over_live_tasks():
+    """Тест что номера 1, 2, 3... идут подряд поверх надгробий."""
+    tasks = TaskList()
+    for i in range(1, 11):
+        add_task(tasks, f"Task {i}")
+    
+    delete_task(tasks, 1)
+    delete_task(tasks, 4)
+    
+    assert get_task_by_index(tasks, 1)["description"] == "Task 2"
+    assert get_task_by_index(tasks, 4)["description"] == "Task 6"
+    assert tasks.position_of(6) == 4
+    assert format_task_list(tasks)[0] == "1. [ ] Task 2"
+    assert len(format_task_list(tasks)) == 8
+
+
+def test_append_after_deletion_keeps_positions():
+    """Тест что новые задачи встают в конец и после удалений."""
+    tasks = make_task_list()
+    delete_task(tasks, 2)
+    
+    add_task(tasks, "Task 4")
+    
+    assert get_task_by_index(tasks, 3)["description"] == "Task 4"
+    assert get_task_by_index(tasks, 3).id == 4
+    assert tasks.position_of(4) == 3
+
+
+def test_complete_and_delete_by_id():
+    """Тест операций по ID."""
+    tasks = make_task_list()
+    
+    assert complete_task_by_id(tasks, 3)
+    assert tasks[2]["completed"]
+    assert delete_task_by_id(tasks, 2)
+    assert not delete_task_by_id(tasks, 2)
+    assert not complete_task_by_id(tasks, 42)
+    assert [task["description"] for task in tasks] == ["Task 1", "Task 3"]
+
+
+def test_by_id_functions_accept_plain_list():
+    """Тест что функции по ID работают и со списком словарей."""
+    tasks = [
+        {"id": 7, "description": "Task 1", "completed": False},
+        {"id": 9, "description": "Task 2", "completed": False},
+    ]
+    
+    assert complete_task_by_id(tasks, 9)
+    assert delete_task_by_id(tasks, 7)
+    assert tasks == [{"id": 9, "description": "Task 2", "completed": True}]
+
+
+def test_tombstones_are_compacted_lazily(monkeypatch):
+    """Тест что надгробия убираются, когда их больше живых задач."""
+    monkeypatch.setattr(task_list, "COMPACT_MIN_TOMBSTONES", 4)
+    tasks = TaskList({"description": f"Task {i}", "completed": False} for i in range(10))
+    
+    for _ in range(6):
+        delete_task(tasks, 1)
+    
+    assert tasks._tombstones == 0
+    assert [task.id for task in tasks] == [7, 8, 9, 10]
+    assert get_task_by_id(tasks, 8)["description"] == "Task 7"
+
+
+# ============================================================
+# Тесты совместимости с чистыми функциями
+# ============================================================
+
+def test_pure_functions_accept_task_list():
+    """Тест что чистые функции работают с TaskList без изменений."""
+    tasks = TaskList()
+    
+    assert add_task(tasks, "  Task 1  ")
+    assert add_task(tasks, "Task 2")
+    assert not add_task(tasks, "")
+    assert get_task_by_index(tasks, 1)["description"] == "Task 1"
+    assert get_task_by_index(tasks, 3) is None
+    
+    assert complete_task(tasks, 2)
+    assert tasks[1]["completed"]
+    
+    assert delete_task(tasks, 1)
+    assert not delete_task(tasks, 5)
+    assert format_task_list(tasks) == ["1. [✓] Task 2"]
+
+
+def test_task_list_round_trip_through_json(tmp_path):
+    """Тест что TaskList сохраняется в тот же JSON, что и список словарей."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = make_task_list()
+    
+    assert save_tasks_to_file(filename, tasks)
+    assert load_tasks_from_file(filename) == tasks.to_dicts()
+
+
+def test_save_streams_rows_in_json_dump_format(tmp_path, monkeypatch):
+    """Тест что сохранение не собирает список словарей и пишет тот же JSON."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = make_task_list()
+    expected = json.dumps(tasks.to_dicts(), indent=2, ensure_ascii=False)
+    
+    def fail(self):
+        raise AssertionError("to_dicts() не должен вызываться при сохранении")
+    
+    monkeypatch.setattr(TaskList, "to_dicts", fail)
+    assert save_tasks_to_file(filename, tasks)
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == expected
+    
+    assert save_tasks_to_file(filename, TaskList())
+    with open(filename, encoding="utf-8") as file:
+        assert file.read() == "[]"
@@ -7,6 +7,15 @@
 делает код намного легче для тестирования.
 """
 
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import task_manager_testable
 from task_manager_testable import (
     validate_task_description,
     create_task_dict,
@@ -14,7 +23,28 @@ from task_manager_testable import (
     get_task_by_index,
     complete_task,
     delete_task,
+    add_tasks,
+    complete_tasks,
+    delete_tasks,
     format_task_list,
+    iter_task_lines,
+    count_pages,
+    format_task_page,
+    parse_page_command,
+    load_tasks_from_file,
+    save_tasks_to_file,
+    validate_task_dict,
+    iter_tasks_from_file,
+    load_tasks_streaming,
+    get_journal_filename,
+    apply_journal_record,
+    record_task_change,
+    deferred_save,
+    parse_command,
+    execute_command,
+    run_batch,
+    build_parser,
+    main_batch,
 )
 
 
@@ -203,6 +233,99 @@ def test_delete_task_last():
     assert tasks[0]["description"] == "Task 1"
 
 
+# ============================================================
+# Тесты пакетных изменений
+# ============================================================
+
+def test_add_tasks_valid():
+    """Тест добавления пачки задач."""
+    tasks = []
+    
+    assert add_tasks(tasks, (f"Task {i}" for i in range(3)))
+    assert [task["description"] for task in tasks] == ["Task 0", "Task 1", "Task 2"]
+
+
+def test_add_tasks_is_atomic():
+    """Тест что при одном невалидном описании не добавляется ничего."""
+    tasks = []
+    
+    assert not add_tasks(tasks, ["Task 1", "   ", "Task 3"])
+    assert tasks == []
+
+
+def test_complete_tasks():
+    """Тест выполнения пачки задач и атомарности."""
+    tasks = [{"description": f"Task {i}", "completed": False} for i in range(1, 4)]
+    
+    assert not complete_tasks(tasks, [1, 4])
+    assert not tasks[0]["completed"]
+    
+    assert complete_tasks(tasks, [1, 3])
+    assert [task["completed"] for task in tasks] == [True, False, True]
+
+
+def test_delete_tasks_uses_original_numbering():
+    """Тест что индексы относятся к списку до удаления."""
+    tasks = [{"description": f"Task {i}", "completed": False} for i in range(1, 6)]
+    
+    assert delete_tasks(tasks, [1, 3, 3, 5])
+    assert [task["description"] for task in tasks] == ["Task 2", "Task 4"]
+
+
+def test_delete_tasks_is_atomic():
+    """Тест что при одном невалидном индексе не удаляется ничего."""
+    tasks = [{"description": "Task 1", "completed": False}]
+    
+    assert not delete_tasks(tasks, [1, 2])
+    assert len(tasks) == 1
+
+
+def test_deferred_save_saves_once(tmp_path, monkeypatch):
+    """Тест что пакет сохраняется один раз, в конце."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = []
+    saves = []
+    original_save = task_manager_testable.save_tasks_to_file
+    
+    def counting_save(name, items):
+        saves.append(len(items))
+        return original_save(name, items)
+    
+    monkeypatch.setattr(task_manager_testable, "save_tasks_to_file", counting_save)
+    
+    with deferred_save(filename, tasks):
+        add_tasks(tasks, ["Task 1", "Task 2", "Task 3"])
+        complete_tasks(tasks, [2])
+        delete_tasks(tasks, [1])
+    
+    assert saves == [2]
+    assert load_tasks_from_file(filename) == tasks
+
+
+def test_deferred_save_skips_save_on_error(tmp_path):
+    """Тест что прерванный исключением пакет не сохраняется."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = [{"description": "Task 1", "completed": False}]
+    save_tasks_to_file(filename, tasks)
+    
+    with pytest.raises(ValueError):
+        with deferred_save(filename, tasks):
+            add_tasks(tasks, ["Task 2"])
+            raise ValueError("пакет прерван")
+    
+    assert load_tasks_from_file(filename) == [{"description": "Task 1", "completed": False}]
+
+
+def test_deferred_save_raises_when_save_fails(tmp_path):
+    """Тест что неудачное сохранение пакета не проходит молча."""
+    filename = str(tmp_path / "missing" / "tasks.json")
+    tasks = []
+    
+    with pytest.raises(OSError):
+        with deferred_save(filename, tasks):
+            add_tasks(tasks, ["Task 1"])
+
+
 # ============================================================
 # Тесты форматирования
 # ============================================================
@@ -248,3 +371,353 @@ def test_format_task_list_numbering():
     assert lines[0].startswith("1.")
     assert lines[1].startswith("2.")
     assert lines[2].startswith("3.")
+
+
+def test_iter_task_lines_window():
+    """Тест что окно форматирует только нужные задачи с верной нумерацией."""
+    tasks = [{"description": f"Task {i}", "completed": False} for i in range(1, 11)]
+    
+    lines = list(iter_task_lines(tasks, offset=3, limit=2))
+    
+    assert lines == ["4. [ ] Task 4", "5. [ ] Task 5"]
+    assert list(iter_task_lines(tasks, offset=9, limit=5)) == ["10. [ ] Task 10"]
+    assert list(iter_task_lines(tasks, offset=20, limit=5)) == []
+
+
+def test_iter_task_lines_is_lazy():
+    """Тест что строки форматируются по запросу, а не все сразу."""
+    tasks = [{"description": "Task 1", "completed": False}, {"description": "Task 2"}]
+    
+    # У второй задачи нет "completed" - это всплыло бы только при форматировании
+    lines = iter_task_lines(tasks)
+    assert next(lines) == "1. [ ] Task 1"
+
+
+# ============================================================
+# Тесты постраничного вывода
+# ============================================================
+
+def test_count_pages():
+    """Тест подсчёта страниц."""
+    assert count_pages([], 20) == 1
+    assert count_pages([{}] * 20, 20) == 1
+    assert count_pages([{}] * 21, 20) == 2
+
+
+def test_format_task_page():
+    """Тест что страница содержит заголовок и только свои задачи."""
+    tasks = [{"description": f"Task {i}", "completed": False} for i in range(1, 6)]
+    
+    text = format_task_page(tasks, 2, 2)
+    
+    assert "страница 2 из 3" in text
+    assert "3. [ ] Task 3" in text
+    assert "4. [ ] Task 4" in text
+    assert "Task 5" not in text
+
+
+def test_parse_page_command():
+    """Тест команд постраничного просмотра."""
+    assert parse_page_command("n", 1, 3) == 2
+    assert parse_page_command("n", 3, 3) == 3
+    assert parse_page_command("p", 1, 3) == 1
+    assert parse_page_command(" 3 ", 1, 5) == 3
+    assert parse_page_command("99", 1, 5) == 5
+    assert parse_page_command("abc", 2, 5) == 2
+    assert parse_page_command("", 2, 5) is None
+    assert parse_page_command("q", 2, 5) is None
+
+
+# ============================================================
+# Тесты журнала операций
+# ============================================================
+
+def test_apply_journal_record():
+    """Тест применения записей журнала к списку задач."""
+    tasks = []
+    
+    assert apply_journal_record(tasks, {"op": "add", "description": "Task 1"})
+    assert apply_journal_record(tasks, {"op": "add", "description": "Task 2"})
+    assert apply_journal_record(tasks, {"op": "complete", "index": 2})
+    assert apply_journal_record(tasks, {"op": "delete", "index": 1})
+    
+    assert tasks == [{"description": "Task 2", "completed": True}]
+
+
+def test_apply_journal_record_invalid():
+    """Тест что невалидные записи журнала не применяются."""
+    tasks = []
+    
+    assert not apply_journal_record(tasks, {"op": "unknown"})
+    assert not apply_journal_record(tasks, {"op": "delete", "index": 1})
+    assert not apply_journal_record(tasks, "add")
+    assert tasks == []
+
+
+def test_record_task_change_appends_to_journal(tmp_path):
+    """Тест что изменения дописываются в журнал, а снимок не трогается."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = [{"description": "Task 1", "completed": False}]
+    save_tasks_to_file(filename, tasks)
+    snapshot = open(filename, encoding="utf-8").read()
+    
+    add_task(tasks, "Task 2")
+    assert record_task_change(filename, tasks, {"op": "add", "description": "Task 2"})
+    complete_task(tasks, 1)
+    assert record_task_change(filename, tasks, {"op": "complete", "index": 1})
+    
+    assert open(filename, encoding="utf-8").read() == snapshot
+    assert load_tasks_from_file(filename) == tasks
+
+
+def test_load_tasks_ignores_torn_journal_line(tmp_path):
+    """Тест что недописанная строка журнала не ломает загрузку."""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [])
+    with open(get_journal_filename(filename), "w", encoding="utf-8") as file:
+        file.write('{"op": "add", "description": "Task 1"}\n{"op": "add", "desc')
+    
+    assert load_tasks_from_file(filename) == [{"description": "Task 1", "completed": False}]
+
+
+def test_journal_is_compacted_past_threshold(tmp_path, monkeypatch):
+    """Тест что журнал сворачивается в снимок после порога."""
+    monkeypatch.setattr(task_manager_testable, "JOURNAL_COMPACT_BYTES", 100)
+    filename = str(tmp_path / "tasks.json")
+    tasks = []
+    
+    for i in range(10):
+        add_task(tasks, f"Task {i}")
+        record_task_change(filename, tasks, {"op": "add", "description": f"Task {i}"})
+    
+    # Снимок был переписан хотя бы раз, а не только журнал
+    with open(filename, encoding="utf-8") as file:
+        assert len(json.load(file)) > 0
+    assert load_tasks_from_file(filename) == tasks
+
+
+def test_failed_compaction_keeps_journaled_change(tmp_path, monkeypatch):
+    """Тест что изменение, записанное в журнал, сохранено, даже если сворачивание не удалось."""
+    monkeypatch.setattr(task_manager_testable, "JOURNAL_COMPACT_BYTES", 10)
+    monkeypatch.setattr(task_manager_testable, "compact_journal", lambda filename, tasks: False)
+    filename = str(tmp_path / "tasks.json")
+    tasks = []
+    add_task(tasks, "Task 1")
+    
+    assert record_task_change(filename, tasks, {"op": "add", "description": "Task 1"})
+    assert load_tasks_from_file(filename) == tasks
+
+
+def test_append_after_torn_journal_line(tmp_path):
+    """Тест что запись после недописанной строки журнала не теряется."""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [])
+    with open(get_journal_filename(filename), "w", encoding="utf-8") as file:
+        file.write('{"op": "add", "description": "Task 1"}\n{"op": "add", "desc')
+    tasks = load_tasks_from_file(filename)
+    
+    add_task(tasks, "Task 2")
+    assert record_task_change(filename, tasks, {"op": "add", "description": "Task 2"})
+    
+    assert load_tasks_from_file(filename) == tasks
+    assert [task["description"] for task in tasks] == ["Task 1", "Task 2"]
+
+
+@pytest.mark.parametrize("snapshot_replaced", [False, True])
+def test_interrupted_compaction_does_not_replay_journal_twice(tmp_path, snapshot_replaced):
+    """Тест что сбой посреди сворачивания не применяет журнал повторно."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = []
+    save_tasks_to_file(filename, tasks)
+    add_task(tasks, "Task 1")
+    record_task_change(filename, tasks, {"op": "add", "description": "Task 1"})
+    journal = get_journal_filename(filename)
+    
+    # Состояние после сбоя: новый снимок записан, журнал помечен,
+    # а снимок подменён (или ещё нет)
+    with open(filename + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(tasks, file)
+    os.replace(journal, journal + task_manager_testable.COMPACTING_SUFFIX)
+    if snapshot_replaced:
+        os.replace(filename + ".tmp", filename)
+    
+    assert load_tasks_from_file(filename) == tasks
+    assert not os.path.exists(journal + task_manager_testable.COMPACTING_SUFFIX)
+    assert [task["description"] for task in load_tasks_streaming(filename)] == ["Task 1"]
+
+
+# ============================================================
+# Тесты потоковой загрузки
+# ============================================================
+
+def write_text(path, text):
+    """Записывает текст в файл в UTF-8."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_validate_task_dict():
+    """Тест проверки загруженных задач."""
+    assert validate_task_dict({"description": "Task 1", "completed": False})
+    assert validate_task_dict({"description": "Task 1"})
+    assert not validate_task_dict({"description": "", "completed": False})
+    assert not validate_task_dict({"description": "Task 1", "completed": "yes"})
+    assert not validate_task_dict(["Task 1"])
+
+
+def test_iter_tasks_from_file_small_chunks(tmp_path):
+    """Тест что задачи разбираются правильно при любом размере порции."""
+    filename = str(tmp_path / "tasks.json")
+    tasks = [{"description": f"Задача {i} — купить молоко", "completed": i % 2 == 0} for i in range(50)]
+    save_tasks_to_file(filename, tasks)
+    
+    for chunk_size in (1, 7, 64, 100000):
+        assert list(iter_tasks_from_file(filename, chunk_size=chunk_size)) == tasks
+
+
+def test_iter_tasks_from_file_skips_invalid_items(tmp_path):
+    """Тест что невалидные элементы массива пропускаются."""
+    filename = str(tmp_path / "tasks.json")
+    write_text(filename, '[{"description": "A", "completed": false}, 12345, "x", {"description": ""},'
+                         ' {"description": "B", "completed": true}]')
+    
+    descriptions = [task["description"] for task in iter_tasks_from_file(filename, chunk_size=3)]
+    assert descriptions == ["A", "B"]
+
+
+def test_iter_tasks_from_file_rejects_bad_files(tmp_path):
+    """Тест что повреждённый файл и не-массив дают JSONDecodeError."""
+    truncated = str(tmp_path / "truncated.json")
+    write_text(truncated, '[{"description": "A", "completed": false}, {"descr')
+    not_a_list = str(tmp_path / "object.json")
+    write_text(not_a_list, '{"description": "A"}')
+    
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_tasks_from_file(truncated, chunk_size=8))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_tasks_from_file(not_a_list))
+
+
+def test_load_tasks_streaming_shows_first_page(tmp_path):
+    """Тест что первая страница показывается до конца загрузки."""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [{"description": f"Task {i}", "completed": False} for i in range(5)])
+    record_task_change(filename, [], {"op": "complete", "index": 1})
+    pages = []
+    
+    tasks = load_tasks_streaming(filename, on_first_page=lambda loaded: pages.append(len(loaded)), page_size=2)
+    
+    assert pages == [2]
+    assert len(tasks) == 5
+    assert tasks[0]["completed"]
+
+
+def test_load_tasks_streaming_missing_file(tmp_path):
+    """Тест что отсутствующий файл даёт пустой список."""
+    assert len(load_tasks_streaming(str(tmp_path / "missing.json"))) == 0
+
+
+# ============================================================
+# Тесты пакетного режима
+# ============================================================
+
+def test_parse_command():
+    """Тест разбора команд пакетного режима."""
+    assert parse_command("add купить молоко\n") == ("add", "купить молоко")
+    assert parse_command("DONE 3") == ("done", 3)
+    assert parse_command("rm abc") == ("rm", None)
+    assert parse_command("list") == ("list", None)
+    assert parse_command("   ") == (None, None)
+    assert parse_command("# комментарий") == (None, None)
+
+
+def test_execute_command():
+    """Тест выполнения команд и записей журнала для них."""
+    tasks = []
+    
+    assert execute_command(tasks, "add Task 1") == ({"op": "add", "description": "Task 1"}, [], None)
+    assert execute_command(tasks, "done 1") == ({"op": "complete", "index": 1}, [], None)
+    assert execute_command(tasks, "list") == (None, ["1. [✓] Task 1"], None)
+    assert execute_command(tasks, "rm 2") == (None, [], "неверный номер задачи")
+    assert execute_command(tasks, "add") == (None, [], "задача не может быть пустой")
+    assert execute_command(tasks, "jump 1")[2] == "неизвестная команда: jump"
+
+
+def test_run_batch(tmp_path):
+    """Тест что поток команд выполняется и сохраняется в конце."""
+    filename = str(tmp_path / "tasks.json")
+    commands = ["add Task 1", "add Task 2", "add Task 3", "done 2", "rm 1", "rm 9", "list"]
+    out = io.StringIO()
+    errors = io.StringIO()
+    
+    failed = run_batch(commands, [], filename, out=out, errors=errors)
+    
+    assert failed == 1
+    assert out.getvalue() == "1. [✓] Task 2\n2. [ ] Task 3\n"
+    assert errors.getvalue() == "строка 6: неверный номер задачи\n"
+    assert [task["description"] for task in load_tasks_from_file(filename)] == ["Task 2", "Task 3"]
+
+
+def test_run_batch_saves_every_n_changes(tmp_path, monkeypatch):
+    """Тест что изменения сбрасываются в журнал пачками по N."""
+    filename = str(tmp_path / "tasks.json")
+    batches = []
+    monkeypatch.setattr(task_manager_testable, "record_task_changes",
+                        lambda name, tasks, records: batches.append(len(records)))
+    
+    run_batch([f"add Task {i}" for i in range(7)] + ["list"], [], filename, save_every=3, out=io.StringIO())
+    
+    assert batches == [3, 3]
+    assert len(load_tasks_from_file(filename)) == 7
+
+
+def test_run_batch_raises_when_save_fails(tmp_path, monkeypatch):
+    """Тест что неудачное сохранение в конце пакета не проходит молча."""
+    monkeypatch.setattr(task_manager_testable, "save_session", lambda name, tasks: False)
+    
+    with pytest.raises(OSError):
+        run_batch(["add Task 1"], [], str(tmp_path / "tasks.json"), out=io.StringIO())
+
+
+def test_main_batch_fails_when_save_fails(tmp_path, monkeypatch, capsys):
+    """Тест что код выхода пакетного режима учитывает неудачное сохранение."""
+    commands = tmp_path / "commands.txt"
+    commands.write_text("add Task 1\n", encoding="utf-8")
+    args = build_parser().parse_args([
+        "--batch", str(commands), "--tasks", str(tmp_path / "tasks.json"),
+        "--cache-dir", str(tmp_path / "cache"),
+    ])
+    monkeypatch.setattr(task_manager_testable, "save_session", lambda name, tasks: False)
+    
+    assert main_batch(args) == 1
+    assert "Не удалось сохранить задачи" in capsys.readouterr().err
+
+
+def test_batch_reports_missing_command_file(tmp_path):
+    """Тест что отсутствующий файл команд - понятная ошибка, а не traceback."""
+    script = os.path.join(os.path.dirname(__file__), "task_manager_testable.py")
+    
+    result = subprocess.run(
+        [sys.executable, script, "--batch", "missing.txt", "--tasks", "tasks.json"],
+        cwd=tmp_path, input="", capture_output=True, text=True, timeout=30,
+    )
+    
+    assert result.returncode == 1
+    assert "не удалось открыть файл команд missing.txt" in result.stderr
+    assert "Traceback" not in result.stderr
+    assert not (tmp_path / "tasks.json").exists()
+
+
+@pytest.mark.parametrize("batch_args", [["--batch", "commands.txt"], ["--batch=commands.txt"]])
+def test_batch_flag_forms_run_batch_mode(tmp_path, batch_args):
+    """Тест что --batch ФАЙЛ и --batch=ФАЙЛ оба запускают пакетный режим."""
+    (tmp_path / "commands.txt").write_text("add Task 1\nlist\n", encoding="utf-8")
+    script = os.path.join(os.path.dirname(__file__), "task_manager_testable.py")
+    
+    result = subprocess.run(
+        [sys.executable, script, *batch_args, "--tasks", "tasks.json"],
+        cwd=tmp_path, input="", capture_output=True, text=True, timeout=30,
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "1. [ ] Task 1\n"
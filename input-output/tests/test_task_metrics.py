@@ -0,0 +1,219 @@
+"""
+Тесты для замеров времени и объёма I/O
+
+Запустить: pytest test_task_metrics.py -v
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import task_manager_testable
+import task_offsets
+from task_list import TaskList
+from task_metrics import (
+    ACTION_FUNCTIONS,
+    DEFAULT_METRICS_FILE,
+    IO_FUNCTIONS,
+    MODULE_FUNCTIONS,
+    LatencyHistogram,
+    Metrics,
+    enable_metrics,
+    instrument,
+    split_metrics_option,
+)
+
+
+# ============================================================
+# ГИСТОГРАММА
+# ============================================================
+
+def test_histogram_percentiles():
+    """Процентили точны до 5%"""
+    histogram = LatencyHistogram()
+    for millisecond in range(1, 101):
+        histogram.add(millisecond / 1000)
+
+    assert histogram.count == 100
+    assert abs(histogram.percentile(50) - 0.050) <= 0.050 * 0.05
+    assert abs(histogram.percentile(95) - 0.095) <= 0.095 * 0.05
+    assert histogram.percentile(100) == 0.1
+
+
+def test_histogram_empty():
+    """Пустая гистограмма даёт нули"""
+    assert LatencyHistogram().summary()["p99_ms"] == 0.0
+
+
+# ============================================================
+# ВКЛЮЧЕНИЕ
+# ============================================================
+
+def test_split_metrics_option_flag():
+    """Флаг --metrics убирается из аргументов"""
+    assert split_metrics_option(["--metrics", "--batch"], {}) == (
+        DEFAULT_METRICS_FILE, ["--batch"]
+    )
+    assert split_metrics_option(["--metrics=m.json"], {}) == ("m.json", [])
+
+
+def test_split_metrics_option_environment():
+    """Переменная окружения задаёт файл"""
+    assert split_metrics_option([], {"TASK_MANAGER_METRICS": "m.json"}) == ("m.json", [])
+    assert split_metrics_option([], {}) == (None, [])
+
+
+def test_disabled_metrics_leave_functions_untouched():
+    """Без флага функции не подменяются"""
+    namespace = {"add_task": task_manager_testable.add_task}
+
+    metrics, argv = enable_metrics(namespace, ["--batch"], {})
+
+    assert metrics is None
+    assert argv == ["--batch"]
+    assert namespace["add_task"] is task_manager_testable.add_task
+
+
+# ============================================================
+# ЗАМЕРЫ
+# ============================================================
+
+def test_instrument_counts_calls_and_bytes(tmp_path):
+    """Обёртки считают вызовы, время и байты"""
+    namespace = dict(vars(task_manager_testable))
+    metrics = Metrics()
+    instrument(namespace, metrics)
+    filename = str(tmp_path / "tasks.json")
+
+    tasks = []
+    namespace["add_task"](tasks, "Купить молоко")
+    namespace["save_tasks_to_file"](filename, tasks)
+    assert namespace["load_tasks_from_file"](filename) == tasks
+
+    summary = metrics.summary()
+    assert summary["calls"]["add_task"]["count"] == 1
+    assert summary["calls"]["save_tasks_to_file"]["count"] == 1
+    assert summary["bytes_written"] > 0
+    assert summary["bytes_read"] == summary["bytes_written"]
+
+
+def test_instrumented_names_exist():
+    """Каждая замеряемая функция есть в своём модуле"""
+    for name in IO_FUNCTIONS + ACTION_FUNCTIONS:
+        assert callable(getattr(task_manager_testable, name)), name
+    for name in MODULE_FUNCTIONS["task_offsets"]:
+        assert callable(getattr(task_offsets, name)), name
+
+
+def instrument_modules(monkeypatch, metrics):
+    """Подменяет функции в самих модулях (monkeypatch вернёт их после теста)."""
+    for module, names in (
+        (task_manager_testable, IO_FUNCTIONS + ACTION_FUNCTIONS),
+        (task_offsets, MODULE_FUNCTIONS["task_offsets"]),
+    ):
+        namespace = {name: getattr(module, name) for name in names}
+        instrument(namespace, metrics, names)
+        for name, wrapper in namespace.items():
+            monkeypatch.setattr(module, name, wrapper)
+
+
+def test_every_loader_counts_bytes_read(tmp_path, monkeypatch):
+    """Снимок, ленивая и потоковая загрузка считают прочитанные байты"""
+    filename = str(tmp_path / "tasks.json")
+    tasks = TaskList([{"description": "Купить молоко", "completed": False}])
+    task_manager_testable.save_session(filename, tasks)
+    task_manager_testable.append_journal_record(filename, {"op": "complete", "index": 1})
+    journal = os.path.getsize(filename + ".log")
+    metrics = Metrics()
+    instrument_modules(monkeypatch, metrics)
+
+    assert task_manager_testable.load_tasks_fast(filename)[0]["completed"]
+    assert metrics.bytes_read == os.path.getsize(filename + ".bin") + journal
+
+    os.remove(filename + ".bin")
+    metrics.bytes_read = 0
+    assert task_manager_testable.load_tasks_fast(filename, lazy=True)[0]["completed"]
+    assert metrics.bytes_read == os.path.getsize(filename + ".idx") + journal
+
+    metrics.bytes_read = 0
+    assert task_manager_testable.load_tasks_fast(filename)[0]["completed"]
+    assert metrics.bytes_read == os.path.getsize(filename) + journal
+    assert metrics.summary()["calls"]["replay_journal"]["count"] == 3
+
+
+def test_paging_time_excludes_user_input(monkeypatch, capsys):
+    """Замеряется вывод страницы, а не ожидание ввода между страницами"""
+    tasks = TaskList([{"description": f"Задача {i}", "completed": False} for i in range(30)])
+    answers = iter(["n", ""])
+
+    def slow_input(prompt):
+        time.sleep(0.05)
+        return next(answers)
+
+    monkeypatch.setattr("builtins.input", slow_input)
+    metrics = Metrics()
+    instrument_modules(monkeypatch, metrics)
+
+    task_manager_testable.display_tasks(tasks, page_size=20)
+
+    calls = metrics.summary()["calls"]
+    assert "display_tasks" not in calls
+    assert calls["format_task_page"]["count"] == 2
+    assert calls["format_task_page"]["max_ms"] < 50
+    assert "страница 2 из 2" in capsys.readouterr().out
+
+
+def test_instrument_counts_errors():
+    """Исключение учитывается и пробрасывается дальше"""
+    def broken():
+        raise ValueError("сломано")
+
+    namespace = {"format_task_list": broken}
+    metrics = Metrics()
+    instrument(namespace, metrics)
+
+    try:
+        namespace["format_task_list"]()
+    except ValueError:
+        pass
+    assert metrics.summary()["errors"] == {"format_task_list": 1}
+    assert metrics.summary()["calls"]["format_task_list"]["count"] == 1
+
+
+def test_metrics_dump(tmp_path):
+    """Статистика сохраняется в JSON"""
+    metrics = Metrics()
+    metrics.record("add_task", 0.001)
+    filename = tmp_path / "metrics.json"
+
+    assert metrics.dump(str(filename))
+    data = json.loads(filename.read_text(encoding="utf-8"))
+    assert data["calls"]["add_task"]["count"] == 1
+
+
+def test_metrics_of_interactive_script(tmp_path):
+    """Запуск скрипта с --metrics учитывает загрузку, сохранение и действия меню"""
+    task_manager_testable.save_tasks_to_file(
+        str(tmp_path / "tasks.json"), [{"description": "Купить молоко", "completed": False}]
+    )
+    script = os.path.join(os.path.dirname(__file__), "task_manager_testable.py")
+
+    result = subprocess.run(
+        [sys.executable, script, "--metrics=m.json", "--cache-dir", str(tmp_path / "cache")],
+        cwd=tmp_path, input="2\nПозвонить маме\n3\n1\n6\n",
+        capture_output=True, text=True, timeout=30,
+    )
+
+    assert result.returncode == 0, result.stderr
+    data = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    calls = data["calls"]
+    for name in ("load_tasks_fast", "load_tasks_cached", "save_session",
+                 "save_tasks_to_file", "add_task", "complete_task_by_id",
+                 "record_task_changes", "format_task_list"):
+        assert calls[name]["count"] >= 1, name
+    # Время ожидания ввода в меню в замеры не попадает
+    assert "display_tasks" not in calls
+    assert data["bytes_read"] > 0
+    assert data["bytes_written"] > 0
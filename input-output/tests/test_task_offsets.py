@@ -0,0 +1,256 @@
+"""
+Тесты для ленивой загрузки описаний по индексу смещений
+
+Запустить: pytest test_task_offsets.py -v
+"""
+
+import json
+import os
+import time
+
+import task_offsets
+from task_list import TaskList
+from task_manager_testable import (
+    add_task,
+    load_tasks_streaming,
+    complete_task,
+    delete_task,
+    format_task_list,
+    load_tasks_fast,
+    build_parser,
+    load_tasks_from_file,
+    record_task_change,
+    save_tasks_to_file,
+)
+from task_offsets import (
+    LazyDescriptions,
+    build_offset_index,
+    get_index_filename,
+    load_tasks_lazy,
+)
+from task_sync import SharedTaskFile
+
+
+def make_tasks():
+    return [
+        {"id": 1, "description": "Купить молоко", "completed": False},
+        {"id": 2, "description": 'Скобки { } и "кавычки" \\ слэш', "completed": True},
+        {"id": 5, "description": "Emoji 🎮 и\nперевод строки", "completed": False},
+    ]
+
+
+# ============================================================
+# ИНДЕКС
+# ============================================================
+
+def test_lazy_load_matches_regular_load(tmp_path):
+    """Ленивая загрузка даёт те же задачи, что и обычная"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, make_tasks())
+
+    tasks = load_tasks_lazy(filename)
+
+    assert isinstance(tasks._descriptions, LazyDescriptions)
+    assert tasks == load_tasks_from_file(filename)
+    assert os.path.exists(get_index_filename(filename))
+
+
+def test_lazy_load_without_ids(tmp_path):
+    """Старые файлы без ID получают ID по порядку"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [
+        {"description": "A", "completed": False},
+        {"description": "B", "completed": True},
+    ])
+
+    tasks = load_tasks_lazy(filename)
+
+    assert tasks.to_dicts() == [
+        {"id": 1, "description": "A", "completed": False},
+        {"id": 2, "description": "B", "completed": True},
+    ]
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    """После изменения tasks.json индекс строится заново"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, make_tasks())
+    load_tasks_lazy(filename)
+
+    save_tasks_to_file(filename, [{"id": 1, "description": "Новое", "completed": False}])
+
+    assert [task["description"] for task in load_tasks_lazy(filename)] == ["Новое"]
+
+
+def test_save_writes_index(tmp_path, monkeypatch):
+    """Сохранение TaskList пишет тот же индекс, что строится разбором файла"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, TaskList(make_tasks()))
+    with open(get_index_filename(filename), "rb") as file:
+        saved = file.read()
+
+    assert build_offset_index(filename)
+    with open(get_index_filename(filename), "rb") as file:
+        assert file.read() == saved
+
+    # Свежий индекс читается без разбора tasks.json
+    monkeypatch.setattr(task_offsets, "scan_tasks", None)
+    assert load_tasks_lazy(filename) == make_tasks()
+
+
+def test_missing_or_invalid_file(tmp_path):
+    """Нет файла или он не список - пустой список задач"""
+    filename = tmp_path / "tasks.json"
+    assert len(load_tasks_lazy(str(filename))) == 0
+
+    filename.write_text('{"description": "не список"}', encoding="utf-8")
+    assert not build_offset_index(str(filename))
+    assert len(load_tasks_lazy(str(filename))) == 0
+
+
+def test_invalid_and_duplicate_tasks_like_regular_load(tmp_path):
+    """Невалидные задачи пропускаются, повторные ID заменяются, как при обычной загрузке"""
+    filename = tmp_path / "tasks.json"
+    filename.write_text(json.dumps([
+        {"id": 1, "description": "A", "completed": False},
+        {"id": 1, "description": "Повтор ID", "completed": True},
+        {"id": 2, "description": "   ", "completed": False},
+        {"id": 3, "description": "B", "completed": "да"},
+        "не задача",
+        {"id": "x", "description": "C", "meta": {"description": "вложенное"}},
+        {"title": "description", "description": "D"},
+    ], ensure_ascii=False), encoding="utf-8")
+
+    tasks = load_tasks_lazy(str(filename))
+
+    assert tasks.to_dicts() == load_tasks_streaming(str(filename)).to_dicts()
+    assert [(task["id"], task["description"]) for task in tasks] == [
+        (1, "A"), (2, "Повтор ID"), (3, "C"), (4, "D"),
+    ]
+
+
+def test_nested_or_unbalanced_file_is_scanned_quickly(tmp_path):
+    """Вложенные и незакрытые объекты не подвешивают построение индекса"""
+    filename = tmp_path / "tasks.json"
+    nested = {"id": 1, "description": "Вложенная", "completed": False, "meta": {}}
+    for _ in range(50):
+        nested["meta"] = {"meta": nested["meta"], "note": "x" * 20}
+    filename.write_text(json.dumps([nested]), encoding="utf-8")
+
+    start = time.perf_counter()
+    assert build_offset_index(str(filename))
+    assert [task["description"] for task in load_tasks_lazy(str(filename))] == ["Вложенная"]
+
+    # Незакрытый объект с длинной строкой: файл повреждён
+    filename.write_text('[{"description": "' + "a b " * 20000 + '"', encoding="utf-8")
+    assert not build_offset_index(str(filename))
+    filename.write_text('[{"description": "x", "a": {"b": "' + "{" * 5000, encoding="utf-8")
+    assert not build_offset_index(str(filename))
+    assert time.perf_counter() - start < 2
+
+
+# ============================================================
+# ЧТЕНИЕ ПО ТРЕБОВАНИЮ
+# ============================================================
+
+def test_descriptions_read_on_demand(tmp_path):
+    """Описания не читаются при загрузке, а кэш ограничен"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [
+        {"id": i, "description": f"Задача {i}", "completed": False} for i in range(1, 101)
+    ])
+
+    tasks = load_tasks_lazy(filename, cache_size=10)
+    descriptions = tasks._descriptions
+    assert len(tasks) == 100
+    assert descriptions.reads == 0
+
+    assert tasks[49]["description"] == "Задача 50"
+    assert tasks[49]["description"] == "Задача 50"
+    assert descriptions.reads == 1
+
+    format_task_list(tasks)
+    assert descriptions.reads == 101
+    assert len(descriptions.cache) == 10
+
+
+def test_changes_and_journal_on_lazy_list(tmp_path):
+    """Изменения и журнал работают поверх ленивых описаний"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, make_tasks())
+    tasks = load_tasks_lazy(filename)
+
+    add_task(tasks, "Новая")
+    record_task_change(filename, tasks, {"op": "add", "description": "Новая"})
+    complete_task(tasks, 1)
+    record_task_change(filename, tasks, {"op": "complete", "index": 1})
+    delete_task(tasks, 2)
+    record_task_change(filename, tasks, {"op": "delete", "index": 2})
+    tasks[0]["description"] = "Изменено"
+
+    expected = [task["description"] for task in load_tasks_from_file(filename)]
+    assert expected == ["Купить молоко", "Emoji 🎮 и\nперевод строки", "Новая"]
+    assert [task["description"] for task in load_tasks_lazy(filename)] == expected
+    assert tasks[0]["description"] == "Изменено"
+
+
+def test_compact_keeps_descriptions_lazy(tmp_path):
+    """Сжатие надгробий не читает описания из файла"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, [
+        {"id": i, "description": f"Задача {i}", "completed": False} for i in range(1, 3001)
+    ])
+    tasks = load_tasks_lazy(filename)
+    tasks[0]["description"] = "Изменено"
+    add_task(tasks, "Новая")
+
+    for _ in range(1000):
+        delete_task(tasks, 2)
+    before = tasks._descriptions
+    reads = before.reads
+    tasks.compact()
+
+    assert isinstance(tasks._descriptions, LazyDescriptions)
+    assert before.reads == reads
+    assert [task["description"] for task in tasks][:3] == ["Изменено", "Задача 1002", "Задача 1003"]
+    assert tasks[-1]["description"] == "Новая"
+
+
+def test_load_tasks_fast_lazy(tmp_path):
+    """load_tasks_fast(lazy=True) использует индекс смещений"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, make_tasks())
+
+    tasks = load_tasks_fast(filename, lazy=True)
+
+    assert isinstance(tasks._descriptions, LazyDescriptions)
+    assert tasks == make_tasks()
+
+
+def test_old_file_still_readable_after_save(tmp_path):
+    """Открытый список читает описания из своей версии файла"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, make_tasks())
+    tasks = load_tasks_lazy(filename)
+
+    save_tasks_to_file(filename, TaskList([{"description": "Другой файл", "completed": False}]))
+
+    assert tasks[0]["description"] == "Купить молоко"
+
+
+def test_lazy_mode_from_command_line(tmp_path):
+    """--lazy доходит до загрузки и перечитывания SharedTaskFile"""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, TaskList(make_tasks()))
+    args = build_parser().parse_args(["--lazy", "--tasks", filename])
+
+    shared = SharedTaskFile(args.tasks, lazy=args.lazy)
+    assert isinstance(shared.tasks._descriptions, LazyDescriptions)
+    shared.commit({"op": "add", "description": "Новая"})
+    shared.close()
+    # Без бинарного снимка перечитывание идёт через индекс
+    os.remove(filename + ".bin")
+    shared._reload()
+
+    assert isinstance(shared.tasks._descriptions, LazyDescriptions)
+    assert [task["description"] for task in shared.tasks][-1] == "Новая"
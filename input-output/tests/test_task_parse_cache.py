@@ -0,0 +1,180 @@
+"""
+Тесты для кэша разобранного tasks.json
+
+Запустить: pytest test_task_parse_cache.py -v
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import task_parse_cache
+from task_manager_testable import load_tasks_fast, load_tasks_from_file, save_tasks_to_file
+from task_parse_cache import (
+    cache_key,
+    get_cache_filename,
+    load_json_cached,
+    read_cache,
+)
+from task_sync import SharedTaskFile
+
+
+TASKS = [{"id": 1, "description": "Купить молоко", "completed": False}]
+
+
+def test_miss_then_hit(tmp_path):
+    """Первый раз файл разбирается, второй - берётся из кэша"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+
+    assert load_json_cached(filename, cache_dir) == TASKS
+    assert read_cache(filename, cache_key(filename), cache_dir) == (True, TASKS)
+    assert load_json_cached(filename, cache_dir) == TASKS
+
+
+def test_hit_skips_json_parsing(tmp_path, monkeypatch):
+    """При попадании json.load не вызывается"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+    load_json_cached(filename, cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON не должен разбираться")
+
+    monkeypatch.setattr(task_parse_cache.json, "load", fail)
+    assert load_json_cached(filename, cache_dir) == TASKS
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    """Изменённый файл разбирается заново"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+    load_json_cached(filename, cache_dir)
+
+    changed = TASKS + [{"id": 2, "description": "Новая", "completed": True}]
+    save_tasks_to_file(filename, changed)
+
+    assert load_json_cached(filename, cache_dir) == changed
+
+
+def test_same_size_and_mtime_different_content(tmp_path):
+    """Подмена содержимого с тем же временем и размером ловится хэшем"""
+    filename = tmp_path / "tasks.json"
+    cache_dir = str(tmp_path / "cache")
+    filename.write_text('[{"description": "A", "completed": false}]', encoding="utf-8")
+    load_json_cached(str(filename), cache_dir)
+    stat = os.stat(filename)
+
+    filename.write_text('[{"description": "B", "completed": false}]', encoding="utf-8")
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert load_json_cached(str(filename), cache_dir)[0]["description"] == "B"
+
+
+def test_corrupted_cache_is_ignored(tmp_path):
+    """Повреждённый кэш - это просто промах"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+    load_json_cached(filename, cache_dir)
+
+    with open(get_cache_filename(filename, cache_dir), "wb") as file:
+        file.write(b"\x00garbage")
+
+    assert load_json_cached(filename, cache_dir) == TASKS
+
+
+def test_errors_match_json_load(tmp_path):
+    """Ошибки те же, что у json.load"""
+    cache_dir = str(tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        load_json_cached(str(tmp_path / "missing.json"), cache_dir)
+
+    broken = tmp_path / "broken.json"
+    broken.write_text("[{", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        load_json_cached(str(broken), cache_dir)
+
+
+def test_cached_data_is_a_fresh_copy(tmp_path):
+    """Изменение загруженного списка не портит кэш"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+
+    load_json_cached(filename, cache_dir)[0]["completed"] = True
+    assert load_json_cached(filename, cache_dir) == TASKS
+
+
+def test_load_tasks_from_file_with_cache(tmp_path):
+    """load_tasks_from_file с кэшем применяет журнал и обрабатывает ошибки"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+    with open(filename + ".log", "w", encoding="utf-8") as file:
+        file.write('{"op": "complete", "index": 1}\n')
+
+    assert load_tasks_from_file(filename, cache_dir=cache_dir)[0]["completed"] is True
+    assert load_tasks_from_file(filename, cache_dir=cache_dir)[0]["completed"] is True
+    assert load_tasks_from_file(str(tmp_path / "missing.json"), cache_dir=cache_dir) == []
+
+
+def test_load_tasks_fast_uses_cache(tmp_path, monkeypatch):
+    """load_tasks_fast без снимка читает JSON через кэш, проверяет задачи и применяет журнал"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(TASKS + [{"description": "", "completed": False}], file)
+    with open(filename + ".log", "w", encoding="utf-8") as file:
+        file.write('{"op": "add", "description": "Новая"}\n')
+
+    first = load_tasks_fast(filename, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("JSON не должен разбираться")
+
+    monkeypatch.setattr(task_parse_cache.json, "load", fail)
+    second = load_tasks_fast(filename, cache_dir=cache_dir)
+
+    assert first.to_dicts() == second.to_dicts() == TASKS + [
+        {"id": 2, "description": "Новая", "completed": False}
+    ]
+
+
+def test_shared_task_file_uses_cache(tmp_path):
+    """SharedTaskFile передаёт папку кэша в load_tasks_fast"""
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+
+    shared = SharedTaskFile(filename, cache_dir=cache_dir)
+
+    assert shared.tasks.to_dicts() == TASKS
+    assert read_cache(filename, cache_key(filename), cache_dir) == (True, TASKS)
+
+
+@pytest.mark.parametrize("step, exit_choice", [
+    ("step4_json_persistence.py", "4"),
+    ("step5_error_handling.py", "5"),
+])
+def test_mini_project_steps_use_cache(tmp_path, step, exit_choice):
+    """Шаги 4 и 5 мини-проекта читают tasks.json через общий кэш"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples",
+                        "10_mini_project", step)
+    filename = str(tmp_path / "tasks.json")
+    cache_dir = str(tmp_path / "cache")
+    save_tasks_to_file(filename, TASKS)
+
+    for _ in range(2):
+        result = subprocess.run(
+            [sys.executable, path], cwd=tmp_path, input=exit_choice + "\n",
+            capture_output=True, text=True, env=dict(os.environ, TASK_CACHE_DIR=cache_dir),
+        )
+        assert "Загружено 1 задач(и) из файла." in result.stdout
+    assert read_cache(filename, cache_key(filename), cache_dir) == (True, TASKS)
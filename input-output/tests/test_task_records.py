@@ -0,0 +1,221 @@
+"""
+Тесты для файла задач из записей фиксированного размера
+
+Запустить: pytest test_task_records.py -v
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from task_list import TaskList
+from task_manager_testable import load_tasks_from_file, save_tasks_to_file
+import task_records
+from task_records import (
+    HEADER,
+    RecordFile,
+    RecordTaskStore,
+    get_overflow_filename,
+    json_to_records,
+    load_records,
+    read_overflow_generation,
+    records_to_json,
+    write_records,
+)
+
+
+LONG = "Очень длинное описание задачи, которое не помещается в ячейку записи"
+TASKS = [
+    {"id": 1, "description": "Купить молоко", "completed": False},
+    {"id": 2, "description": "Task 2", "completed": True},
+    {"id": 5, "description": LONG, "completed": False},
+    {"id": 7, "description": "Позвонить маме ☎", "completed": False},
+]
+
+
+def test_records_round_trip(tmp_path):
+    """Тест что записи возвращают те же задачи, включая длинные описания."""
+    filename = str(tmp_path / "tasks.rec")
+
+    assert write_records(filename, TASKS)
+
+    assert load_records(filename).to_dicts() == TASKS
+    assert os.path.getsize(get_overflow_filename(filename)) == len(LONG.encode("utf-8"))
+
+
+def test_records_have_fixed_size_and_spare_capacity(tmp_path):
+    """Тест что файл сразу содержит место под новые записи."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS, slot_size=16)
+
+    with RecordFile(filename) as records:
+        assert records.record_size == 32
+        assert records.capacity >= 2 * len(TASKS)
+        assert os.path.getsize(filename) == HEADER.size + records.capacity * 32
+
+
+def test_complete_writes_in_place(tmp_path):
+    """Тест что выполнение меняет только байт состояния."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS)
+    with open(filename, "rb") as file:
+        before = file.read()
+
+    with RecordFile(filename) as records:
+        assert records.complete(7)
+        assert not records.complete(3)
+    with open(filename, "rb") as file:
+        after = file.read()
+
+    assert sum(a != b for a, b in zip(before, after)) == 1
+    assert load_records(filename).get_by_id(7)["completed"] is True
+
+
+def test_complete_many(tmp_path):
+    """Тест массового выполнения задач."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, [{"description": f"Задача {i}"} for i in range(1000)])
+
+    with RecordFile(filename) as records:
+        assert records.complete_many(range(1, 1001, 2)) == 500
+        assert records.complete_many([5000]) == 0
+
+    tasks = load_records(filename)
+    assert sum(task["completed"] for task in tasks) == 500
+    assert tasks.get_by_id(999)["completed"] and not tasks.get_by_id(1000)["completed"]
+
+
+def test_add_and_delete(tmp_path):
+    """Тест добавления (с ростом файла) и удаления на месте."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS)
+
+    with RecordFile(filename) as records:
+        assert records.find(7) is not None
+        new_ids = [records.add(f"Новая {i}") for i in range(100)]
+        long_id = records.add(LONG + "!")
+        assert records.delete(2)
+        assert not records.delete(2)
+        assert records.get(long_id)["description"] == LONG + "!"
+
+    assert new_ids[0] == 8
+    tasks = load_records(filename)
+    assert len(tasks) == len(TASKS) + 100
+    assert tasks.get_by_id(2) is None
+    assert tasks.get_by_id(long_id)["description"] == LONG + "!"
+    tasks.append({"description": "Ещё одна"})
+    assert tasks[-1]["id"] == long_id + 1
+
+
+def test_rewrite_uses_new_overflow_generation(tmp_path):
+    """Тест что перезапись не трогает файл переполнения старых записей до подмены."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS)
+
+    assert write_records(filename, [{"id": 1, "description": LONG + "?", "completed": False}])
+
+    assert read_overflow_generation(filename) == 1
+    assert not os.path.exists(get_overflow_filename(filename))
+    assert load_records(filename)[0]["description"] == LONG + "?"
+    with RecordFile(filename) as records:
+        records.add(LONG + "!")
+    assert load_records(filename)[-1]["description"] == LONG + "!"
+
+
+def test_crash_before_records_replace_keeps_old_records(tmp_path, monkeypatch):
+    """Тест что сбой до подмены tasks.rec оставляет рабочий старый файл."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS)
+
+    replace = os.replace
+
+    def crash(source, target):
+        # Сбой ровно перед подменой самого файла записей
+        if target == filename:
+            raise OSError("сбой")
+        return replace(source, target)
+
+    monkeypatch.setattr(task_records.os, "replace", crash)
+    assert not write_records(filename, [{"id": 9, "description": "X" * 100, "completed": True}])
+    monkeypatch.undo()
+
+    assert load_records(filename).to_dicts() == TASKS
+
+
+def test_unsorted_ids_are_found(tmp_path):
+    """Тест поиска по ID, когда ID в файле идут не по порядку."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, list(reversed(TASKS)))
+
+    with RecordFile(filename) as records:
+        assert records.get(1)["description"] == "Купить молоко"
+        assert records.find(3) is None
+        assert list(records) == list(reversed(TASKS))
+
+
+def test_rejects_bad_files(tmp_path):
+    """Тест что чужой или обрезанный файл не открывается."""
+    filename = tmp_path / "tasks.rec"
+    filename.write_bytes(b"not a record file at all, sorry!")
+
+    with pytest.raises(ValueError):
+        RecordFile(str(filename))
+    assert load_records(str(filename)) is None
+    assert load_records(str(tmp_path / "missing.rec")) is None
+
+
+def test_json_conversion_round_trip(tmp_path):
+    """Тест конвертации JSON -> записи -> JSON без потерь."""
+    json_filename = str(tmp_path / "tasks.json")
+    records_filename = str(tmp_path / "tasks.rec")
+    save_tasks_to_file(json_filename, TaskList(TASKS))
+
+    assert json_to_records(json_filename, records_filename)
+    with RecordFile(records_filename) as records:
+        records.complete(1)
+    assert records_to_json(records_filename, json_filename)
+
+    expected = [dict(task) for task in TASKS]
+    expected[0]["completed"] = True
+    assert load_tasks_from_file(json_filename) == expected
+
+
+def test_record_task_store_commits_in_place(tmp_path):
+    """Тест что изменения хранилища сразу попадают в файл записей."""
+    filename = str(tmp_path / "tasks.rec")
+    write_records(filename, TASKS)
+    store = RecordTaskStore(filename)
+
+    assert store.commit({"op": "add", "description": "  Новая  "})
+    assert store.commit({"op": "complete", "index": 1})
+    assert store.commit({"op": "delete", "id": 2})
+    assert not store.commit({"op": "delete", "id": 2})
+    assert not store.commit({"op": "add", "description": " "})
+    assert store.get_search_index().search("новая") == {8}
+    assert store.close()
+
+    expected = [dict(task) for task in TASKS if task["id"] != 2]
+    expected[0]["completed"] = True
+    expected.append({"id": 8, "description": "Новая", "completed": False})
+    assert load_records(filename).to_dicts() == expected
+    assert store.tasks == expected
+
+
+def test_task_manager_runs_on_records(tmp_path):
+    """Тест что меню с --records переносит tasks.json в файл записей и пишет в него."""
+    save_tasks_to_file(str(tmp_path / "tasks.json"), [{"description": "Из JSON", "completed": False}])
+    script = os.path.join(os.path.dirname(__file__), "task_manager_testable.py")
+
+    result = subprocess.run(
+        [sys.executable, script, "--records", "tasks.rec"],
+        cwd=tmp_path, input="2\nИз меню\n3\n1\n6\n", capture_output=True, text=True, timeout=30,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Перенесено в tasks.rec: 1" in result.stdout
+    assert load_records(str(tmp_path / "tasks.rec")).to_dicts() == [
+        {"id": 1, "description": "Из JSON", "completed": True},
+        {"id": 2, "description": "Из меню", "completed": False},
+    ]
@@ -0,0 +1,133 @@
+"""
+Тесты для полнотекстового поиска по задачам
+
+Запустить: pytest test_task_search.py -v
+"""
+
+from task_list import TaskList
+from task_manager_testable import (
+    add_task,
+    add_tasks,
+    append_journal_records,
+    delete_task,
+    delete_tasks,
+    replay_journal,
+)
+from task_search import TaskSearchIndex, tokenize, search_tasks
+
+
+def make_tasks():
+    """Создаёт TaskList с индексом, наполненный через add_task."""
+    tasks = TaskList()
+    index = TaskSearchIndex()
+    for description in ("Купить молоко", "Купить хлеб", "Позвонить маме", "Buy MILK today"):
+        add_task(tasks, description, index)
+    return tasks, index
+
+
+def found_descriptions(tasks, index, query):
+    """Описания найденных задач по порядку."""
+    return [task["description"] for _, task in search_tasks(tasks, index, query)]
+
+
+def test_tokenize_is_unicode_aware():
+    """Тест что кириллица и регистр обрабатываются корректно."""
+    assert tokenize("Купить МОЛОКО, хлеб!") == {"купить", "молоко", "хлеб"}
+    assert tokenize("e-mail: Ёжик") == {"e", "mail", "ёжик"}
+
+
+def test_search_single_word():
+    """Тест поиска по одному слову без учёта регистра."""
+    tasks, index = make_tasks()
+    
+    assert found_descriptions(tasks, index, "КУПИТЬ") == ["Купить молоко", "Купить хлеб"]
+    assert found_descriptions(tasks, index, "milk") == ["Buy MILK today"]
+    assert found_descriptions(tasks, index, "сыр") == []
+    assert found_descriptions(tasks, index, "   ") == []
+
+
+def test_search_and_query():
+    """Тест что все слова запроса должны встретиться в задаче."""
+    tasks, index = make_tasks()
+    
+    assert found_descriptions(tasks, index, "купить молоко") == ["Купить молоко"]
+    assert found_descriptions(tasks, index, "купить маме") == []
+
+
+def test_search_prefix_query():
+    """Тест поиска по началу слова."""
+    tasks, index = make_tasks()
+    
+    assert found_descriptions(tasks, index, "по*") == ["Позвонить маме"]
+    assert found_descriptions(tasks, index, "куп* хл*") == ["Купить хлеб"]
+
+
+def test_index_is_updated_incrementally():
+    """Тест что add_task и delete_task обновляют индекс без перестройки."""
+    tasks, index = make_tasks()
+    
+    delete_task(tasks, 1, index)
+    add_task(tasks, "Молоко для кота", index)
+    
+    assert found_descriptions(tasks, index, "молоко") == ["Молоко для кота"]
+    assert [number for number, _ in search_tasks(tasks, index, "купить")] == [1]
+    assert "хлеб" in index.words
+    
+    delete_task(tasks, 1, index)
+    assert "хлеб" not in index.words
+    assert "хлеб" not in index.postings
+
+
+def test_build_matches_incremental_index():
+    """Тест что индекс, построенный целиком, совпадает с инкрементальным."""
+    tasks, index = make_tasks()
+    
+    rebuilt = TaskSearchIndex.build(tasks)
+    
+    assert rebuilt.postings == index.postings
+    assert rebuilt.words == index.words
+
+
+def test_plain_list_gets_ids_for_index():
+    """Тест что обычный список словарей тоже работает с индексом."""
+    tasks = [{"id": 4, "description": "Старая задача", "completed": False}]
+    index = TaskSearchIndex.build(tasks)
+    
+    assert add_task(tasks, "Купить молоко", index)
+    assert add_tasks(tasks, ["Купить хлеб", "Позвонить маме"], index)
+    
+    assert [task["id"] for task in tasks] == [4, 5, 6, 7]
+    assert index.search("купить") == {5, 6}
+    
+    # Без индекса задачи обычного списка остаются как были, без ID
+    plain = []
+    add_task(plain, "Без индекса")
+    assert plain == [{"description": "Без индекса", "completed": False}]
+
+
+def test_batch_mutations_update_index():
+    """Тест что пакетные изменения обновляют индекс."""
+    tasks, index = make_tasks()
+    
+    add_tasks(tasks, ["Молоко для кота"], index)
+    delete_tasks(tasks, [1, 2], index)
+    
+    assert index.postings == TaskSearchIndex.build(tasks).postings
+    assert found_descriptions(tasks, index, "молоко") == ["Молоко для кота"]
+
+
+def test_journal_replay_updates_index(tmp_path):
+    """Тест что проигрывание журнала обновляет индекс."""
+    filename = str(tmp_path / "tasks.json")
+    tasks, index = make_tasks()
+    append_journal_records(filename, [
+        {"op": "add", "description": "Молоко для кота", "id": 10},
+        {"op": "delete", "id": 1},
+        {"op": "delete", "index": 1},
+        {"op": "add", "description": "Купить сыр"},
+    ])
+    
+    assert replay_journal(filename, tasks, search_index=index) == 4
+    
+    assert index.postings == TaskSearchIndex.build(tasks).postings
+    assert found_descriptions(tasks, index, "куп*") == ["Купить сыр"]
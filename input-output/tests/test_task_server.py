@@ -0,0 +1,240 @@
+"""
+Тесты для сервера задач и его клиента
+
+Запустить: pytest test_task_server.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import task_sync
+from task_client import TaskClient, run_load
+from task_list import TaskList
+from task_manager_testable import load_tasks_from_file
+from task_search import TaskSearchIndex
+from task_server import TaskServer, handle_request
+from task_sync import SharedTaskFile
+
+
+# ============================================================
+# ЗАПРОСЫ (без сокета)
+# ============================================================
+
+def test_handle_add_and_list():
+    """Добавление возвращает ID и запись журнала"""
+    tasks = TaskList()
+
+    response, record = handle_request(tasks, {"op": "add", "description": " Купить молоко "})
+    assert response == {"ok": True, "id": 1}
+    assert record == {"op": "add", "description": "Купить молоко", "id": 1}
+
+    response, record = handle_request(tasks, {"op": "list"})
+    assert response == {
+        "ok": True,
+        "total": 1,
+        "tasks": [{"id": 1, "description": "Купить молоко", "completed": False}],
+    }
+    assert record is None
+
+
+def test_handle_complete_and_delete_by_index_and_id():
+    """Изменения по номеру пишутся в журнал по ID"""
+    tasks = TaskList([{"description": "A", "completed": False}, {"description": "B", "completed": False}])
+
+    assert handle_request(tasks, {"op": "complete", "index": 2}) == (
+        {"ok": True}, {"op": "complete", "id": 2}
+    )
+    assert handle_request(tasks, {"op": "delete", "id": 1}) == (
+        {"ok": True}, {"op": "delete", "id": 1}
+    )
+    assert handle_request(tasks, {"op": "get", "index": 1})[0]["task"] == {
+        "id": 2, "description": "B", "completed": True
+    }
+
+
+def test_handle_errors():
+    """Невалидные запросы дают ответ с ошибкой и не пишут журнал"""
+    tasks = TaskList()
+
+    for request in (
+        {"op": "add", "description": ""},
+        {"op": "complete", "index": 1},
+        {"op": "delete", "id": "x"},
+        {"op": "list", "offset": -1},
+        {"op": "search"},
+        {"op": "unknown"},
+        ["add"],
+    ):
+        response, record = handle_request(tasks, request)
+        assert response["ok"] is False
+        assert record is None
+
+
+def test_handle_search_updates_index():
+    """Индекс поиска обновляется при добавлении и удалении"""
+    tasks = TaskList()
+    index = TaskSearchIndex()
+    handle_request(tasks, {"op": "add", "description": "Купить молоко"}, index)
+    handle_request(tasks, {"op": "add", "description": "Позвонить маме"}, index)
+
+    response, _ = handle_request(tasks, {"op": "search", "query": "мол*"}, index)
+    assert [result["number"] for result in response["results"]] == [1]
+
+    handle_request(tasks, {"op": "delete", "index": 1}, index)
+    response, _ = handle_request(tasks, {"op": "search", "query": "мол*"}, index)
+    assert response["results"] == []
+
+
+# ============================================================
+# СЕРВЕР ЧЕРЕЗ СОКЕТ
+# ============================================================
+
+def test_server_with_many_clients(tmp_path):
+    """Много одновременных соединений, изменения сохраняются"""
+    filename = str(tmp_path / "tasks.json")
+    socket_path = str(tmp_path / "tasks.sock")
+
+    async def scenario():
+        server = TaskServer(filename, flush_interval=0.01)
+        listener = await server.start(socket_path)
+        async with listener:
+            result = await run_load(socket_path, connections=20, requests=22)
+        await server.close()
+        return result, server.requests
+
+    result, requests = asyncio.run(scenario())
+
+    assert result["requests"] == 20 * 22
+    assert result["failed"] == 0
+    # В каждом соединении добавляются запросы 0 и 11, а после замера удаляются
+    assert requests == 20 * 22 + 40
+    assert load_tasks_from_file(filename) == []
+
+
+def test_thin_client(tmp_path):
+    """Синхронный клиент работает с сервером в другом потоке"""
+    filename = str(tmp_path / "tasks.json")
+    socket_path = str(tmp_path / "tasks.sock")
+    started = threading.Event()
+    loop = asyncio.new_event_loop()
+    server = TaskServer(filename)
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        listener = loop.run_until_complete(server.start(socket_path))
+        started.set()
+        loop.run_forever()
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    started.wait()
+    try:
+        with TaskClient(socket_path) as client:
+            assert client.request(op="add", description="Купить молоко") == {"ok": True, "id": 1}
+            assert client.request(op="complete", index=1) == {"ok": True}
+            assert client.request(op="count") == {"ok": True, "count": 1}
+            assert client.request(op="bogus")["ok"] is False
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert load_tasks_from_file(filename) == [
+        {"id": 1, "description": "Купить молоко", "completed": True}
+    ]
+
+
+def test_server_keeps_changes_of_other_processes(tmp_path):
+    """Изменения из другого процесса не затираются пачкой сервера"""
+    filename = str(tmp_path / "tasks.json")
+
+    async def scenario():
+        server = TaskServer(filename, flush_interval=0.01)
+        assert await server.handle({"op": "add", "description": "С сервера"}) == {"ok": True, "id": 1}
+        # Менеджер задач в другом терминале
+        other = SharedTaskFile(filename)
+        other.commit({"op": "add", "description": "Из терминала"})
+        other.commit({"op": "complete", "id": 1})
+        await asyncio.sleep(0.02)
+        assert await server.handle({"op": "count"}) == {"ok": True, "count": 2}
+        assert await server.handle({"op": "add", "description": "Снова с сервера"}) == {"ok": True, "id": 3}
+        assert await server.close()
+
+    asyncio.run(scenario())
+
+    assert load_tasks_from_file(filename) == [
+        {"id": 1, "description": "С сервера", "completed": True},
+        {"id": 2, "description": "Из терминала", "completed": False},
+        {"id": 3, "description": "Снова с сервера", "completed": False},
+    ]
+
+
+def test_server_reports_task_deleted_by_other_process(tmp_path):
+    """Задачу удалили в другом процессе до сохранения пачки - ответ с ошибкой"""
+    filename = str(tmp_path / "tasks.json")
+
+    async def scenario():
+        server = TaskServer(filename, flush_interval=0.01)
+        await server.handle({"op": "add", "description": "Купить молоко"})
+        SharedTaskFile(filename).commit({"op": "delete", "id": 1})
+        # Сервер ещё не проверял файл: номер 1 есть в его списке
+        server.synced_at = time.monotonic() + 60
+        response = await server.handle({"op": "complete", "index": 1})
+        await server.close()
+        return response
+
+    assert asyncio.run(scenario()) == {"ok": False, "error": "Задача уже удалена"}
+    assert load_tasks_from_file(filename) == []
+
+
+def test_server_reports_failed_save(tmp_path, monkeypatch):
+    """Пачку не удалось записать - клиенты получают ошибку, а не ok"""
+    filename = str(tmp_path / "tasks.json")
+
+    async def scenario():
+        server = TaskServer(filename, flush_interval=0.01)
+        await server.handle({"op": "add", "description": "Сохранена"})
+        monkeypatch.setattr(task_sync, "record_task_changes", lambda filename, tasks, records: False)
+        responses = await asyncio.gather(
+            server.handle({"op": "add", "description": "Не сохранена"}),
+            server.handle({"op": "complete", "index": 1}),
+        )
+        count = await server.handle({"op": "count"})
+        monkeypatch.undo()
+        await server.close()
+        return responses, count
+
+    responses, count = asyncio.run(scenario())
+
+    assert [response["ok"] for response in responses] == [False, False]
+    assert all("Не удалось сохранить" in response["error"] for response in responses)
+    assert count == {"ok": True, "count": 1}
+    assert load_tasks_from_file(filename) == [
+        {"id": 1, "description": "Сохранена", "completed": False}
+    ]
+
+
+def test_server_saves_in_worker_thread(tmp_path, monkeypatch):
+    """Блокировка файла и запись выполняются не в потоке цикла событий"""
+    filename = str(tmp_path / "tasks.json")
+    threads = []
+    commit_many = SharedTaskFile.commit_many
+
+    def record_thread(self, records):
+        threads.append(threading.current_thread())
+        return commit_many(self, records)
+
+    monkeypatch.setattr(SharedTaskFile, "commit_many", record_thread)
+
+    async def scenario():
+        server = TaskServer(filename, flush_interval=0.01)
+        await server.handle({"op": "add", "description": "Купить молоко"})
+        await server.close()
+
+    asyncio.run(scenario())
+
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,213 @@
+"""
+Тесты для шардированного хранилища задач
+
+Запустить: pytest test_task_shards.py -v
+"""
+
+import json
+import os
+
+import pytest
+
+import task_shards
+
+from task_list import TaskList
+from task_manager_testable import (
+    complete_task,
+    load_tasks_fast,
+    load_tasks_from_file,
+    record_task_change,
+    add_task,
+    save_tasks_to_file,
+)
+from task_shards import (
+    MANIFEST_NAME,
+    join_shards,
+    load_shards,
+    read_manifest,
+    save_shards,
+    split_file,
+)
+
+
+def make_tasks(count):
+    return [
+        {"id": i, "description": f"Задача {i}", "completed": i % 3 == 0}
+        for i in range(1, count + 1)
+    ]
+
+
+def shard_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("shard-"))
+
+
+# ============================================================
+# СОХРАНЕНИЕ И ЗАГРУЗКА
+# ============================================================
+
+def test_save_and_load_shards(tmp_path):
+    """Задачи раскладываются по диапазонам ID и собираются обратно"""
+    directory = str(tmp_path / "tasks.d")
+
+    assert save_shards(directory, make_tasks(25), shard_size=10) == 3
+
+    manifest = read_manifest(directory)
+    assert [shard["first_id"] for shard in manifest["shards"]] == [1, 11, 21]
+    assert [shard["count"] for shard in manifest["shards"]] == [10, 10, 5]
+    assert load_shards(directory) == make_tasks(25)
+    assert load_shards(directory, max_workers=1) == make_tasks(25)
+
+
+def test_only_changed_shard_is_rewritten(tmp_path):
+    """Изменение одной задачи переписывает только её шард"""
+    directory = str(tmp_path / "tasks.d")
+    tasks = make_tasks(25)
+    save_shards(directory, tasks, shard_size=10)
+    before = shard_files(directory)
+
+    tasks[13]["completed"] = True
+    assert save_shards(directory, tasks) == 1
+
+    after = shard_files(directory)
+    assert len(after) == 3
+    assert len(set(before) & set(after)) == 2
+    assert load_shards(directory) == tasks
+
+
+def test_unchanged_save_writes_nothing(tmp_path):
+    """Повторное сохранение без изменений ничего не пишет"""
+    directory = str(tmp_path / "tasks.d")
+    save_shards(directory, make_tasks(25), shard_size=10)
+
+    assert save_shards(directory, make_tasks(25)) == 0
+
+
+def test_tasks_without_ids_get_ids(tmp_path):
+    """Задачам без ID выдаются новые ID, исходные словари не меняются"""
+    directory = str(tmp_path / "tasks.d")
+    tasks = [{"description": "A", "completed": False}, {"id": 5, "description": "B", "completed": False}]
+
+    save_shards(directory, tasks, shard_size=10)
+
+    assert "id" not in tasks[0]
+    assert [task["id"] for task in load_shards(directory)] == [5, 6]
+
+
+def test_empty_and_missing_directory(tmp_path):
+    """Пустой список и папка без манифеста дают пустой список"""
+    directory = str(tmp_path / "tasks.d")
+    os.makedirs(directory)
+    assert load_shards(directory) == []
+
+    save_shards(directory, [])
+    assert load_shards(directory) == []
+    assert shard_files(directory) == []
+
+
+def test_corrupted_shard(tmp_path):
+    """Повреждённый шард - ошибка загрузки, а не пустой список"""
+    directory = str(tmp_path / "tasks.d")
+    save_shards(directory, make_tasks(5), shard_size=10)
+    with open(os.path.join(directory, shard_files(directory)[0]), "w") as file:
+        file.write("[{")
+
+    with pytest.raises(json.JSONDecodeError):
+        load_tasks_from_file(directory)
+
+
+def test_missing_shard_is_not_an_empty_list(tmp_path):
+    """Пропавший шард из манифеста не превращается в пустой список и не стирает остальные"""
+    directory = str(tmp_path / "tasks.d")
+    save_shards(directory, make_tasks(25), shard_size=10)
+    names = shard_files(directory)
+    os.remove(os.path.join(directory, names[1]))
+
+    with pytest.raises(FileNotFoundError):
+        load_tasks_from_file(directory)
+    with pytest.raises(FileNotFoundError):
+        load_tasks_fast(directory)
+    assert shard_files(directory) == [names[0], names[2]]
+    assert len(read_manifest(directory)["shards"]) == 3
+
+
+def test_loaded_list_rewrites_only_changed_shards(tmp_path, monkeypatch):
+    """TaskList из папки сериализует только шарды изменённых задач"""
+    directory = str(tmp_path / "tasks.d")
+    save_shards(directory, make_tasks(35), shard_size=10)
+    # Изменение из журнала тоже попадает в свой шард
+    record_task_change(directory, make_tasks(35), {"op": "complete", "id": 2})
+    tasks = load_tasks_fast(directory)
+
+    serialized = []
+    write_shard = task_shards.write_shard
+
+    def counting_write_shard(directory, number, shard_tasks, shard_size):
+        serialized.append(number)
+        return write_shard(directory, number, shard_tasks, shard_size)
+
+    monkeypatch.setattr(task_shards, "write_shard", counting_write_shard)
+
+    complete_task(tasks, 14)
+    for task_id in range(31, 36):
+        tasks.pop_by_id(task_id)
+
+    # Шард 3 опустел и пропадает; шард 2 не трогается
+    assert save_shards(directory, tasks) == 2
+    assert serialized == [0, 1]
+    assert [shard["first_id"] for shard in read_manifest(directory)["shards"]] == [1, 11, 21]
+    assert len(shard_files(directory)) == 3
+    assert load_shards(directory) == tasks.to_dicts()
+
+    serialized.clear()
+    assert save_shards(directory, tasks) == 0
+    assert serialized == []
+
+    add_task(tasks, "Новая")
+    assert save_shards(directory, tasks) == 1
+    assert serialized == [3]
+    assert load_shards(directory) == tasks.to_dicts()
+
+
+# ============================================================
+# ЧЕРЕЗ ОБЫЧНЫЕ ФУНКЦИИ МЕНЕДЖЕРА
+# ============================================================
+
+def test_manager_functions_accept_directory(tmp_path):
+    """load/save_tasks_to_file работают с папкой шардов и журналом"""
+    directory = tmp_path / "tasks.d"
+    directory.mkdir()
+    filename = str(directory)
+    tasks = TaskList(make_tasks(3))
+
+    assert save_tasks_to_file(filename, tasks)
+    assert (directory / MANIFEST_NAME).exists()
+
+    add_task(tasks, "Новая")
+    record_task_change(filename, tasks, {"op": "add", "description": "Новая"})
+    complete_task(tasks, 1)
+    record_task_change(filename, tasks, {"op": "complete", "index": 1})
+
+    def summary(loaded):
+        return [(task["description"], task["completed"]) for task in loaded]
+
+    assert summary(load_tasks_from_file(filename)) == summary(tasks)
+    assert summary(load_tasks_fast(filename)) == summary(tasks)
+
+    assert save_tasks_to_file(filename, tasks)
+    assert not os.path.exists(filename + ".log")
+    assert load_tasks_from_file(filename) == tasks.to_dicts()
+
+
+def test_split_and_join(tmp_path):
+    """Файл раскладывается по шардам и собирается обратно без потерь"""
+    single = str(tmp_path / "tasks.json")
+    directory = str(tmp_path / "tasks.d")
+    joined = str(tmp_path / "joined.json")
+    save_tasks_to_file(single, make_tasks(30))
+
+    assert split_file(single, directory, shard_size=7)
+    assert len(read_manifest(directory)["shards"]) == 5
+    assert join_shards(directory, joined)
+
+    with open(joined, encoding="utf-8") as file:
+        assert json.load(file) == make_tasks(30)
@@ -0,0 +1,175 @@
+"""
+Тесты для бинарного снимка списка задач
+
+Запустить: pytest test_task_snapshot.py -v
+"""
+
+import mmap
+import os
+
+import task_snapshot
+from task_manager_testable import (
+    add_task,
+    complete_task,
+    delete_task,
+    format_task_list,
+    load_tasks_fast,
+    load_tasks_from_file,
+    record_task_change,
+    save_tasks_to_file,
+)
+from task_snapshot import (
+    HEADER,
+    MappedDescriptions,
+    get_snapshot_filename,
+    json_to_snapshot,
+    load_snapshot,
+    pack_states,
+    snapshot_to_json,
+    unpack_states,
+    write_snapshot,
+)
+
+
+TASKS = [
+    {"id": 1, "description": "Купить молоко", "completed": False},
+    {"id": 2, "description": "Task 2", "completed": True},
+    {"id": 5, "description": "Позвонить маме ☎", "completed": True},
+]
+
+
+def test_pack_and_unpack_states():
+    """Тест упаковки флагов по биту на задачу."""
+    states = bytearray([1, 0, 0, 1, 1, 0, 1, 0, 1, 1])
+    
+    bitmap = pack_states(states)
+    
+    assert len(bitmap) == 2
+    assert unpack_states(bitmap, len(states)) == states
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Тест что снимок возвращает те же задачи, включая ID и кириллицу."""
+    filename = str(tmp_path / "tasks.bin")
+    
+    assert write_snapshot(filename, TASKS)
+    tasks = load_snapshot(filename)
+    
+    assert tasks.to_dicts() == TASKS
+    assert tasks.get_by_id(5)["description"] == "Позвонить маме ☎"
+
+
+def test_snapshot_descriptions_are_lazy(tmp_path):
+    """Тест что описания не декодируются при загрузке."""
+    filename = str(tmp_path / "tasks.bin")
+    write_snapshot(filename, TASKS)
+    
+    tasks = load_snapshot(filename)
+    
+    assert isinstance(tasks._descriptions, MappedDescriptions)
+    assert len(tasks) == 3
+    assert format_task_list(tasks)[1] == "2. [✓] Task 2"
+
+
+def test_loaded_snapshot_accepts_changes(tmp_path):
+    """Тест что загруженный снимок можно менять как обычный список."""
+    filename = str(tmp_path / "tasks.bin")
+    write_snapshot(filename, TASKS)
+    tasks = load_snapshot(filename)
+    
+    add_task(tasks, "Новая задача")
+    complete_task(tasks, 1)
+    delete_task(tasks, 2)
+    
+    assert [task["description"] for task in tasks] == ["Купить молоко", "Позвонить маме ☎", "Новая задача"]
+    assert tasks[0]["completed"]
+    assert tasks[-1]["id"] == 6
+
+
+def test_snapshot_rejects_bad_files(tmp_path):
+    """Тест что повреждённый или чужой файл не загружается."""
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    garbage = tmp_path / "garbage.bin"
+    garbage.write_bytes(b"not a snapshot at all, just some bytes")
+    
+    assert load_snapshot(str(empty)) is None
+    assert load_snapshot(str(garbage)) is None
+    assert load_snapshot(str(tmp_path / "missing.bin")) is None
+
+
+def corrupt_byte(filename, position):
+    """Портит один байт файла."""
+    with open(filename, "r+b") as file:
+        file.seek(position)
+        byte = file.read(1)
+        file.seek(position)
+        file.write(bytes([byte[0] ^ 0x80]))
+
+
+def test_corrupt_snapshot_falls_back_to_json(tmp_path):
+    """Тест что испорченное смещение или текст - это промах, а не ошибка при выводе."""
+    filename = str(tmp_path / "tasks.json")
+    snapshot = get_snapshot_filename(filename)
+    save_tasks_to_file(filename, TASKS)
+    # Второе смещение (конец первого описания) и байт последнего описания
+    # (после текста идут 8 байт контрольной суммы)
+    for position in (HEADER.size + 8 * len(TASKS) + 8, -12):
+        write_snapshot(snapshot, TASKS, os.stat(filename))
+        corrupt_byte(snapshot, position % os.path.getsize(snapshot))
+
+        assert load_snapshot(snapshot) is None
+        tasks = load_tasks_fast(filename)
+        assert not isinstance(tasks._descriptions, MappedDescriptions)
+        assert tasks.to_dicts() == TASKS
+
+
+def test_rejected_snapshot_is_unmapped(tmp_path, monkeypatch):
+    """Тест что отображение устаревшего или испорченного снимка закрывается."""
+    filename = str(tmp_path / "tasks.bin")
+    write_snapshot(filename, TASKS)
+    mappings = []
+    original_mmap = mmap.mmap
+
+    def tracking_mmap(*args, **kwargs):
+        mappings.append(original_mmap(*args, **kwargs))
+        return mappings[-1]
+
+    monkeypatch.setattr(task_snapshot.mmap, "mmap", tracking_mmap)
+    assert load_snapshot(filename, os.stat(filename)) is None
+    corrupt_byte(filename, os.path.getsize(filename) - 12)
+    assert load_snapshot(filename) is None
+
+    assert len(mappings) == 2
+    assert all(mapping.closed for mapping in mappings)
+
+
+def test_json_conversion_round_trip(tmp_path):
+    """Тест конвертации JSON -> снимок -> JSON без потерь."""
+    json_filename = str(tmp_path / "tasks.json")
+    snapshot_filename = str(tmp_path / "tasks.bin")
+    copy_filename = str(tmp_path / "copy.json")
+    save_tasks_to_file(json_filename, TASKS)
+    
+    assert json_to_snapshot(json_filename, snapshot_filename)
+    assert snapshot_to_json(snapshot_filename, copy_filename)
+    
+    assert load_tasks_from_file(copy_filename) == TASKS
+
+
+def test_load_tasks_fast_uses_fresh_snapshot_only(tmp_path):
+    """Тест что устаревший снимок пропускается, а журнал применяется."""
+    filename = str(tmp_path / "tasks.json")
+    save_tasks_to_file(filename, TASKS)
+    write_snapshot(get_snapshot_filename(filename), TASKS, os.stat(filename))
+    record_task_change(filename, [], {"op": "delete", "index": 1})
+    
+    tasks = load_tasks_fast(filename)
+    assert isinstance(tasks._descriptions, MappedDescriptions)
+    assert [task["id"] for task in tasks] == [2, 5]
+    
+    # JSON переписан - снимок больше не соответствует ему
+    save_tasks_to_file(filename, TASKS[:1])
+    tasks = load_tasks_fast(filename)
+    assert not isinstance(tasks._descriptions, MappedDescriptions)
+    assert tasks.to_dicts() == TASKS[:1]
@@ -0,0 +1,154 @@
+"""
+Тесты для хранилища задач в SQLite
+
+Запустить: pytest test_task_store_sqlite.py -v
+
+SQLite хранилище должно вести себя так же, как чистые функции
+над списком словарей.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from task_manager_testable import format_task_list, get_task_by_index, save_tasks_to_file
+from task_search import search_tasks
+from task_store_sqlite import SqliteTaskStore, migrate_json_to_sqlite
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Пустое хранилище во временной папке."""
+    with SqliteTaskStore(str(tmp_path / "tasks.db")) as store:
+        yield store
+
+
+def descriptions(store):
+    """Описания всех задач по порядку."""
+    return [task["description"] for task in store.iter_tasks()]
+
+
+def test_database_uses_wal(store):
+    """Тест что база работает в режиме WAL."""
+    mode = store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_add_and_get_task(store):
+    """Тест добавления и получения задачи по номеру."""
+    assert store.add_task("  Task 1  ")
+    assert store.add_task("Task 2")
+    assert not store.add_task("   ")
+    
+    assert len(store) == 2
+    assert store.get_task_by_index(1)["description"] == "Task 1"
+    assert store.get_task_by_index(2)["description"] == "Task 2"
+    assert store.get_task_by_index(3) is None
+    assert store.get_task_by_index(0) is None
+
+
+def test_complete_task(store):
+    """Тест выполнения задачи по номеру."""
+    store.add_task("Task 1")
+    store.add_task("Task 2")
+    
+    assert store.complete_task(2)
+    assert not store.complete_task(3)
+    assert store.get_task_by_index(2)["completed"]
+    assert store.count_tasks(completed=True) == 1
+
+
+def test_delete_task_renumbers(store):
+    """Тест что после удаления номера идут подряд, как в списке."""
+    for i in range(1, 4):
+        store.add_task(f"Task {i}")
+    
+    assert store.delete_task(1)
+    assert not store.delete_task(5)
+    assert descriptions(store) == ["Task 2", "Task 3"]
+    assert store.get_task_by_index(1)["description"] == "Task 2"
+
+
+def test_iter_tasks_window_and_filter(store):
+    """Тест выборки окна задач и фильтра по статусу."""
+    for i in range(1, 6):
+        store.add_task(f"Task {i}")
+    store.complete_task(2)
+    store.complete_task(4)
+    
+    assert [task["description"] for task in store.iter_tasks(offset=1, limit=2)] == ["Task 2", "Task 3"]
+    assert [task["description"] for task in store.iter_tasks(completed=True)] == ["Task 2", "Task 4"]
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    """Тест переноса задач из JSON, в том числе однократности."""
+    json_filename = str(tmp_path / "tasks.json")
+    db_filename = str(tmp_path / "tasks.db")
+    save_tasks_to_file(json_filename, [
+        {"description": "Task 1", "completed": True},
+        {"description": "Задача 2", "completed": False},
+    ])
+    
+    assert migrate_json_to_sqlite(json_filename, db_filename) == 2
+    assert migrate_json_to_sqlite(json_filename, db_filename) == 0
+    
+    with SqliteTaskStore(db_filename) as store:
+        assert list(store.iter_tasks()) == [
+            {"id": 1, "description": "Task 1", "completed": True},
+            {"id": 2, "description": "Задача 2", "completed": False},
+        ]
+
+
+def test_index_operations_see_other_connections(store):
+    """Тест что список ID в памяти обновляется после чужих изменений."""
+    for i in range(1, 4):
+        store.add_task(f"Task {i}")
+    assert store.get_task_by_index(3)["description"] == "Task 3"
+    
+    with SqliteTaskStore(store.filename) as other:
+        assert other.delete_task(1)
+        other.add_task("Task 4")
+    
+    assert store.refresh()
+    assert not store.refresh()
+    assert descriptions(store) == ["Task 2", "Task 3", "Task 4"]
+    assert store.get_task_by_index(3)["description"] == "Task 4"
+    assert store.complete_task(1)
+    assert store.get_by_id(2)["completed"]
+
+
+def test_store_works_with_pure_functions(store):
+    """Тест что хранилище принимают функции менеджера задач, как список."""
+    for description in ("Купить молоко", "Позвонить маме", "Купить хлеб"):
+        assert store.commit({"op": "add", "description": description})
+    index = store.get_search_index()
+    
+    assert store.commit({"op": "delete", "id": 1})
+    assert store.commit({"op": "complete", "id": store[1]["id"]})
+    assert not store.commit({"op": "delete", "id": 1})
+    
+    assert format_task_list(store) == ["1. [ ] Позвонить маме", "2. [✓] Купить хлеб"]
+    assert get_task_by_index(store, 2)["id"] == 3
+    assert store.position_of(3) == 2
+    assert [number for number, _ in search_tasks(store, index, "купить")] == [2]
+
+
+def test_task_manager_runs_on_sqlite(tmp_path):
+    """Тест что меню с --sqlite переносит tasks.json в базу и пишет в неё."""
+    save_tasks_to_file(str(tmp_path / "tasks.json"), [{"description": "Из JSON", "completed": False}])
+    script = os.path.join(os.path.dirname(__file__), "task_manager_testable.py")
+    
+    result = subprocess.run(
+        [sys.executable, script, "--sqlite", "tasks.db"],
+        cwd=tmp_path, input="2\nИз меню\n3\n1\n6\n", capture_output=True, text=True, timeout=30,
+    )
+    
+    assert result.returncode == 0, result.stderr
+    assert "Перенесено в tasks.db: 1" in result.stdout
+    with SqliteTaskStore(str(tmp_path / "tasks.db")) as store:
+        assert list(store.iter_tasks()) == [
+            {"id": 1, "description": "Из JSON", "completed": True},
+            {"id": 2, "description": "Из меню", "completed": False},
+        ]
@@ -0,0 +1,189 @@
+"""
+Тесты для совместной работы нескольких процессов с tasks.json
+
+Запустить: pytest test_task_sync.py -v
+"""
+
+import os
+
+import pytest
+
+import task_sync
+from task_manager_testable import apply_journal_record, load_tasks_from_file
+from task_list import TaskList
+from task_shards import save_shards
+from task_sync import (
+    SharedTaskFile,
+    bump_version,
+    read_version,
+    stress_test,
+    task_file_lock,
+)
+
+
+# ============================================================
+# ЗАПИСИ ПО ID
+# ============================================================
+
+def test_apply_journal_record_by_id():
+    """Записи с ID не зависят от номеров задач"""
+    tasks = TaskList()
+    assert apply_journal_record(tasks, {"op": "add", "description": "Первая", "id": 5})
+    assert apply_journal_record(tasks, {"op": "add", "description": "Вторая"})
+    assert apply_journal_record(tasks, {"op": "complete", "id": 6})
+    assert apply_journal_record(tasks, {"op": "delete", "id": 5})
+
+    assert tasks == [{"id": 6, "description": "Вторая", "completed": True}]
+    assert not apply_journal_record(tasks, {"op": "delete", "id": 5})
+    assert not apply_journal_record(tasks, {"op": "add", "description": " ", "id": 9})
+
+
+# ============================================================
+# ВЕРСИИ И БЛОКИРОВКА
+# ============================================================
+
+def test_version_counter(tmp_path):
+    """Версия начинается с 0 и растёт на 1"""
+    filename = str(tmp_path / "tasks.json")
+
+    assert read_version(filename) == 0
+    with task_file_lock(filename):
+        assert bump_version(filename) == 1
+        assert bump_version(filename) == 2
+    assert read_version(filename) == 2
+
+
+def test_commit_bumps_version(tmp_path):
+    """Каждое изменение увеличивает версию и попадает в файл"""
+    filename = str(tmp_path / "tasks.json")
+    shared = SharedTaskFile(filename)
+
+    assert shared.commit({"op": "add", "description": "Купить молоко"})
+    assert not shared.commit({"op": "add", "description": ""})
+
+    assert read_version(filename) == 1
+    assert [task["description"] for task in load_tasks_from_file(filename)] == ["Купить молоко"]
+
+
+def test_failed_write_is_not_reported_as_success(tmp_path, monkeypatch):
+    """Если изменение не записалось, commit поднимает OSError, а версия не растёт"""
+    filename = str(tmp_path / "tasks.json")
+    shared = SharedTaskFile(filename)
+    assert shared.commit({"op": "add", "description": "Сохранена"})
+    monkeypatch.setattr(task_sync, "record_task_changes", lambda filename, tasks, records: False)
+
+    with pytest.raises(OSError):
+        shared.commit({"op": "add", "description": "Не сохранена"})
+
+    assert read_version(filename) == 1
+    # В памяти осталось только то, что есть на диске
+    assert [task["description"] for task in shared.tasks] == ["Сохранена"]
+    assert [task["description"] for task in load_tasks_from_file(filename)] == ["Сохранена"]
+
+
+# ============================================================
+# ДВА ПРОЦЕССА С ОДНИМ ФАЙЛОМ
+# ============================================================
+
+def test_stale_writer_does_not_clobber(tmp_path):
+    """Изменения первого экземпляра не теряются при записи второго"""
+    filename = str(tmp_path / "tasks.json")
+    first = SharedTaskFile(filename)
+    second = SharedTaskFile(filename)
+
+    first.commit({"op": "add", "description": "От первого"})
+    second.commit({"op": "add", "description": "От второго"})
+    first.close()
+    second.close()
+
+    descriptions = [task["description"] for task in load_tasks_from_file(filename)]
+    assert descriptions == ["От первого", "От второго"]
+
+
+def test_commit_by_id_after_list_shifted(tmp_path):
+    """Выполнение по ID попадает в нужную задачу, даже если номера сдвинулись"""
+    filename = str(tmp_path / "tasks.json")
+    first = SharedTaskFile(filename)
+    first.commit({"op": "add", "description": "A"})
+    first.commit({"op": "add", "description": "B"})
+    second = SharedTaskFile(filename)
+
+    # Второй видит B под номером 2, но первый удаляет A
+    seen = second.tasks[1]["id"]
+    first.commit({"op": "delete", "id": first.tasks[0]["id"]})
+    assert second.commit({"op": "complete", "id": seen})
+
+    assert load_tasks_from_file(filename) == [{"id": seen, "description": "B", "completed": True}]
+
+
+def test_deleted_by_other_process(tmp_path):
+    """Задачу, удалённую другим процессом, нельзя выполнить"""
+    filename = str(tmp_path / "tasks.json")
+    first = SharedTaskFile(filename)
+    first.commit({"op": "add", "description": "A"})
+    second = SharedTaskFile(filename)
+    task_id = second.tasks[0]["id"]
+
+    first.commit({"op": "delete", "id": task_id})
+    assert not second.commit({"op": "complete", "id": task_id})
+
+
+def test_refresh_after_compaction(tmp_path):
+    """После сворачивания журнала другим процессом список перечитывается"""
+    filename = str(tmp_path / "tasks.json")
+    first = SharedTaskFile(filename)
+    second = SharedTaskFile(filename)
+
+    first.commit({"op": "add", "description": "A"})
+    first.close()
+    first.commit({"op": "add", "description": "B"})
+
+    assert second.refresh()
+    assert [task["description"] for task in second.tasks] == ["A", "B"]
+    assert not second.refresh()
+
+
+def test_refresh_shard_directory_after_other_process_saved(tmp_path):
+    """Папку шардов после сохранения другим процессом можно перечитать"""
+    directory = str(tmp_path / "tasks.d")
+    save_shards(directory, [{"id": 1, "description": "A", "completed": False}], shard_size=10)
+    first = SharedTaskFile(directory)
+    second = SharedTaskFile(directory)
+
+    first.commit({"op": "add", "description": "B"})
+    first.close()
+
+    assert second.refresh()
+    assert [task["description"] for task in second.tasks] == ["A", "B"]
+    assert second.commit({"op": "complete", "id": second.tasks[1]["id"]})
+    second.close()
+    # Полный бинарный снимок для папки не пишется
+    assert not os.path.exists(directory + ".bin")
+    assert [task["completed"] for task in load_tasks_from_file(directory)] == [False, True]
+
+
+def test_search_index_follows_other_processes(tmp_path):
+    """Поиск видит задачи, добавленные другим процессом"""
+    filename = str(tmp_path / "tasks.json")
+    first = SharedTaskFile(filename)
+    second = SharedTaskFile(filename)
+    assert second.get_search_index().search("молоко") == set()
+
+    first.commit({"op": "add", "description": "Купить молоко"})
+    second.refresh()
+
+    assert len(second.get_search_index().search("молоко")) == 1
+
+
+# ============================================================
+# НАГРУЗКА
+# ============================================================
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    """Несколько процессов пишут одновременно, ни одна задача не теряется"""
+    result = stress_test(str(tmp_path / "tasks.json"), processes=4, count=25)
+
+    assert result["commits"] == 4 * (25 + 13)
+    assert result["lost"] == 0
+    assert result["duplicated"] == 0
+    assert result["wrong_status"] == 0